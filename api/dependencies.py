@@ -0,0 +1,223 @@
+# File: api/dependencies.py
+
+import os
+from typing import Dict, Optional
+from dotenv import load_dotenv
+from fastapi import Depends, Query, Request
+from neo4j import basic_auth, AsyncGraphDatabase
+
+from domain.contrast_engine import ContrastEngine
+from domain.repository import DrugRepository
+from domain.services.result_cache import ResultCache
+from domain.services.session_store import SessionStore
+from infrastructure.batching import RepositoryBatcher, BatchingDrugRepository
+from infrastructure.cached_repository import LruTtlCache, CachedDrugRepository
+from infrastructure.catalogue_watcher import CatalogueWatcher
+from infrastructure.contrast_engine import AdjacencyContrastEngine
+from infrastructure.instrumentation import InstrumentedDriver, InstrumentedDrugRepository
+from infrastructure.metrics import PrometheusPipelineMetrics
+from infrastructure.neo4j_repository import Neo4jDrugRepository
+from infrastructure.query_profile import ProfileStore, RequestProfile, begin_profile
+from infrastructure.snapshot import MmapSnapshot, SnapshotDrugRepository
+from infrastructure.tmt_index import TmtIndex, TmtIndexRepository
+from infrastructure.warmup import WarmupState
+
+# Load environment
+load_dotenv("api.env")
+
+# Neo4j connection, one driver for the whole app (see create_driver)
+NEO4J_URI  = os.getenv("NEO4J_URI_STAGING")
+NEO4J_USER = os.getenv("NEO4J_USERNAME_STAGING")
+NEO4J_PASS = os.getenv("NEO4J_PASSWORD_STAGING")
+NEO4J_POOL_SIZE                = int(os.getenv("NEO4J_POOL_SIZE", "40"))
+# Seconds a session may wait for a free pooled connection
+NEO4J_ACQUISITION_TIMEOUT      = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT_SECONDS", "30"))
+# Pooled connections older than this are replaced (keep below any LB/firewall idle cut-off)
+NEO4J_MAX_CONNECTION_LIFETIME  = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME_SECONDS", "3600"))
+
+# Memory-mapped catalogue snapshot shared by all workers on a host (see
+# infrastructure/snapshot.py). When set it replaces the TMT index and the
+# contrast engine, so workers load nothing from Neo4j at startup; the
+# watcher re-maps the file once a new export replaces it. The snapshot
+# holds no name index: with NAME_INDEX_ENABLED the TMT index is still
+# loaded, for name resolution only.
+CATALOGUE_SNAPSHOT_PATH = os.getenv("CATALOGUE_SNAPSHOT_PATH", "")
+
+# In-memory catalogue configuration
+TMT_INDEX_ENABLED      = os.getenv("TMT_INDEX_ENABLED", "true").lower() == "true"
+# Opt-in fuzzy drug-name resolution from the TMT index: every word of a name
+# must match a catalogue name, allowing one typo (names it cannot match go
+# to Neo4j)
+NAME_INDEX_ENABLED     = os.getenv("NAME_INDEX_ENABLED", "false").lower() == "true"
+CATALOGUE_POLL_SECONDS = float(os.getenv("CATALOGUE_POLL_SECONDS", "300"))
+# Set to false to fall back to shipping SUBS pairs through CONTRAST_CYPHER
+CONTRAST_ENGINE_ENABLED = os.getenv("CONTRAST_ENGINE_ENABLED", "true").lower() == "true"
+# Database contrast path when the engine is off/not loaded: "pairs" or "graph"
+CONTRAST_STRATEGY = os.getenv("CONTRAST_STRATEGY", "pairs").lower()
+
+# Cross-request cache for code/name resolution misses
+RESOLUTION_CACHE_ENABLED     = os.getenv("RESOLUTION_CACHE_ENABLED", "true").lower() == "true"
+RESOLUTION_CACHE_MAX_ENTRIES = int(os.getenv("RESOLUTION_CACHE_MAX_ENTRIES", "50000"))
+RESOLUTION_CACHE_TTL         = float(os.getenv("RESOLUTION_CACHE_TTL_SECONDS", "3600"))
+RESOLUTION_CACHE_NEG_TTL     = float(os.getenv("RESOLUTION_CACHE_NEGATIVE_TTL_SECONDS", "300"))
+
+# Assembled result rows, reused for later pages of the same payload
+RESULT_CACHE_ENABLED  = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+RESULT_CACHE_TTL      = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "300"))
+RESULT_CACHE_MAX_ROWS = int(os.getenv("RESULT_CACHE_MAX_ROWS", "200000"))
+
+# Prescribing sessions re-screened incrementally (/drugs/sessions)
+SESSION_TTL_SECONDS  = float(os.getenv("SESSION_TTL_SECONDS", "1800"))
+SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "10000"))
+
+# Build rows without re-validation and serialize responses directly to JSON
+FAST_ASSEMBLY = os.getenv("FAST_ASSEMBLY", "true").lower() == "true"
+
+# gzip responses for clients sending Accept-Encoding: gzip
+GZIP_ENABLED   = os.getenv("GZIP_ENABLED", "true").lower() == "true"
+GZIP_MIN_BYTES = int(os.getenv("GZIP_MIN_BYTES", "1024"))
+GZIP_LEVEL     = int(os.getenv("GZIP_LEVEL", "5"))
+
+# Parse and validate /drugs and /allergy bodies in one pass with Pydantic's
+# JSON parser instead of json.loads + validation (see api/requests.py)
+FAST_DECODE = os.getenv("FAST_DECODE", "true").lower() == "true"
+
+# SUBS pairs per contrast query of the /stream routes; each batch runs to
+# completion and releases its session before its rows are sent
+STREAM_BATCH_PAIRS = int(os.getenv("STREAM_BATCH_PAIRS", "500"))
+
+# Largest number of patients accepted by the /batch screening endpoints
+BATCH_MAX_PATIENTS = int(os.getenv("BATCH_MAX_PATIENTS", "1000"))
+
+# Time budget for each pipeline stage (repository round trip); 0 disables it
+STAGE_TIMEOUT_SECONDS = float(os.getenv("STAGE_TIMEOUT_SECONDS", "10")) or None
+
+# Prometheus metrics (/metrics) and the Server-Timing response header
+METRICS_ENABLED       = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+
+# Opt-in `?profile=true`: run a request's queries under Cypher PROFILE
+CYPHER_PROFILE_ENABLED = os.getenv("CYPHER_PROFILE_ENABLED", "false").lower() == "true"
+CYPHER_PROFILE_TOP_N   = int(os.getenv("CYPHER_PROFILE_TOP_N", "20"))
+
+# Startup warm-up (pool, query plans, response models) gating GET /ready
+WARMUP_ENABLED       = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+# Pooled connections opened during warm-up (capped at NEO4J_POOL_SIZE)
+WARMUP_CONNECTIONS   = min(int(os.getenv("WARMUP_CONNECTIONS", "8")), NEO4J_POOL_SIZE)
+WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", "10"))
+
+# Micro-batching of concurrent lookups (DataLoader pattern)
+BATCH_LOOKUPS_ENABLED = os.getenv("BATCH_LOOKUPS_ENABLED", "true").lower() == "true"
+BATCH_WINDOW_MS       = float(os.getenv("BATCH_WINDOW_MS", "2"))
+BATCH_MAX_KEYS        = int(os.getenv("BATCH_MAX_KEYS", "1000"))
+
+# Process-wide snapshots, loaded at startup and refreshed by the watcher
+tmt_index = TmtIndex(name_index=NAME_INDEX_ENABLED)
+contrast_engine = AdjacencyContrastEngine()
+catalogue_snapshot = MmapSnapshot(CATALOGUE_SNAPSHOT_PATH) if CATALOGUE_SNAPSHOT_PATH else None
+resolution_cache = LruTtlCache(
+    max_entries=RESOLUTION_CACHE_MAX_ENTRIES,
+    ttl_seconds=RESOLUTION_CACHE_TTL,
+    negative_ttl_seconds=RESOLUTION_CACHE_NEG_TTL
+)
+result_cache = ResultCache(ttl_seconds=RESULT_CACHE_TTL, max_rows=RESULT_CACHE_MAX_ROWS)
+session_store = SessionStore(ttl_seconds=SESSION_TTL_SECONDS, max_sessions=SESSION_MAX_SESSIONS)
+catalogue_watcher = CatalogueWatcher(poll_seconds=CATALOGUE_POLL_SECONDS)
+profile_store = ProfileStore(top_n=CYPHER_PROFILE_TOP_N)
+warmup_state = WarmupState()
+pipeline_metrics = PrometheusPipelineMetrics()
+# One batcher per Neo4j driver, created on first use
+batchers: Dict[object, RepositoryBatcher] = {}
+
+# Codes come from the snapshot when there is one; names still need the index
+tmt_index_in_use = TMT_INDEX_ENABLED and (catalogue_snapshot is None or NAME_INDEX_ENABLED)
+
+if catalogue_snapshot is not None:
+    catalogue_watcher.subscribe(catalogue_snapshot.load)
+if tmt_index_in_use:
+    catalogue_watcher.subscribe(tmt_index.load)
+if CONTRAST_ENGINE_ENABLED and catalogue_snapshot is None:
+    catalogue_watcher.subscribe(contrast_engine.load)
+
+async def _flush_caches(driver) -> None:
+    resolution_cache.clear()
+    result_cache.clear()
+    # Sessions hold SUBS sets and contrasts of the previous catalogue
+    session_store.clear()
+
+catalogue_watcher.subscribe(_flush_caches)
+
+def create_driver() -> InstrumentedDriver:
+    """
+    The app-wide Neo4j driver, opened and closed by the FastAPI lifespan.
+    Always instrumented: its gate bounds sessions to the pool size and
+    keeps the pool saturation/wait statistics (GET /admin/pool).
+    """
+    return InstrumentedDriver(
+        AsyncGraphDatabase.driver(
+            NEO4J_URI,
+            auth=basic_auth(NEO4J_USER, NEO4J_PASS),
+            max_connection_pool_size=NEO4J_POOL_SIZE,
+            connection_acquisition_timeout=NEO4J_ACQUISITION_TIMEOUT,
+            max_connection_lifetime=NEO4J_MAX_CONNECTION_LIFETIME
+        ),
+        NEO4J_POOL_SIZE,
+        acquisition_timeout=NEO4J_ACQUISITION_TIMEOUT
+    )
+
+def get_driver(request: Request) -> InstrumentedDriver:
+    return request.app.state.driver
+
+async def cypher_profile(
+    request: Request,
+    profile: bool = Query(False, description="Run this request's queries under Cypher PROFILE")
+) -> Optional[RequestProfile]:
+    """
+    Start profiling the current request if asked for and allowed by config.
+    Async so the context variable is set in the request's own task.
+    """
+    if not (profile and CYPHER_PROFILE_ENABLED):
+        return None
+    request.state.cypher_profile = begin_profile(profile_store)
+    return request.state.cypher_profile
+
+def wrap_repo(
+    repo: DrugRepository,
+    profile: Optional[RequestProfile] = None
+) -> DrugRepository:
+    """
+    Stack the configured in-process layers on top of the Neo4j adapter.
+    A profiled request skips them so every lookup reaches the database.
+    """
+    if METRICS_ENABLED:
+        repo = InstrumentedDrugRepository(repo)
+    if profile is not None:
+        return repo
+    if BATCH_LOOKUPS_ENABLED:
+        batcher = batchers.get(repo.driver)
+        if batcher is None:
+            batcher = batchers[repo.driver] = RepositoryBatcher(
+                repo, window_ms=BATCH_WINDOW_MS, max_batch=BATCH_MAX_KEYS
+            )
+        repo = BatchingDrugRepository(repo, batcher)
+    if RESOLUTION_CACHE_ENABLED:
+        repo = CachedDrugRepository(repo, resolution_cache)
+    if tmt_index_in_use:
+        repo = TmtIndexRepository(repo, tmt_index)
+    if catalogue_snapshot is not None:
+        repo = SnapshotDrugRepository(repo, catalogue_snapshot)
+    return repo
+
+def get_repo(
+    driver: InstrumentedDriver = Depends(get_driver),
+    profile: Optional[RequestProfile] = Depends(cypher_profile)
+) -> DrugRepository:
+    return wrap_repo(Neo4jDrugRepository(driver, STREAM_BATCH_PAIRS), profile)
+
+def get_contrast_engine(profile: Optional[RequestProfile] = None) -> Optional[ContrastEngine]:
+    if not CONTRAST_ENGINE_ENABLED or profile is not None:
+        return None
+    return catalogue_snapshot if catalogue_snapshot is not None else contrast_engine
+
+def get_result_cache(profile: Optional[RequestProfile] = None) -> Optional[ResultCache]:
+    return result_cache if RESULT_CACHE_ENABLED and profile is None else None
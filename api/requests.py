@@ -0,0 +1,142 @@
+# File: api/requests.py
+
+import json
+import email.message
+from typing import Any, Callable, Dict, Optional, Type, TypeVar
+
+import orjson
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+from pydantic.json_schema import models_json_schema
+
+P = TypeVar("P", bound=BaseModel)
+
+class PayloadTooLarge(ValueError):
+    """Raised when a list in a request body is longer than its limit (413)."""
+
+    def __init__(self, name: str, size: int, limit: int):
+        super().__init__(f"batch of {size} {name} exceeds the limit of {limit}")
+        self.size = size
+        self.limit = limit
+
+
+# Models documented by payload_openapi; payload_schemas adds them to the OpenAPI components
+_DOCUMENTED: Dict[str, Type[BaseModel]] = {}
+
+def _is_json(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return True
+    message = email.message.Message()
+    message["content-type"] = content_type
+    subtype = message.get_content_subtype()
+    return message.get_content_maintype() == "application" and (
+        subtype == "json" or subtype.endswith("+json")
+    )
+
+def _parse(body: bytes) -> Any:
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError:
+        pass
+    # Not UTF-8, NaN, ints past 64 bits: json.loads decides and words any error, as in Starlette
+    try:
+        return json.loads(body)
+    except json.JSONDecodeError as e:
+        raise RequestValidationError(
+            [{
+                "type": "json_invalid",
+                "loc": ("body", e.pos),
+                "msg": "JSON decode error",
+                "input": {},
+                "ctx": {"error": e.msg},
+            }],
+            body=e.doc
+        ) from e
+    except Exception as e:
+        raise HTTPException(status_code=400, detail="There was an error parsing the body") from e
+
+def decode_payload(
+    model: Type[P],
+    body: bytes,
+    content_type: Optional[str] = None,
+    fast: bool = True,
+    max_items: Optional[Dict[str, int]] = None
+) -> P:
+    """
+    Decode a request body into a payload model the way FastAPI would, same
+    422 errors included. With `fast`, a valid JSON body is parsed and
+    validated in one pass by Pydantic's own JSON parser; anything it
+    rejects is decoded again the FastAPI way for the error response.
+    `max_items` caps top-level lists (field -> length), checked before any
+    validation; longer ones raise PayloadTooLarge.
+    """
+    if not body:
+        raise RequestValidationError(
+            [{"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}]
+        )
+    if fast and not max_items and _is_json(content_type):
+        try:
+            return model.model_validate_json(body)
+        except ValidationError:
+            pass
+    data = _parse(body) if _is_json(content_type) else body
+    if max_items and type(data) is dict:
+        for name, limit in max_items.items():
+            value = data.get(name)
+            if type(value) is list and len(value) > limit:
+                raise PayloadTooLarge(name, len(value), limit)
+
+    try:
+        return model.model_validate(data, from_attributes=True)
+    except ValidationError as exc:
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in exc.errors(include_url=False)],
+            body=data
+        ) from None
+
+def payload_body(
+    model: Type[P],
+    fast: bool = True,
+    max_items: Optional[Dict[str, int]] = None
+) -> Callable[[Request], Any]:
+    """Dependency decoding the request body into `model` with decode_payload."""
+    async def dependency(request: Request) -> P:
+        return decode_payload(
+            model, await request.body(), request.headers.get("content-type"), fast, max_items
+        )
+    return dependency
+
+def payload_openapi(model: Type[BaseModel]) -> Dict[str, Any]:
+    """openapi_extra documenting a payload_body request body."""
+    _DOCUMENTED[model.__name__] = model
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"$ref": f"#/components/schemas/{model.__name__}"}}
+            }
+        }
+    }
+
+def payload_schemas(app: FastAPI) -> None:
+    """
+    Make app.openapi() define the models referenced by payload_openapi, which
+    FastAPI only emits for models some route takes or returns directly.
+    """
+    build = app.openapi
+
+    def openapi() -> Dict[str, Any]:
+        if app.openapi_schema:
+            return app.openapi_schema
+        schema = build()
+        _, defs = models_json_schema(
+            [(model, "validation") for model in _DOCUMENTED.values()],
+            ref_template="#/components/schemas/{model}"
+        )
+        components = schema.setdefault("components", {}).setdefault("schemas", {})
+        for name, definition in defs.get("$defs", {}).items():
+            components.setdefault(name, definition)
+        return schema
+
+    app.openapi = openapi
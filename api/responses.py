@@ -0,0 +1,73 @@
+# File: api/responses.py
+
+from typing import AsyncIterator
+
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Receive, Scope, Send
+
+def json_response(model: BaseModel, status_code: int = 200) -> Response:
+    """
+    Serialize an already-built response model straight to JSON bytes,
+    bypassing FastAPI's response_model re-validation.
+    """
+    return Response(
+        content=to_json(model),
+        status_code=status_code,
+        media_type="application/json"
+    )
+
+def stream_rows(rows: AsyncIterator[BaseModel], fmt: str = "ndjson") -> StreamingResponse:
+    """
+    Stream rows as they are produced, either as NDJSON (one row per line)
+    or as a chunked JSON array.
+    """
+    if fmt == "json":
+        async def body() -> AsyncIterator[bytes]:
+            yield b"["
+            first = True
+            async for row in rows:
+                yield to_json(row) if first else b"," + to_json(row)
+                first = False
+            yield b"]"
+        media_type = "application/json"
+    else:
+        async def body() -> AsyncIterator[bytes]:
+            async for row in rows:
+                yield to_json(row) + b"\n"
+        media_type = "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type)
+
+
+class _FlushingGZipResponder(GZipResponder):
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        self.gzip_file.write(body)
+        if more_body:
+            # Z_SYNC_FLUSH: everything written so far is decodable now
+            self.gzip_file.flush()
+        else:
+            self.gzip_file.close()
+
+        body = self.gzip_buffer.getvalue()
+        self.gzip_buffer.seek(0)
+        self.gzip_buffer.truncate()
+        return body
+
+
+class StreamingGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that flushes the compressor after every chunk of a
+    streamed response, so stream_rows clients get each row as it is
+    produced rather than once zlib has buffered enough output.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = _FlushingGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+        else:
+            await super().__call__(scope, receive, send)
@@ -0,0 +1,94 @@
+# File: api/routers/admin.py
+
+from fastapi import APIRouter, Depends
+
+from api.dependencies import (
+    resolution_cache,
+    result_cache,
+    session_store,
+    batchers,
+    profile_store,
+    get_driver,
+)
+from infrastructure.instrumentation import InstrumentedDriver
+
+router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
+
+@router.get(
+    "/cache",
+    summary="Resolution cache, result cache and session statistics"
+)
+async def cache_stats() -> dict:
+    return {
+        "status":  True,
+        "code":    200,
+        "message": "get success",
+        "data":    {
+            "resolution": resolution_cache.stats(),
+            "results":    result_cache.stats(),
+            "sessions":   session_store.stats(),
+        },
+    }
+
+@router.post(
+    "/cache/flush",
+    summary="Flush the resolution and result caches"
+)
+async def flush_cache() -> dict:
+    return {
+        "status":  True,
+        "code":    200,
+        "message": "flush success",
+        "data":    {
+            "resolution": resolution_cache.clear(),
+            "results":    result_cache.clear(),
+        },
+    }
+
+@router.get(
+    "/batching",
+    summary="Lookup batching statistics"
+)
+async def batching_stats() -> dict:
+    return {
+        "status":  True,
+        "code":    200,
+        "message": "get success",
+        "data":    [batcher.stats() for batcher in batchers.values()],
+    }
+
+@router.get(
+    "/pool",
+    summary="Neo4j connection pool saturation and wait times"
+)
+async def pool_stats(driver: InstrumentedDriver = Depends(get_driver)) -> dict:
+    return {
+        "status":  True,
+        "code":    200,
+        "message": "get success",
+        "data":    driver.stats(),
+    }
+
+@router.get(
+    "/profile",
+    summary="Aggregates and slowest executions of profiled Cypher queries"
+)
+async def profile_stats() -> dict:
+    return {
+        "status":  True,
+        "code":    200,
+        "message": "get success",
+        "data":    profile_store.stats(),
+    }
+
+@router.post(
+    "/profile/flush",
+    summary="Reset the profiled query aggregates"
+)
+async def flush_profile() -> dict:
+    return {
+        "status":  True,
+        "code":    200,
+        "message": "flush success",
+        "data":    {"queries": profile_store.clear()},
+    }
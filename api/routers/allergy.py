@@ -1,47 +1,77 @@
 # File: api/routers/allergy.py
 
-import os
+from typing import Optional
 from fastapi import APIRouter, Depends, Query
-from neo4j import basic_auth, AsyncGraphDatabase
-from dotenv import load_dotenv
 
-from domain.models import AllergyPayload, AllergyResponse
-from infrastructure.neo4j_repository import Neo4jDrugRepository
-from domain.services.allergy_service import AllergyService
-
-# Load environment
-load_dotenv("api.env")
-
-# Neo4j configuration
-NEO4J_URI  = os.getenv("NEO4J_URI_STAGING")
-NEO4J_USER = os.getenv("NEO4J_USERNAME_STAGING")
-NEO4J_PASS = os.getenv("NEO4J_PASSWORD_STAGING")
-
-driver = AsyncGraphDatabase.driver(
-    NEO4J_URI,
-    auth=basic_auth(NEO4J_USER, NEO4J_PASS),
-    max_connection_pool_size=20
+from domain.repository import DrugRepository
+from domain.models import AllergyPayload, AllergyResponse, BatchAllergyPayload, BatchAllergyResponse
+from infrastructure.query_profile import RequestProfile
+from api.requests import payload_body, payload_openapi
+from api.responses import json_response, stream_rows
+from api.dependencies import (
+    get_repo,
+    cypher_profile,
+    get_result_cache,
+    pipeline_metrics,
+    FAST_ASSEMBLY,
+    FAST_DECODE,
+    BATCH_MAX_PATIENTS,
+    STAGE_TIMEOUT_SECONDS,
 )
+from domain.services.allergy_service import AllergyService
 
 router = APIRouter(prefix="/api/v1")
 
-def get_repo() -> Neo4jDrugRepository:
-    return Neo4jDrugRepository(driver)
-
 def get_allergy_service(
-    repo: Neo4jDrugRepository = Depends(get_repo)
+    repo: DrugRepository = Depends(get_repo),
+    profile: Optional[RequestProfile] = Depends(cypher_profile)
 ) -> AllergyService:
-    return AllergyService(repo)
+    return AllergyService(
+        repo,
+        result_cache=get_result_cache(profile),
+        fast_assembly=FAST_ASSEMBLY,
+        stage_timeout=STAGE_TIMEOUT_SECONDS,
+        metrics=pipeline_metrics
+    )
 
 @router.post(
     "/allergy",
     response_model=AllergyResponse,
-    summary="Get allergy summary"
+    summary="Get allergy summary",
+    openapi_extra=payload_openapi(AllergyPayload)
 )
 async def get_allergy(
-    payload: AllergyPayload,
+    payload: AllergyPayload = Depends(payload_body(AllergyPayload, FAST_DECODE)),
     page: int = Query(1, ge=1, description="Page number"),
     row:  int = Query(10, ge=1, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from pagination.next; overrides page"),
+    service: AllergyService = Depends(get_allergy_service)
+):
+    response = await service.get_allergy(payload, page, row, cursor)
+    return json_response(response) if FAST_ASSEMBLY else response
+
+@router.post(
+    "/allergy/batch",
+    response_model=BatchAllergyResponse,
+    summary="Screen many patients' drug lists against their allergies in one call",
+    openapi_extra=payload_openapi(BatchAllergyPayload)
+)
+async def get_allergy_batch(
+    batch: BatchAllergyPayload = Depends(
+        payload_body(BatchAllergyPayload, FAST_DECODE, max_items={"patients": BATCH_MAX_PATIENTS})
+    ),
+    service: AllergyService = Depends(get_allergy_service)
+):
+    response = await service.get_allergy_batch(batch)
+    return json_response(response) if FAST_ASSEMBLY else response
+
+@router.post(
+    "/allergy/stream",
+    summary="Stream every allergy match as NDJSON or a JSON array"
+)
+async def stream_allergy(
+    payload: AllergyPayload,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|json)$", description="ndjson or json"),
     service: AllergyService = Depends(get_allergy_service)
-) -> AllergyResponse:
-    return await service.get_allergy(payload, page, row)
+):
+    return stream_rows(service.iter_rows(payload), fmt)
@@ -1,47 +1,161 @@
 # File: api/routers/drugs.py
 
-import os
+from typing import Optional, Union
 from fastapi import APIRouter, Depends, Query
-from neo4j import basic_auth, AsyncGraphDatabase
-from dotenv import load_dotenv
 
-from domain.models import DrugPayload, DrugsResponse
-from infrastructure.neo4j_repository import Neo4jDrugRepository
-from domain.services.interaction_service import InteractionService
-
-# Load environment
-load_dotenv("api.env")
-
-# Neo4j configuration
-NEO4J_URI  = os.getenv("NEO4J_URI_STAGING")
-NEO4J_USER = os.getenv("NEO4J_USERNAME_STAGING")
-NEO4J_PASS = os.getenv("NEO4J_PASSWORD_STAGING")
-
-driver = AsyncGraphDatabase.driver(
-    NEO4J_URI,
-    auth=basic_auth(NEO4J_USER, NEO4J_PASS),
-    max_connection_pool_size=20
+from domain.repository import DrugRepository
+from domain.models import (
+    DrugPayload,
+    DrugsResponse,
+    NormalizedDrugsResponse,
+    BatchDrugPayload,
+    BatchDrugsResponse,
+    ScreeningPayload,
+    ScreeningResponse,
+    DrugSessionUpdate,
+    DrugSessionResponse,
+)
+from infrastructure.query_profile import RequestProfile
+from api.requests import payload_body, payload_openapi
+from api.responses import json_response, stream_rows
+from api.dependencies import (
+    get_repo,
+    cypher_profile,
+    get_contrast_engine,
+    get_result_cache,
+    session_store,
+    pipeline_metrics,
+    CONTRAST_STRATEGY,
+    FAST_ASSEMBLY,
+    FAST_DECODE,
+    BATCH_MAX_PATIENTS,
+    STAGE_TIMEOUT_SECONDS,
 )
+from domain.services.interaction_service import InteractionService
+from domain.services.allergy_service import AllergyService
+from domain.services.screening_service import ScreeningService
 
 router = APIRouter(prefix="/api/v1")
 
-def get_repo() -> Neo4jDrugRepository:
-    return Neo4jDrugRepository(driver)
-
 def get_interaction_service(
-    repo: Neo4jDrugRepository = Depends(get_repo)
+    repo: DrugRepository = Depends(get_repo),
+    profile: Optional[RequestProfile] = Depends(cypher_profile)
 ) -> InteractionService:
-    return InteractionService(repo)
+    return InteractionService(
+        repo,
+        contrast_engine=get_contrast_engine(profile),
+        contrast_strategy=CONTRAST_STRATEGY,
+        result_cache=get_result_cache(profile),
+        fast_assembly=FAST_ASSEMBLY,
+        stage_timeout=STAGE_TIMEOUT_SECONDS,
+        session_store=session_store,
+        metrics=pipeline_metrics
+    )
+
+def get_screening_service(
+    service: InteractionService = Depends(get_interaction_service)
+) -> ScreeningService:
+    return ScreeningService(
+        service,
+        AllergyService(
+            service.repo,
+            fast_assembly=FAST_ASSEMBLY,
+            stage_timeout=STAGE_TIMEOUT_SECONDS,
+            metrics=service.metrics
+        )
+    )
 
 @router.post(
     "/drugs",
-    response_model=DrugsResponse,
-    summary="Get drug interaction contrasts"
+    response_model=Union[DrugsResponse, NormalizedDrugsResponse],
+    summary="Get drug interaction contrasts",
+    openapi_extra=payload_openapi(DrugPayload)
 )
 async def get_interactions(
-    payload: DrugPayload,
+    payload: DrugPayload = Depends(payload_body(DrugPayload, FAST_DECODE)),
     page: int = Query(1, ge=1, description="Page number, default=1"),
     row:  int = Query(10, ge=1, description="Items per page, default=10"),
+    cursor: Optional[str] = Query(None, description="Cursor from pagination.next; overrides page"),
+    view: str = Query(
+        "full",
+        pattern="^(full|normalized)$",
+        description="normalized: rows reference interaction monographs sent once per SUBS pair"
+    ),
+    service: InteractionService = Depends(get_interaction_service)
+):
+    response = await service.get_interactions(payload, page, row, cursor, view)
+    return json_response(response) if FAST_ASSEMBLY else response
+
+@router.post(
+    "/drugs/batch",
+    response_model=BatchDrugsResponse,
+    summary="Screen many patients' drug lists for interactions in one call",
+    openapi_extra=payload_openapi(BatchDrugPayload)
+)
+async def get_interactions_batch(
+    batch: BatchDrugPayload = Depends(
+        payload_body(BatchDrugPayload, FAST_DECODE, max_items={"patients": BATCH_MAX_PATIENTS})
+    ),
     service: InteractionService = Depends(get_interaction_service)
-) -> DrugsResponse:
-    return await service.get_interactions(payload, page, row)
+):
+    response = await service.get_interactions_batch(batch)
+    return json_response(response) if FAST_ASSEMBLY else response
+
+@router.post(
+    "/drugs/sessions",
+    response_model=DrugSessionResponse,
+    summary="Open a prescribing session and screen its initial drug list"
+)
+async def open_session(
+    payload: DrugPayload,
+    service: InteractionService = Depends(get_interaction_service)
+):
+    response = await service.open_session(payload)
+    return json_response(response) if FAST_ASSEMBLY else response
+
+@router.patch(
+    "/drugs/sessions/{session_id}",
+    response_model=DrugSessionResponse,
+    summary="Add or remove drugs in a session, re-screening only the changed substances"
+)
+async def update_session(
+    session_id: str,
+    change: DrugSessionUpdate,
+    service: InteractionService = Depends(get_interaction_service)
+):
+    response = await service.update_session(session_id, change)
+    return json_response(response) if FAST_ASSEMBLY else response
+
+@router.delete(
+    "/drugs/sessions/{session_id}",
+    summary="Close a prescribing session"
+)
+async def close_session(
+    session_id: str,
+    service: InteractionService = Depends(get_interaction_service)
+) -> dict:
+    service.close_session(session_id)
+    return {"status": True, "code": 200, "message": "delete success"}
+
+@router.post(
+    "/drugs/stream",
+    summary="Stream every drug interaction contrast as NDJSON or a JSON array"
+)
+async def stream_interactions(
+    payload: DrugPayload,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|json)$", description="ndjson or json"),
+    service: InteractionService = Depends(get_interaction_service)
+):
+    return stream_rows(service.iter_rows(payload), fmt)
+
+@router.post(
+    "/screening",
+    response_model=ScreeningResponse,
+    summary="Check drug interactions and allergies in one call"
+)
+async def screen(
+    payload: ScreeningPayload,
+    service: ScreeningService = Depends(get_screening_service)
+):
+    response = await service.screen(payload)
+    return json_response(response) if FAST_ASSEMBLY else response
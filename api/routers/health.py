@@ -0,0 +1,29 @@
+# File: api/routers/health.py
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from api.dependencies import warmup_state
+
+router = APIRouter(tags=["health"])
+
+@router.get(
+    "/live",
+    summary="Liveness probe: the process is serving requests"
+)
+async def live() -> JSONResponse:
+    return JSONResponse(content={"status": True, "code": 200, "message": "alive"})
+
+@router.get(
+    "/ready",
+    summary="Readiness probe: 503 until the startup warm-up has finished"
+)
+async def ready() -> JSONResponse:
+    if not warmup_state.ready:
+        return JSONResponse(
+            status_code=503,
+            content={"status": False, "code": 503, "message": "warming up", "data": warmup_state.stats()}
+        )
+    return JSONResponse(
+        content={"status": True, "code": 200, "message": "ready", "data": warmup_state.stats()}
+    )
@@ -0,0 +1,88 @@
+# File: benchmarks/contrast_strategies.py
+#
+# Compare the two database contrast paths against a live Neo4j:
+#   pairs : query_details -> combinations(SUBS, 2) -> CONTRAST_CYPHER
+#   graph : CONTRAST_BY_CODES_CYPHER (one traversal from the raw codes)
+#
+# Usage:
+#   python -m benchmarks.contrast_strategies payload.json [--runs 20]
+# where payload.json is a DrugPayload body ({"drug_currents": [...], ...}).
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+from itertools import combinations
+from typing import List
+
+from dotenv import load_dotenv
+from neo4j import basic_auth, AsyncGraphDatabase
+
+from domain.models import DrugPayload
+from infrastructure.neo4j_repository import Neo4jDrugRepository
+from utils.helpers import item_codes
+
+async def run_pairs(repo: Neo4jDrugRepository, curr: List[str], hist: List[str]):
+    codes = list(dict.fromkeys(curr + hist))
+    details = await repo.query_details(codes)
+    sids = sorted({sid for c in codes for sid in (details.get(c) or {}).get("subs_codes", [])})
+    pairs = [list(p) for p in combinations(sids, 2)]
+    records = await repo.fetch_contrasts(pairs)
+    return {(r["sub1_id"], r["sub2_id"]) for r in records}, len(pairs)
+
+async def run_graph(repo: Neo4jDrugRepository, curr: List[str], hist: List[str]):
+    records = await repo.fetch_contrasts_for_codes(curr, hist)
+    return {(r["sub1_id"], r["sub2_id"]) for r in records}, 0
+
+async def bench(name, fn, repo, curr, hist, runs):
+    timings = []
+    found, n_pairs = set(), 0
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        found, n_pairs = await fn(repo, curr, hist)
+        timings.append((time.perf_counter() - t0) * 1000)
+    timings.sort()
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    print(
+        f"{name:<6} p50={statistics.median(timings):8.1f} ms  p95={p95:8.1f} ms  "
+        f"pairs_param={n_pairs:<6} contrasts={len(found)}"
+    )
+    return found
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare pair-list and single-traversal contrast lookups")
+    parser.add_argument("payload", help="DrugPayload JSON file")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(args.payload, encoding="utf-8") as fh:
+        payload = DrugPayload(**json.load(fh))
+    curr = list(dict.fromkeys(c for it in payload.drug_currents  for c in item_codes(it)))
+    hist = list(dict.fromkeys(c for it in payload.drug_histories for c in item_codes(it)))
+
+    load_dotenv("api.env")
+    driver = AsyncGraphDatabase.driver(
+        os.getenv("NEO4J_URI_STAGING"),
+        auth=basic_auth(os.getenv("NEO4J_USERNAME_STAGING"), os.getenv("NEO4J_PASSWORD_STAGING"))
+    )
+    try:
+        repo = Neo4jDrugRepository(driver)
+        print(f"codes: {len(curr)} current, {len(hist)} history, {args.runs} runs")
+        # one untimed pass each to warm plan caches
+        await run_pairs(repo, curr, hist)
+        await run_graph(repo, curr, hist)
+        by_pairs = await bench("pairs", run_pairs, repo, curr, hist, args.runs)
+        by_graph = await bench("graph", run_graph, repo, curr, hist, args.runs)
+    finally:
+        await driver.close()
+
+    if by_pairs != by_graph:
+        # the graph path expands the full hierarchy, so it may find more SUBS
+        print(f"differs: only pairs={sorted(by_pairs - by_graph)} only graph={sorted(by_graph - by_pairs)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
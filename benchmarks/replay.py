@@ -0,0 +1,148 @@
+# File: benchmarks/replay.py
+#
+# Record Neo4j responses for a corpus of payloads, then replay them to
+# measure the service layer's CPU time and round trips without a database.
+#
+# Usage:
+#   # against staging (api.env), writes the fixture file
+#   python -m benchmarks.replay record --fixtures replay.json payloads/*.json
+#
+#   # no database; exits 1 if a payload needs more round trips than budgeted
+#   python -m benchmarks.replay run --fixtures replay.json --budget budget.json payloads/*.json
+#   python -m benchmarks.replay run --fixtures replay.json --budget budget.json --update-budget payloads/*.json
+#
+# A payload file holds a DrugPayload or, if it has "drug_allergies", an
+# AllergyPayload body. Services run over a bare Neo4jDrugRepository (no
+# process-wide caches), so counts reflect one cold request.
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+from typing import Any, List, Dict, Tuple
+
+from dotenv import load_dotenv
+from neo4j import basic_auth, AsyncGraphDatabase
+
+from benchmarks.replay_driver import RecordingDriver, ReplayDriver, FixtureMissError
+from domain.models import DrugPayload, AllergyPayload
+from domain.services.interaction_service import InteractionService
+from domain.services.allergy_service import AllergyService
+from infrastructure.neo4j_repository import Neo4jDrugRepository
+
+def load_payloads(paths: List[str]) -> List[Tuple[str, Any]]:
+    payloads = []
+    for path in paths:
+        with open(path, encoding="utf-8") as fh:
+            body = json.load(fh)
+        model = AllergyPayload if "drug_allergies" in body else DrugPayload
+        payloads.append((os.path.basename(path), model(**body)))
+    return payloads
+
+async def run_payload(driver, payload, strategy: str) -> int:
+    """Run one payload through its service; return the number of result rows."""
+    repo = Neo4jDrugRepository(driver)
+    payload = payload.model_copy(deep=True)
+    if isinstance(payload, AllergyPayload):
+        rows = await AllergyService(repo).build_rows(payload)
+    else:
+        rows = await InteractionService(repo, contrast_strategy=strategy).build_rows(payload)
+    return len(rows)
+
+async def record(args) -> int:
+    load_dotenv("api.env")
+    inner = AsyncGraphDatabase.driver(
+        os.getenv("NEO4J_URI_STAGING"),
+        auth=basic_auth(os.getenv("NEO4J_USERNAME_STAGING"), os.getenv("NEO4J_PASSWORD_STAGING"))
+    )
+    driver = RecordingDriver(inner)
+    try:
+        for name, payload in load_payloads(args.payloads):
+            driver.reset_counts()
+            n_rows = await run_payload(driver, payload, args.strategy)
+            print(f"{name:<30} rows={n_rows:<6} round_trips={driver.total_round_trips}")
+    finally:
+        await driver.close()
+    driver.save(args.fixtures)
+    print(f"wrote {len(driver.entries)} recorded queries to {args.fixtures}")
+    return 0
+
+async def replay(args) -> int:
+    driver = ReplayDriver(
+        args.fixtures,
+        latency_ms=args.latency_ms,
+        recorded_latency=args.recorded_latency,
+        strict=not args.lenient
+    )
+    budget: Dict[str, Dict[str, int]] = {}
+    if args.budget and os.path.exists(args.budget):
+        with open(args.budget, encoding="utf-8") as fh:
+            budget = json.load(fh)
+
+    failures: List[str] = []
+    measured: Dict[str, Dict[str, int]] = {}
+    print(f"{'payload':<30} {'rows':>6} {'rt':>4} {'budget':>6} {'cpu p50':>9} {'wall p50':>9}  queries")
+    for name, payload in load_payloads(args.payloads):
+        cpu, wall = [], []
+        try:
+            for _ in range(args.runs):
+                driver.reset_counts()
+                c0, w0 = time.process_time(), time.perf_counter()
+                n_rows = await run_payload(driver, payload, args.strategy)
+                cpu.append((time.process_time() - c0) * 1000)
+                wall.append((time.perf_counter() - w0) * 1000)
+        except FixtureMissError as exc:
+            failures.append(f"{name}: {exc}")
+            continue
+
+        round_trips = driver.total_round_trips
+        measured[name] = {"round_trips": round_trips}
+        allowed = budget.get(name, {}).get("round_trips")
+        print(
+            f"{name:<30} {n_rows:>6} {round_trips:>4} {allowed if allowed is not None else '-':>6} "
+            f"{statistics.median(cpu):>6.1f} ms {statistics.median(wall):>6.1f} ms  "
+            f"{dict(driver.round_trips)}"
+        )
+        if allowed is not None and round_trips > allowed and not args.update_budget:
+            failures.append(f"{name}: {round_trips} round trips, budget {allowed}")
+
+    if driver.misses:
+        print(f"unrecorded queries answered empty: {dict(driver.misses)}")
+    if args.update_budget and args.budget:
+        budget.update(measured)
+        with open(args.budget, "w", encoding="utf-8") as fh:
+            json.dump(budget, fh, indent=2, sort_keys=True)
+        print(f"updated {args.budget}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Record and replay Neo4j responses for service benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="run payloads against Neo4j and save the responses")
+    rec.add_argument("payloads", nargs="+")
+    rec.add_argument("--fixtures", required=True, help="fixture file to write")
+    rec.add_argument("--strategy", choices=["pairs", "graph"], default="pairs")
+
+    run = sub.add_parser("run", help="replay payloads from fixtures")
+    run.add_argument("payloads", nargs="+")
+    run.add_argument("--fixtures", required=True)
+    run.add_argument("--strategy", choices=["pairs", "graph"], default="pairs")
+    run.add_argument("--runs", type=int, default=5)
+    run.add_argument("--latency-ms", type=float, default=0.0, help="injected latency per round trip")
+    run.add_argument("--recorded-latency", action="store_true", help="replay the latency seen when recording")
+    run.add_argument("--lenient", action="store_true", help="answer unrecorded queries with no rows")
+    run.add_argument("--budget", help="JSON file of allowed round trips per payload")
+    run.add_argument("--update-budget", action="store_true", help="write measured round trips to --budget")
+
+    args = parser.parse_args()
+    return asyncio.run(record(args) if args.command == "record" else replay(args))
+
+if __name__ == "__main__":
+    sys.exit(main())
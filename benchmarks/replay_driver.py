@@ -0,0 +1,269 @@
+# File: benchmarks/replay_driver.py
+#
+# Record/replay of Neo4j traffic at the driver level.
+#
+# RecordingDriver wraps a real AsyncDriver and stores every query's result
+# rows (keyed by query name + canonical parameters) in a fixture file.
+# ReplayDriver serves those rows back with optional injected latency, so
+# Neo4jDrugRepository and the services run unchanged against real data
+# shapes, and counts the round trips they make.
+
+import json
+import time
+import asyncio
+import hashlib
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Any, Callable, List, Dict, Optional, Tuple
+
+from utils.cypher import query_name as cypher_name
+
+FIXTURE_VERSION = 1
+
+# UNWIND queries whose rows can be attributed to one element of the list
+# parameter: (parameter, element of a row). Lets replay answer a query
+# whose list was split or merged differently from the recording.
+UNWIND_KEYS: Dict[str, Tuple[str, Callable[[dict], Any]]] = {
+    "DRUGSEARCH_CYPHER": ("qs",       lambda row: row["code"]),
+    "SUBS_NAME_CYPHER":  ("subs_ids", lambda row: row["code"]),
+    "CONTRAST_CYPHER":   ("pairs",    lambda row: [row["sub1_id"], row["sub2_id"]]),
+}
+
+class FixtureMissError(KeyError):
+    """Raised in strict replay when a query was never recorded."""
+
+
+def _elem_key(elem: Any) -> str:
+    return json.dumps(elem, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def query_name(query: str) -> str:
+    """utils.cypher constant name, so fixtures stay readable; else a text hash."""
+    text = query.strip()
+    return cypher_name(text, "") or "sha1:" + hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def _canon(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Canonical form of the parameters: the order of a list parameter does not
+    matter (the services build code lists from sets, whose order varies per
+    process). Elements themselves, e.g. SUBS pairs, keep their order.
+    """
+    return {
+        k: sorted(v, key=_elem_key) if isinstance(v, (list, tuple)) else v
+        for k, v in sorted(params.items())
+    }
+
+
+def fixture_key(name: str, params: Dict[str, Any]) -> str:
+    return name + ":" + json.dumps(_canon(params), sort_keys=True, ensure_ascii=False, default=str)
+
+
+class ReplayRecord(dict):
+    """Row with the subset of neo4j.Record the repository uses."""
+
+    def data(self) -> dict:
+        return dict(self)
+
+
+class ReplayResult:
+    """Buffered result rows with the subset of neo4j.AsyncResult in use."""
+
+    def __init__(self, rows: List[dict]):
+        self._rows = [ReplayRecord(r) for r in rows]
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for row in self._rows:
+            yield row
+
+    async def single(self) -> Optional[ReplayRecord]:
+        return self._rows[0] if self._rows else None
+
+    async def data(self) -> List[dict]:
+        return [r.data() for r in self._rows]
+
+    async def consume(self) -> None:
+        return None
+
+
+class _Session(ABC):
+    """Base session: also acts as its own transaction for execute_read/write."""
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        return None
+
+    async def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs) -> ReplayResult:
+        params = dict(parameters or {}, **kwargs)
+        name = query_name(query)
+        self._driver.round_trips[name] += 1
+        return ReplayResult(await self._fetch(query, name, params))
+
+    async def execute_read(self, work, *args, **kwargs):
+        return await work(self, *args, **kwargs)
+
+    async def execute_write(self, work, *args, **kwargs):
+        return await work(self, *args, **kwargs)
+
+    @abstractmethod
+    async def _fetch(self, query: str, name: str, params: Dict[str, Any]) -> List[dict]:
+        """Result rows of one query."""
+        ...
+
+
+class _RecordingSession(_Session):
+
+    def __init__(self, driver, inner):
+        super().__init__(driver)
+        self._inner = inner
+
+    async def close(self) -> None:
+        await self._inner.close()
+
+    async def _fetch(self, query: str, name: str, params: Dict[str, Any]) -> List[dict]:
+        t0 = time.perf_counter()
+        result = await self._inner.run(query, params)
+        rows = [record.data() async for record in result]
+        self._driver.add(name, params, rows, (time.perf_counter() - t0) * 1000)
+        return rows
+
+
+class _ReplaySession(_Session):
+
+    async def _fetch(self, query: str, name: str, params: Dict[str, Any]) -> List[dict]:
+        rows, elapsed_ms = self._driver.lookup(name, params)
+        delay = elapsed_ms if self._driver.recorded_latency else self._driver.latency_ms
+        if delay:
+            await asyncio.sleep(delay / 1000.0)
+        return rows
+
+
+class _FixtureDriver:
+
+    def __init__(self):
+        self.entries: Dict[str, dict] = {}
+        self.round_trips: Counter = Counter()
+
+    @property
+    def total_round_trips(self) -> int:
+        return sum(self.round_trips.values())
+
+    def reset_counts(self) -> None:
+        self.round_trips.clear()
+
+
+class RecordingDriver(_FixtureDriver):
+    """Wraps a real AsyncDriver and records every query it runs."""
+
+    def __init__(self, inner):
+        super().__init__()
+        self.inner = inner
+
+    def session(self, **kwargs) -> _RecordingSession:
+        return _RecordingSession(self, self.inner.session(**kwargs))
+
+    def add(self, name: str, params: Dict[str, Any], rows: List[dict], elapsed_ms: float) -> None:
+        self.entries[fixture_key(name, params)] = {
+            "query":      name,
+            "params":     params,
+            "rows":       rows,
+            "elapsed_ms": round(elapsed_ms, 3),
+        }
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(
+                {"version": FIXTURE_VERSION, "entries": list(self.entries.values())},
+                fh, ensure_ascii=False, indent=1, default=str
+            )
+
+    async def close(self) -> None:
+        await self.inner.close()
+
+
+class ReplayDriver(_FixtureDriver):
+    """
+    Serves recorded rows instead of talking to Neo4j.
+
+    latency_ms        : fixed delay per round trip (0 = as fast as possible)
+    recorded_latency  : replay each query with the latency seen when recording
+    strict            : raise FixtureMissError for unrecorded queries
+                        (otherwise answer with no rows and count a miss)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        latency_ms: float = 0.0,
+        recorded_latency: bool = False,
+        strict: bool = True
+    ):
+        super().__init__()
+        self.latency_ms = latency_ms
+        self.recorded_latency = recorded_latency
+        self.strict = strict
+        self.misses: Counter = Counter()
+        # query name -> element key -> rows, and elements seen per query
+        self._by_elem: Dict[str, Dict[str, List[dict]]] = {}
+        self._known: Dict[str, set] = {}
+
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        if data.get("version") != FIXTURE_VERSION:
+            raise ValueError(f"unsupported fixture version {data.get('version')!r}")
+        for entry in data["entries"]:
+            self.entries[fixture_key(entry["query"], entry["params"])] = entry
+            self._index(entry)
+
+    def _index(self, entry: dict) -> None:
+        spec = UNWIND_KEYS.get(entry["query"])
+        if spec is None or len(entry["params"]) != 1:
+            return
+        param, elem_of = spec
+        by_elem = self._by_elem.setdefault(entry["query"], {})
+        known = self._known.setdefault(entry["query"], set())
+        rows: Dict[str, List[dict]] = {}
+        for row in entry["rows"]:
+            rows.setdefault(_elem_key(elem_of(row)), []).append(row)
+        # an element recorded by several entries keeps its first rows
+        for elem in map(_elem_key, entry["params"].get(param) or []):
+            if elem not in known:
+                known.add(elem)
+                if elem in rows:
+                    by_elem[elem] = rows[elem]
+
+    def session(self, **kwargs) -> _ReplaySession:
+        return _ReplaySession(self)
+
+    def lookup(self, name: str, params: Dict[str, Any]) -> Tuple[List[dict], float]:
+        entry = self.entries.get(fixture_key(name, params))
+        if entry is not None:
+            return entry["rows"], entry.get("elapsed_ms", 0.0)
+
+        # Same UNWIND query over a different split of recorded elements
+        spec = UNWIND_KEYS.get(name)
+        if spec is not None and set(params) == {spec[0]}:
+            elems = [_elem_key(e) for e in params[spec[0]] or []]
+            known = self._known.get(name, set())
+            if all(e in known for e in elems):
+                by_elem = self._by_elem.get(name, {})
+                return [row for e in dict.fromkeys(elems) for row in by_elem.get(e, [])], 0.0
+
+        self.misses[name] += 1
+        if self.strict:
+            raise FixtureMissError(f"no recording for {name} with {params!r}")
+        return [], 0.0
+
+    async def close(self) -> None:
+        return None
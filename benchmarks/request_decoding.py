@@ -0,0 +1,82 @@
+# File: benchmarks/request_decoding.py
+#
+# Request-body decoding cost of /drugs and /allergy: what FastAPI does for
+# a `payload: DrugPayload` parameter (json.loads + Pydantic validation)
+# against the fast path of api/requests.py (Pydantic's JSON parser).
+#
+# Usage:
+#   python -m benchmarks.request_decoding [--items 10 100 1000] [--runs 200]
+# Items look like EHR exports: every field present, mostly empty strings.
+
+import sys
+import json
+import time
+import argparse
+import statistics
+
+from domain.models import DrugItem, DrugPayload, AllergyPayload
+from api.requests import decode_payload
+
+def ehr_item(i: int) -> dict:
+    item = {name: "" for name in DrugItem.model_fields}
+    item.update(quantity=0, external=False)
+    if i % 3 == 0:
+        item["tpu_code"] = f"{100000 + i}"
+    elif i % 3 == 1:
+        item["gpu_code"] = f"{200000 + i}"
+        item["quantity"] = 2
+    else:
+        item["name"] = f"drug {i} 500 mg"
+    return item
+
+def body(model, n_items: int) -> bytes:
+    data = {"drug_currents": [ehr_item(i) for i in range(n_items)], "drug_histories": []}
+    if model is AllergyPayload:
+        data["drug_allergies"] = [ehr_item(i) for i in range(max(1, n_items // 10))]
+    return json.dumps(data).encode("utf-8")
+
+def validated(model, raw: bytes):
+    # FastAPI's path for a body parameter
+    return model.model_validate(json.loads(raw), from_attributes=True)
+
+def fast(model, raw: bytes):
+    return decode_payload(model, raw, "application/json")
+
+def same(a, b) -> bool:
+    fields = list(DrugItem.model_fields)
+    return all(
+        [[getattr(x, f) for f in fields] for x in getattr(a, group) or []]
+        == [[getattr(y, f) for f in fields] for y in getattr(b, group) or []]
+        for group in type(a).model_fields
+    )
+
+def bench(fn, model, raw: bytes, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn(model, raw)
+        timings.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(timings)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark payload decoding, Pydantic vs fast path")
+    parser.add_argument("--items", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--runs",  type=int, default=200)
+    args = parser.parse_args()
+
+    for model in (DrugPayload, AllergyPayload):
+        for n in args.items:
+            raw = body(model, n)
+            if not same(validated(model, raw), fast(model, raw)):
+                print(f"{model.__name__} items={n}: decoded payloads differ")
+                return 1
+            slow_ms = bench(validated, model, raw, args.runs)
+            fast_ms = bench(fast, model, raw, args.runs)
+            print(
+                f"{model.__name__:<14} items={n:<5} bytes={len(raw):<8} "
+                f"validated={slow_ms:8.3f} ms  fast={fast_ms:8.3f} ms  x{slow_ms / fast_ms:5.1f}"
+            )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+# File: benchmarks/row_assembly.py
+#
+# Row assembly + serialization cost of InteractionService, validated vs fast
+# mode vs the normalized view (?view=normalized), on synthetic data that
+# produces thousands of ContrastItem rows. gzip is the size on the wire for
+# clients that accept it.
+#
+# Usage:
+#   python -m benchmarks.row_assembly [--subs 6] [--items 20] [--runs 5]
+# Rows produced = C(subs, 2) * items².
+
+import sys
+import gzip
+import json
+import time
+import argparse
+import statistics
+from itertools import combinations
+
+from domain.models import (
+    DrugItem,
+    DrugsResponse,
+    NormalizedDrugsResponse,
+    NormalizedPage,
+    PageResponse,
+    Pagination,
+)
+from domain.services.interaction_service import InteractionService
+from api.responses import json_response
+
+def synthetic(n_subs: int, n_items: int):
+    subs_to_items = {}
+    for s in range(n_subs):
+        sid = f"S{s:04d}"
+        subs_to_items[sid] = [
+            DrugItem(
+                tpu_code=f"TPU{s:03d}{i:03d}", tpu_name=f"Drug {s}-{i} 500 mg tablet",
+                tp_code=f"TP{s:03d}{i:03d}",   tp_name=f"Brand {s}-{i}",
+                gpu_code=f"GPU{s:03d}",        gpu_name=f"Generic {s} 500 mg tablet",
+                gp_code=f"GP{s:03d}",          gp_name=f"Generic {s} 500 mg",
+                vtm_code=f"VTM{s:03d}",        vtm_name=f"Substance {s}",
+            )
+            for i in range(n_items)
+        ]
+    pairs = [list(p) for p in combinations(sorted(subs_to_items), 2)]
+    text = "Lorem ipsum dolor sit amet. " * 40
+    pair_to_data = {
+        (a, b): {
+            "sub1_id": a, "sub1_name": f"name {a}",
+            "sub2_id": b, "sub2_name": f"name {b}",
+            "severity": "Major", "documentation": "Established",
+            "interaction_detail_en": text, "interaction_detail_th": text,
+            "onset": "Delayed", "significance": "1",
+            "management": text, "discussion": text, "reference": text,
+        }
+        for a, b in pairs
+    }
+    return pairs, pair_to_data, subs_to_items
+
+def run(mode: str, pairs, pair_to_data, subs_to_items):
+    fast = mode != "validated"
+    service = InteractionService(repo=None, fast_assembly=fast)
+    t0 = time.perf_counter()
+    rows = service.assemble_rows(pairs, pair_to_data, subs_to_items)
+    pagination = Pagination(page=1, row=len(rows), total=len(rows))
+    if mode == "normalized":
+        refs, monographs = service.normalize(rows)
+        response = NormalizedDrugsResponse(
+            status=True, code=200, message="get success",
+            data=NormalizedPage(pagination=pagination, data=refs, monographs=monographs)
+        )
+    else:
+        response = DrugsResponse(
+            status=True, code=200, message="get success",
+            data=PageResponse[type(rows[0])](pagination=pagination, data=rows)
+        )
+    t1 = time.perf_counter()
+    if fast:
+        body = json_response(response).body
+    else:
+        # what FastAPI does with response_model: re-validate, dump, json.dumps
+        validated = DrugsResponse.model_validate(response.model_dump())
+        body = json.dumps(
+            validated.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+    t2 = time.perf_counter()
+    return (t1 - t0) * 1000, (t2 - t1) * 1000, len(rows), len(body), len(gzip.compress(body, 5))
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark ContrastItem assembly and serialization")
+    parser.add_argument("--subs",  type=int, default=6)
+    parser.add_argument("--items", type=int, default=20, help="DrugItems per SUBS")
+    parser.add_argument("--runs",  type=int, default=5)
+    args = parser.parse_args()
+
+    data = synthetic(args.subs, args.items)
+    for mode in ("validated", "fast", "normalized"):
+        asm, ser = [], []
+        for _ in range(args.runs):
+            a, s, n_rows, n_bytes, n_gzip = run(mode, *data)
+            asm.append(a)
+            ser.append(s)
+        print(
+            f"{mode:<10} rows={n_rows:<6} bytes={n_bytes:<10} gzip={n_gzip:<9} "
+            f"assemble={statistics.median(asm):8.1f} ms  serialize={statistics.median(ser):8.1f} ms"
+        )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
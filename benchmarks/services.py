@@ -0,0 +1,160 @@
+# File: benchmarks/services.py
+#
+# End-to-end latency and allocations of InteractionService / AllergyService
+# on a synthetic catalogue, served by InMemoryDrugRepository (no Neo4j).
+#
+# Each interaction run is split into phases so a regression can be pinned
+# down: resolve (names, details, enrichment), contrasts (pair generation +
+# contrast lookup) and assemble (ContrastItem rows).
+#
+# Usage:
+#   python -m benchmarks.services [--sizes 2,10,50,100,200] [--runs 5]
+#       [--density 0.01] [--latency-ms 0] [--strategy pairs] [--validated]
+#       [--json results.json]
+
+import sys
+import json
+import math
+import time
+import asyncio
+import argparse
+import statistics
+import tracemalloc
+from typing import Any, Awaitable, Callable, List, Dict
+
+from benchmarks.synthetic import (
+    SyntheticCatalogue,
+    InMemoryDrugRepository,
+    drug_payload,
+    allergy_payload,
+)
+from domain.services.interaction_service import InteractionService
+from domain.services.allergy_service import AllergyService
+
+async def interaction_phases(service: InteractionService, payload) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    subs_to_items, _, _ = await service.prepare(payload.model_copy(deep=True))
+    t1 = time.perf_counter()
+    subs_to_items, pairs, records = await service.resolve_and_contrast(payload.model_copy(deep=True))
+    t2 = time.perf_counter()
+    pair_to_data = {(r["sub1_id"], r["sub2_id"]): r for r in records}
+    rows = service.assemble_rows(pairs, pair_to_data, subs_to_items)
+    t3 = time.perf_counter()
+    return {
+        "resolve_ms":   (t1 - t0) * 1000,
+        "contrasts_ms": max(0.0, (t2 - t1) - (t1 - t0)) * 1000,
+        "assemble_ms":  (t3 - t2) * 1000,
+        "subs":         len(subs_to_items),
+        "rows":         len(rows),
+    }
+
+async def measure(run: Callable[[], Awaitable[Any]], runs: int) -> Dict[str, float]:
+    """Median/p95 wall time over `runs`, then one traced run for allocations."""
+    timings: List[float] = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        await run()
+        timings.append((time.perf_counter() - t0) * 1000)
+    timings.sort()
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        await run()
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    allocated = sum(s.size_diff for s in after.compare_to(before, "filename") if s.size_diff > 0)
+    return {
+        "p50_ms":       statistics.median(timings),
+        "p95_ms":       timings[max(0, math.ceil(len(timings) * 0.95) - 1)],
+        "peak_kib":     peak / 1024,
+        "retained_kib": allocated / 1024,
+    }
+
+async def bench_size(cat: SyntheticCatalogue, n: int, args) -> Dict[str, Any]:
+    fast = not args.validated
+    result: Dict[str, Any] = {"drugs": n}
+
+    # Interaction
+    d_payload = drug_payload(cat, n, seed=n)
+    repo = InMemoryDrugRepository(cat, args.latency_ms)
+    service = InteractionService(repo, contrast_strategy=args.strategy, fast_assembly=fast)
+
+    async def run_interactions():
+        return await service.build_rows(d_payload.model_copy(deep=True))
+
+    result["interaction"] = await measure(run_interactions, args.runs)
+    repo.round_trips.clear()
+    rows = await run_interactions()
+    result["interaction"]["rows"] = len(rows)
+    result["interaction"]["round_trips"] = sum(repo.round_trips.values())
+    phases = [await interaction_phases(service, d_payload) for _ in range(args.runs)]
+    for key in ("resolve_ms", "contrasts_ms", "assemble_ms"):
+        result["interaction"][key] = statistics.median(p[key] for p in phases)
+    result["interaction"]["subs"] = phases[0]["subs"]
+
+    # Allergy
+    a_payload = allergy_payload(cat, n, seed=n)
+    repo = InMemoryDrugRepository(cat, args.latency_ms)
+    service = AllergyService(repo, fast_assembly=fast)
+
+    async def run_allergy():
+        return await service.build_rows(a_payload.model_copy(deep=True))
+
+    result["allergy"] = await measure(run_allergy, args.runs)
+    repo.round_trips.clear()
+    rows = await run_allergy()
+    result["allergy"]["rows"] = len(rows)
+    result["allergy"]["round_trips"] = sum(repo.round_trips.values())
+    return result
+
+def report(results: List[Dict[str, Any]]) -> None:
+    print(
+        f"{'drugs':>5} | {'interaction p50':>15} {'p95':>8} {'resolve':>8} {'contrast':>8} "
+        f"{'assemble':>8} {'subs':>5} {'rows':>7} {'rt':>3} {'peak KiB':>9} | "
+        f"{'allergy p50':>11} {'rows':>5} {'rt':>3} {'peak KiB':>9}"
+    )
+    for r in results:
+        i, a = r["interaction"], r["allergy"]
+        print(
+            f"{r['drugs']:>5} | {i['p50_ms']:>12.1f} ms {i['p95_ms']:>8.1f} {i['resolve_ms']:>8.1f} "
+            f"{i['contrasts_ms']:>8.1f} {i['assemble_ms']:>8.1f} {i['subs']:>5} {i['rows']:>7} "
+            f"{i['round_trips']:>3} {i['peak_kib']:>9.0f} | "
+            f"{a['p50_ms']:>8.1f} ms {a['rows']:>5} {a['round_trips']:>3} {a['peak_kib']:>9.0f}"
+        )
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the services on a synthetic TMT catalogue")
+    parser.add_argument("--sizes", default="2,10,50,100,200", help="comma-separated payload sizes")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--subs", type=int, default=500, help="SUBS nodes in the catalogue")
+    parser.add_argument("--vtm", type=int, default=400)
+    parser.add_argument("--gp-per-vtm", type=int, default=2)
+    parser.add_argument("--gpu-per-gp", type=int, default=2)
+    parser.add_argument("--tp-per-gp", type=int, default=2)
+    parser.add_argument("--density", type=float, default=0.01, help="CONTRAST_WITH share of SUBS pairs")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated latency per round trip")
+    parser.add_argument("--strategy", choices=["pairs", "graph"], default="pairs")
+    parser.add_argument("--validated", action="store_true", help="validate rows instead of fast assembly")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    cat = SyntheticCatalogue(
+        subs=args.subs, vtm=args.vtm, gp_per_vtm=args.gp_per_vtm,
+        gpu_per_gp=args.gpu_per_gp, tp_per_gp=args.tp_per_gp,
+        contrast_density=args.density, seed=args.seed
+    )
+    print(f"catalogue: {cat.stats()}")
+
+    results = [await bench_size(cat, int(n), args) for n in args.sizes.split(",")]
+    report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"catalogue": cat.stats(), "args": vars(args), "results": results}, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
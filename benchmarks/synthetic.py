@@ -0,0 +1,265 @@
+# File: benchmarks/synthetic.py
+#
+# Synthetic TMT catalogue and an in-memory DrugRepository serving it, so the
+# services can be benchmarked without the staging Neo4j.
+#
+# Hierarchy (mirrors the graph): SUBS -> VTM -> GP -> GPU / TP -> TPU, with
+# one DRUG row per TPU carrying every level's code/name and its SUBS list.
+# CONTRAST_WITH density is the fraction of all SUBS pairs that interact.
+
+import random
+import asyncio
+from typing import List, Dict, Optional, Tuple
+
+from domain.repository import DrugRepository
+from domain.models import DrugItem, DrugPayload, AllergyPayload
+from utils.helpers import LEVELS
+
+SEVERITIES = ["Major", "Moderate", "Minor"]
+DOCUMENTATION = ["Established", "Probable", "Suspected", "Possible", "Unlikely"]
+ONSETS = ["Rapid", "Delayed", "Not Specified"]
+
+class SyntheticCatalogue:
+    """Generated TMT data: DRUG rows, SUBS names and CONTRAST_WITH edges."""
+
+    def __init__(
+        self,
+        subs: int = 500,
+        vtm: int = 400,
+        gp_per_vtm: int = 2,
+        gpu_per_gp: int = 2,
+        tp_per_gp: int = 2,
+        contrast_density: float = 0.01,
+        external_ratio: float = 0.02,
+        text_len: int = 400,
+        seed: int = 42
+    ):
+        rng = random.Random(seed)
+        self.subs_names: Dict[str, str] = {
+            f"1{i:06d}": f"SUBSTANCE {i}" for i in range(subs)
+        }
+        subs_ids = list(self.subs_names)
+
+        # DRUG rows, one per TPU
+        self.drugs: List[dict] = []
+        counters = {lvl: 0 for lvl in LEVELS}
+
+        def next_code(lvl: str) -> str:
+            counters[lvl] += 1
+            return f"{LEVELS.index(lvl) + 2}{counters[lvl]:06d}"
+
+        for v in range(vtm):
+            # every SUBS used at least once; ~20% of VTMs are combinations
+            sids = [subs_ids[v % subs]]
+            if rng.random() < 0.2:
+                sids += rng.sample(subs_ids, rng.randint(1, 2))
+            sids = list(dict.fromkeys(sids))
+            vtm_code = next_code("vtm")
+            vtm_name = " + ".join(self.subs_names[s] for s in sids)
+            for g in range(gp_per_vtm):
+                gp_code = next_code("gp")
+                gp_name = f"{vtm_name} {(g + 1) * 250} mg tablet"
+                gpus = [(next_code("gpu"), f"{gp_name}, {n + 1} tablet") for n in range(gpu_per_gp)]
+                tps  = [(next_code("tp"),  f"BRAND{counters['tp']} ({gp_name})") for _ in range(tp_per_gp)]
+                for gpu_code, gpu_name in gpus:
+                    for tp_code, tp_name in tps:
+                        self.drugs.append({
+                            "tpu_code": next_code("tpu"),
+                            "tpu_name": f"{tp_name} {gpu_name}",
+                            "tp_code":  tp_code,  "tp_name":  tp_name,
+                            "gpu_code": gpu_code, "gpu_name": gpu_name,
+                            "gp_code":  gp_code,  "gp_name":  gp_name,
+                            "vtm_code": vtm_code, "vtm_name": vtm_name,
+                            "subs_codes": list(sids),
+                            "subs_names": [self.subs_names[s] for s in sids],
+                            "external": rng.random() < external_ratio,
+                        })
+
+        # First DRUG row per code, as DRUGSEARCH_CYPHER's `best` would pick
+        self.by_code: Dict[str, Tuple[int, str]] = {}
+        for idx, row in enumerate(self.drugs):
+            for lvl in LEVELS:
+                self.by_code.setdefault(row[f"{lvl}_code"], (idx, lvl.upper()))
+            for sid in row["subs_codes"]:
+                self.by_code.setdefault(sid, (idx, "SUBS"))
+        self.by_name: Dict[str, int] = {}
+        for idx, row in enumerate(self.drugs):
+            for lvl in LEVELS:
+                self.by_name.setdefault(row[f"{lvl}_name"].lower(), idx)
+            for name in row["subs_names"]:
+                self.by_name.setdefault(name.lower(), idx)
+
+        # CONTRAST_WITH edges, keyed by the ordered SUBS pair
+        total = subs * (subs - 1) // 2
+        n_edges = min(total, round(contrast_density * total))
+        text = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * (text_len // 56 + 1))[:text_len]
+        self.contrasts: Dict[Tuple[str, str], dict] = {}
+        while len(self.contrasts) < n_edges:
+            a, b = sorted(rng.sample(subs_ids, 2))
+            self.contrasts.setdefault((a, b), {
+                "severity":              rng.choice(SEVERITIES),
+                "documentation":         rng.choice(DOCUMENTATION),
+                "interaction_detail_en": text,
+                "interaction_detail_th": text,
+                "onset":                 rng.choice(ONSETS),
+                "significance":          str(rng.randint(1, 5)),
+                "management":            text,
+                "discussion":            text,
+                "reference":             text,
+            })
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "subs":      len(self.subs_names),
+            "drugs":     len(self.drugs),
+            "contrasts": len(self.contrasts),
+        }
+
+    def best(self, code: str) -> Optional[dict]:
+        """Detail record shaped like DRUGSEARCH_CYPHER's `best`, or None."""
+        hit = self.by_code.get(code)
+        if hit is None:
+            return None
+        idx, level = hit
+        row = self.drugs[idx]
+        return {
+            "level": level,
+            **{k: v for k, v in row.items() if k not in ("subs_codes", "subs_names")},
+            "subs_codes": list(row["subs_codes"]),
+            "subs_names": list(row["subs_names"]),
+            "score": 1.0,
+        }
+
+
+class InMemoryDrugRepository(DrugRepository):
+    """
+    DrugRepository over a SyntheticCatalogue, with the same result shapes as
+    Neo4jDrugRepository. `latency_ms` is added to every call to model one
+    database round trip; `round_trips` counts calls per method.
+    """
+
+    def __init__(self, catalogue: SyntheticCatalogue, latency_ms: float = 0.0):
+        self.catalogue = catalogue
+        self.latency = latency_ms / 1000.0
+        self.round_trips: Dict[str, int] = {}
+
+    @property
+    def driver(self):
+        return None
+
+    async def _round_trip(self, method: str) -> None:
+        self.round_trips[method] = self.round_trips.get(method, 0) + 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def resolve_names(self, names: List[str]) -> Dict[str, List[str]]:
+        await self._round_trip("resolve_names")
+        cat = self.catalogue
+        name_map: Dict[str, List[str]] = {}
+        for name in names:
+            q = name.lower().strip()
+            idx = cat.by_name.get(q)
+            if idx is None:
+                # STRING_SEARCH_CYPHER: first DRUG with a name/code containing q
+                idx = next(
+                    (i for i, row in enumerate(cat.drugs)
+                     if any(q in str(v).lower() for k, v in row.items() if k != "external")),
+                    None
+                )
+            if idx is not None:
+                name_map[name] = sorted(set(cat.drugs[idx]["subs_codes"]))
+        return name_map
+
+    async def query_details(self, codes: List[str]) -> Dict[str, dict]:
+        await self._round_trip("query_details")
+        details: Dict[str, dict] = {}
+        for code in codes:
+            best = self.catalogue.best(code)
+            if best is not None:
+                details[code] = best
+        return details
+
+    async def resolve_subs(self, codes: List[str]) -> Dict[str, List[str]]:
+        await self._round_trip("resolve_subs")
+        mapping: Dict[str, List[str]] = {}
+        for code in codes:
+            best = self.catalogue.best(code)
+            mapping[code] = best["subs_codes"] if best else []
+        return mapping
+
+    async def fetch_contrasts(self, pairs: List[List[str]]) -> List[dict]:
+        await self._round_trip("fetch_contrasts")
+        cat = self.catalogue
+        records: List[dict] = []
+        for a, b in pairs:
+            attrs = cat.contrasts.get((a, b)) or cat.contrasts.get((b, a))
+            if attrs is not None:
+                records.append({
+                    "sub1_id": a, "sub1_name": cat.subs_names.get(a, ""),
+                    "sub2_id": b, "sub2_name": cat.subs_names.get(b, ""),
+                    **attrs,
+                })
+        return records
+
+    async def fetch_subs_name_map(self, subs_ids: List[str]) -> Dict[str, str]:
+        await self._round_trip("fetch_subs_name_map")
+        names = self.catalogue.subs_names
+        return {sid: names[sid] for sid in subs_ids if sid in names}
+
+
+def _pick_item(cat: SyntheticCatalogue, rng: random.Random, by_name: float = 0.0) -> DrugItem:
+    row = rng.choice(cat.drugs)
+    roll = rng.random()
+    if roll < by_name:
+        return DrugItem(name=rng.choice(row["subs_names"]))
+    if roll < 0.6:
+        return DrugItem(tpu_code=row["tpu_code"], quantity=1)
+    if roll < 0.8:
+        return DrugItem(gpu_code=row["gpu_code"])
+    if roll < 0.9:
+        return DrugItem(vtm_code=row["vtm_code"])
+    return DrugItem(subs_code=rng.choice(row["subs_codes"]))
+
+
+def drug_payload(
+    cat: SyntheticCatalogue,
+    n_drugs: int,
+    history_ratio: float = 0.3,
+    seed: int = 0
+) -> DrugPayload:
+    """`n_drugs` items split into currents and histories (some by name only)."""
+    rng = random.Random(seed)
+    n_hist = int(n_drugs * history_ratio)
+    return DrugPayload(
+        drug_currents=[_pick_item(cat, rng) for _ in range(max(1, n_drugs - n_hist))],
+        drug_histories=[_pick_item(cat, rng, by_name=0.1) for _ in range(n_hist)],
+    )
+
+
+def allergy_payload(
+    cat: SyntheticCatalogue,
+    n_drugs: int,
+    history_ratio: float = 0.3,
+    allergy_ratio: float = 0.1,
+    seed: int = 0
+) -> AllergyPayload:
+    """Like drug_payload, plus allergies of which about half hit an active SUBS."""
+    rng = random.Random(seed)
+    base = drug_payload(cat, n_drugs, history_ratio, seed)
+    active: List[str] = []
+    for it in base.drug_currents + base.drug_histories:
+        best = cat.best(it.tpu_code or it.gpu_code or it.vtm_code or it.subs_code or "")
+        if best:
+            active.extend(best["subs_codes"])
+    allergies: List[DrugItem] = []
+    for i in range(max(1, int(n_drugs * allergy_ratio))):
+        if i % 2 == 0 and active:
+            allergies.append(DrugItem(subs_code=rng.choice(active)))
+        else:
+            allergies.append(_pick_item(cat, rng))
+    return AllergyPayload(
+        drug_currents=base.drug_currents,
+        drug_histories=base.drug_histories,
+        drug_allergies=allergies,
+    )
+
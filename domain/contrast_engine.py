@@ -0,0 +1,21 @@
+# File: domain/contrast_engine.py
+
+from abc import ABC, abstractmethod
+from typing import Iterable, List
+
+class ContrastEngine(ABC):
+    """Port interface for in-memory CONTRAST_WITH lookups among SUBS IDs."""
+
+    @property
+    @abstractmethod
+    def ready(self) -> bool:
+        """True once the engine holds a catalogue and can answer lookups."""
+        ...
+
+    @abstractmethod
+    def find_contrasts(self, subs_ids: Iterable[str]) -> List[dict]:
+        """
+        Contrast records among `subs_ids`, shaped like CONTRAST_CYPHER rows
+        with sub1_id < sub2_id, sorted by pair.
+        """
+        ...
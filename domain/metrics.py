@@ -0,0 +1,54 @@
+# File: domain/metrics.py
+
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Iterator
+
+class PipelineMetrics(ABC):
+    """Port interface for the measurements the services report."""
+
+    @abstractmethod
+    def stage(self, stage: str, seconds: float) -> None:
+        """Duration of one pipeline stage (names, details, enrich, ...)."""
+        ...
+
+    @abstractmethod
+    def pipeline(self, pipeline: str, seconds: float) -> None:
+        """End-to-end duration of one service call."""
+        ...
+
+    @abstractmethod
+    def rows(self, pipeline: str, count: int) -> None:
+        """Result rows of one service call."""
+        ...
+
+    @abstractmethod
+    def pairs(self, kind: str, count: int) -> None:
+        """SUBS pairs of one request, "candidate" or "interacting"."""
+        ...
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        """Time a block as pipeline stage `stage`."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage(stage, time.perf_counter() - t0)
+
+
+class NullMetrics(PipelineMetrics):
+    """Records nothing; used when no recorder is injected."""
+
+    def stage(self, stage: str, seconds: float) -> None:
+        return None
+
+    def pipeline(self, pipeline: str, seconds: float) -> None:
+        return None
+
+    def rows(self, pipeline: str, count: int) -> None:
+        return None
+
+    def pairs(self, kind: str, count: int) -> None:
+        return None
@@ -32,10 +32,34 @@ class AllergyPayload(BaseModel):
     drug_histories:  Optional[List[DrugItem]] = []
     drug_allergies:  List[DrugItem] = Field(..., min_items=1)
 
+class ScreeningPayload(BaseModel):
+    drug_currents:   List[DrugItem] = Field(..., min_items=1)
+    drug_histories:  Optional[List[DrugItem]] = []
+    drug_allergies:  Optional[List[DrugItem]] = []
+
+class DrugSessionUpdate(BaseModel):
+    add_currents:     Optional[List[DrugItem]] = []
+    add_histories:    Optional[List[DrugItem]] = []
+    remove_currents:  Optional[List[DrugItem]] = []
+    remove_histories: Optional[List[DrugItem]] = []
+
+class PatientDrugPayload(DrugPayload):
+    patient_id: str
+
+class PatientAllergyPayload(AllergyPayload):
+    patient_id: str
+
+class BatchDrugPayload(BaseModel):
+    patients: List[PatientDrugPayload] = Field(..., min_items=1)
+
+class BatchAllergyPayload(BaseModel):
+    patients: List[PatientAllergyPayload] = Field(..., min_items=1)
+
 class Pagination(BaseModel):
     page:  int = Field(..., ge=1)
     row:   int = Field(..., ge=0)
     total: int = Field(..., ge=0)
+    next:  Optional[str] = Field(None, description="Opaque cursor for the next page")
 
 class PageResponse(BaseModel, Generic[T]):
     pagination: Pagination
@@ -97,14 +121,109 @@ class AllergyItem(BaseModel):
     )
     allergy_substances: List[Dict[str, str]]
 
+class InteractionMonograph(BaseModel):
+    input_substances:      List[Dict[str, str]]
+    contrast_substances:   List[Dict[str, str]]
+    interaction_detail_en: str
+    interaction_detail_th: str
+    onset:                 str
+    severity:              str
+    documentation:         str
+    significance:          str
+    management:            str
+    discussion:            str
+    reference:             str
+
+class ContrastRef(BaseModel):
+    """A ContrastItem whose interaction text is in NormalizedPage.monographs."""
+    ref_id:                str
+    input_tpu_code:        str
+    input_tpu_name:        str
+    input_tp_code:         str
+    input_tp_name:         str
+    input_gpu_code:        str
+    input_gpu_name:        str
+    input_gp_code:         str
+    input_gp_name:         str
+    input_vtm_code:        str
+    input_vtm_name:        str
+    input_description:     str
+    contrast_tpu_code:     str
+    contrast_tpu_name:     str
+    contrast_tp_code:      str
+    contrast_tp_name:      str
+    contrast_gpu_code:     str
+    contrast_gpu_name:     str
+    contrast_gp_code:      str
+    contrast_gp_name:      str
+    contrast_vtm_code:     str
+    contrast_vtm_name:     str
+    contrast_description:  str
+    contrast_type:         int
+    monograph_id:          str = Field(..., description="Key into monographs: the row's SUBS pair")
+
+class NormalizedPage(BaseModel):
+    pagination: Pagination
+    data:       List[ContrastRef]
+    monographs: Dict[str, InteractionMonograph]
+
 class DrugsResponse(BaseModel):
     status:  bool
     code:    int
     message: str
     data:    PageResponse[ContrastItem]
 
+class NormalizedDrugsResponse(BaseModel):
+    status:  bool
+    code:    int
+    message: str
+    data:    NormalizedPage
+
 class AllergyResponse(BaseModel):
     status:  bool
     code:    int
     message: str
     data:    PageResponse[AllergyItem]
+
+class PatientContrasts(BaseModel):
+    patient_id: str
+    total:      int
+    data:       List[ContrastItem]
+
+class PatientAllergies(BaseModel):
+    patient_id: str
+    total:      int
+    data:       List[AllergyItem]
+
+class BatchDrugsResponse(BaseModel):
+    status:  bool
+    code:    int
+    message: str
+    data:    List[PatientContrasts]
+
+class BatchAllergyResponse(BaseModel):
+    status:  bool
+    code:    int
+    message: str
+    data:    List[PatientAllergies]
+
+class ScreeningResult(BaseModel):
+    contrasts: List[ContrastItem]
+    allergies: List[AllergyItem]
+
+class ScreeningResponse(BaseModel):
+    status:  bool
+    code:    int
+    message: str
+    data:    ScreeningResult
+
+class DrugSessionResult(BaseModel):
+    session_id: str
+    total:      int
+    data:       List[ContrastItem]
+
+class DrugSessionResponse(BaseModel):
+    status:  bool
+    code:    int
+    message: str
+    data:    DrugSessionResult
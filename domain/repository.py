@@ -1,7 +1,8 @@
 # File: domain/repository.py
 
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from itertools import combinations
+from typing import AsyncIterator, List, Dict
 
 class DrugRepository(ABC):
     """Port interface for drug-related data operations."""
@@ -26,7 +27,40 @@ class DrugRepository(ABC):
         """Execute contrast queries for SUBS ID pairs and return raw records."""
         ...
 
+    async def stream_contrasts(self, pairs: List[List[str]]) -> AsyncIterator[dict]:
+        """
+        Like fetch_contrasts, but yield records as they arrive. Adapters that
+        can stream from the database override this; the default buffers.
+        """
+        for record in await self.fetch_contrasts(pairs):
+            yield record
+
     @abstractmethod
     async def fetch_subs_name_map(self, subs_ids: List[str]) -> Dict[str, str]:
         """Obtain human-readable SUBS names for a list of SUBS IDs."""
         ...
+
+    async def fetch_contrasts_for_codes(
+        self,
+        current_codes: List[str],
+        history_codes: List[str]
+    ) -> List[dict]:
+        """
+        Resolve raw current/history codes to SUBS and return the contrast
+        records among them, each with `sub1_codes`/`sub2_codes` listing the
+        input codes that led to that SUBS. Adapters may override this with
+        a single round trip; the default composes the methods above.
+        """
+        codes = list(dict.fromkeys(current_codes + history_codes))
+        details = await self.query_details(codes)
+        origin: Dict[str, List[str]] = {}
+        for code in codes:
+            for sid in (details.get(code) or {}).get("subs_codes", []):
+                origin.setdefault(sid, []).append(code)
+
+        pairs = [list(p) for p in combinations(sorted(origin), 2)]
+        records = await self.fetch_contrasts(pairs) if pairs else []
+        for rec in records:
+            rec["sub1_codes"] = origin.get(rec["sub1_id"], [])
+            rec["sub2_codes"] = origin.get(rec["sub2_id"], [])
+        return records
@@ -1,111 +1,269 @@
 # File: domain/services/allergy_service.py
 
 import time
-from typing import List, Dict
+import asyncio
+from typing import AsyncIterator, Iterator, List, Dict, Optional, Tuple
 from collections import OrderedDict
 
+from domain.metrics import NullMetrics, PipelineMetrics
 from domain.repository import DrugRepository
+from domain.services.resolution_context import ResolutionContext
+from domain.services.result_cache import ResultCache, payload_fingerprint, paginate
+from domain.services.stages import run_concurrently, run_stage
 from domain.models import (
     DrugItem,
     AllergyPayload,
     AllergyItem,
     AllergyResponse,
     PageResponse,
-    Pagination,
+    BatchAllergyPayload,
+    BatchAllergyResponse,
+    PatientAllergies,
 )
-from utils.helpers import codes_from_item, fill_codes, enrich_items
+from utils.helpers import apply_details, code_fields, trusted_model
 
 class AllergyService:
     """Orchestrates allergy summary workflow."""
 
-    def __init__(self, repo: DrugRepository):
+    def __init__(
+        self,
+        repo: DrugRepository,
+        result_cache: Optional[ResultCache] = None,
+        fast_assembly: bool = False,
+        stage_timeout: Optional[float] = None,
+        metrics: Optional[PipelineMetrics] = None
+    ):
         self.repo = repo
+        self.result_cache = result_cache
+        # Build rows without re-validating already trusted values
+        self.fast_assembly = fast_assembly
+        # Per-stage budget (seconds) for repository round trips
+        self.stage_timeout = stage_timeout
+        # Stage timings, pipeline totals and row counts
+        self.metrics = metrics or NullMetrics()
 
     async def get_allergy(
         self,
         payload: AllergyPayload,
         page: int = 1,
-        row: int = 10
+        row: int = 10,
+        cursor: Optional[str] = None
     ) -> AllergyResponse:
-        # 0) (Optional) start timer
+        # 0) Start timer
         t0 = time.perf_counter()
 
-        # 1) Combine all items and cache raw codes
-        all_items = payload.drug_currents + payload.drug_histories + payload.drug_allergies
-        code_cache = { id(it): await codes_from_item(it) for it in all_items }
+        # Serve later pages of the same payload from the result cache
+        key = payload_fingerprint(
+            "allergy",
+            current=payload.drug_currents,
+            history=payload.drug_histories,
+            allergy=payload.drug_allergies
+        )
+        rows = self.result_cache.get(key) if self.result_cache is not None else None
+        if rows is None:
+            rows = await self.build_rows(payload)
+            if self.result_cache is not None:
+                self.result_cache.put(key, rows)
 
-        # Flatten any nested lists in code_cache
-        for key, codes in list(code_cache.items()):
-            flat: List[str] = []
-            for code in codes:
-                if isinstance(code, list):
-                    flat.extend(code)
-                else:
-                    flat.append(code)
-            code_cache[key] = flat
+        # 9) Paginate
+        with self.metrics.timed("paginate"):
+            page_data, pagination = paginate(rows, key, page, row, cursor)
+
+        # Record total time
+        self.metrics.rows("allergy", len(rows))
+        self.metrics.pipeline("allergy", time.perf_counter() - t0)
+
+        return AllergyResponse(
+            status=True,
+            code=200,
+            message="get success",
+            data=PageResponse(
+                pagination=pagination,
+                data=page_data
+            )
+        )
+
+    async def get_allergy_batch(self, batch: BatchAllergyPayload) -> BatchAllergyResponse:
+        """Screen many patients at once; every patient gets all of its rows."""
+        t0 = time.perf_counter()
+        results = await self.build_rows_batch(batch.patients)
+
+        self.metrics.rows("allergy_batch", sum(len(rows) for rows in results))
+        self.metrics.pipeline("allergy_batch", time.perf_counter() - t0)
+        return BatchAllergyResponse(
+            status=True,
+            code=200,
+            message="get success",
+            data=[
+                PatientAllergies(patient_id=p.patient_id, total=len(rows), data=rows)
+                for p, rows in zip(batch.patients, results)
+            ]
+        )
+
+    async def build_rows(self, payload: AllergyPayload) -> List[AllergyItem]:
+        """Run the full pipeline and return every AllergyItem, unpaginated."""
+        return (await self.build_rows_batch([payload]))[0]
+
+    async def iter_rows(self, payload: AllergyPayload) -> AsyncIterator[AllergyItem]:
+        """
+        Run the full pipeline, yielding AllergyItem rows one by one as they
+        are built. The assemble stage counts the time spent building rows,
+        not the time the consumer holds on to each one.
+        """
+        ctx, ((subs_curr_set, subs_hist_set),), subs_name_map = await self.prepare_batch([payload])
+        rows = self.iter_allergy_rows(
+            ctx, payload.drug_allergies, subs_curr_set, subs_hist_set, subs_name_map
+        )
+        building, count = 0.0, 0
+        try:
+            while True:
+                t0 = time.perf_counter()
+                item = next(rows, None)
+                building += time.perf_counter() - t0
+                if item is None:
+                    return
+                count += 1
+                yield item
+        finally:
+            self.metrics.stage("assemble", building)
+            self.metrics.rows("allergy_stream", count)
+
+    async def build_rows_batch(self, payloads: List[AllergyPayload]) -> List[List[AllergyItem]]:
+        """
+        Run the pipeline for many payloads with one shared context: names,
+        details and SUBS names each go to the repository once for the union
+        of all payloads. Rows are returned per payload, in order.
+        """
+        ctx, subs_sets, subs_name_map = await self.prepare_batch(payloads)
+
+        # 8) For each allergy item, emit only if it shares a SUBS with current/history
+        #    (at most one row per allergy item)
+        with self.metrics.timed("assemble"):
+            return [
+                self.allergy_rows(ctx, p.drug_allergies, subs_curr_set, subs_hist_set, subs_name_map)
+                for p, (subs_curr_set, subs_hist_set) in zip(payloads, subs_sets)
+            ]
 
-        # 2) Resolve names → subs_code for history/allergy items without codes
+    async def prepare_batch(
+        self,
+        payloads: List[AllergyPayload]
+    ) -> Tuple[ResolutionContext, List[Tuple[set, set]], Dict[str, str]]:
+        """
+        Steps 1–7 for many payloads: resolve and enrich every item.
+        Returns (context, current/history SUBS sets per payload, SUBS names).
+        """
+        ctx = ResolutionContext(self.repo)
+
+        # 1) Cache raw codes for every item
+        all_items = [
+            it for p in payloads
+            for it in p.drug_currents + p.drug_histories + p.drug_allergies
+        ]
+        known_codes = [c for it in all_items for c in ctx.item_codes(it)]
+
+        # 2) Resolve names → subs_code for history/allergy items without codes,
+        #    while details for the codes already in the payload are fetched
         name_items = [
-            it for it in payload.drug_histories + payload.drug_allergies
-            if not code_cache[id(it)] and it.name
+            it for p in payloads for it in p.drug_histories + p.drug_allergies
+            if not ctx.item_codes(it) and it.name
         ]
+        stages = {"details": ctx.fetch_details(known_codes)}
         if name_items:
-            name_map = await self.repo.resolve_names([it.name for it in name_items])
-            # print(f"Resolved names: {name_map}")
-            for it in name_items:
-                subs = name_map.get(it.name)
-                if subs:
-                    if isinstance(subs, list):
-                        it.subs_code = subs[0]
-                        code_cache[id(it)] = subs
-                    else:
-                        it.subs_code = subs
-                        code_cache[id(it)] = [subs]
+            stages["names"] = ctx.resolve_names([it.name for it in name_items])
+        name_map = (await run_concurrently(self.stage_timeout, self.metrics, **stages)).get("names", {})
+        for it in name_items:
+            subs = name_map.get(it.name)
+            if subs:
+                if isinstance(subs, list):
+                    it.subs_code = subs[0]
+                    ctx.set_codes(it, subs)
+                else:
+                    it.subs_code = subs
+                    ctx.set_codes(it, [subs])
 
         # 3) Collect all unique codes across groups
-        curr_codes    = { c for it in payload.drug_currents  for c in code_cache[id(it)] }
-        hist_codes    = { c for it in payload.drug_histories for c in code_cache[id(it)] }
-        allergy_codes = { c for it in payload.drug_allergies  for c in code_cache[id(it)] }
-        all_codes     = list(curr_codes | hist_codes | allergy_codes)
+        groups = [
+            (
+                { c for it in p.drug_currents  for c in ctx.item_codes(it) },
+                { c for it in p.drug_histories for c in ctx.item_codes(it) },
+            )
+            for p in payloads
+        ]
+        all_codes = list(dict.fromkeys(c for it in all_items for c in ctx.item_codes(it)))
 
-        # 4) Resolve SUBS sets and fetch detailed info
-        subs_map   = await self.repo.resolve_subs(all_codes)
-        detail_map = await self.repo.query_details(all_codes)
+        # 4) Fetch details for the codes that came out of name resolution
+        detail_map = await run_stage(
+            "details", ctx.fetch_details(all_codes), self.stage_timeout, self.metrics
+        )
 
-        # 5) Enrich each DrugItem with full hierarchy codes & names
-        await enrich_items(self.repo.driver, payload.drug_currents,  detail_map)
-        await enrich_items(self.repo.driver, payload.drug_histories, detail_map)
-        await enrich_items(self.repo.driver, payload.drug_allergies, detail_map)
+        # 5) Build sets of active SUBS from currents and histories
+        subs_sets = [
+            (
+                { sid for code in curr_codes for sid in ctx.subs_codes(code) },
+                { sid for code in hist_codes for sid in ctx.subs_codes(code) },
+            )
+            for curr_codes, hist_codes in groups
+        ]
+        active_subs = { sid for curr, hist in subs_sets for sid in curr | hist }
 
-        # 6) Build sets of active SUBS from currents and histories
-        subs_curr_set = { sid for code in curr_codes    for sid in subs_map.get(code, []) }
-        subs_hist_set = { sid for code in hist_codes    for sid in subs_map.get(code, []) }
-        active_subs   = subs_curr_set | subs_hist_set
+        # 6) Fetch human names only for allergy‐relevant SUBS; they depend
+        #    on the SUBS sets only, so enrichment runs while they load
+        subs_names = asyncio.ensure_future(
+            run_stage(
+                "subs_names", ctx.fetch_subs_names(active_subs), self.stage_timeout, self.metrics
+            )
+        )
 
-        # 7) Fetch human names only for allergy‐relevant SUBS
-        subs_name_map = await self.repo.fetch_subs_name_map(list(active_subs))
-        # print(subs_name_map)
+        # 7) Enrich each DrugItem with full hierarchy codes & names; a failure
+        #    here must not leave the SUBS name lookup running
+        try:
+            with self.metrics.timed("enrich"):
+                for p in payloads:
+                    apply_details(p.drug_currents,  detail_map)
+                    apply_details(p.drug_histories, detail_map)
+                    apply_details(p.drug_allergies, detail_map)
+            subs_name_map = await subs_names
+        finally:
+            subs_names.cancel()
+        return ctx, subs_sets, subs_name_map
 
-        # 8) For each allergy item, emit only if it shares a SUBS with current/history
-        rows: List[AllergyItem] = []
-        for allergy in payload.drug_allergies:
-            its_codes = code_cache[id(allergy)]
+    def allergy_rows(
+        self,
+        ctx: ResolutionContext,
+        allergies: List[DrugItem],
+        subs_curr_set: set,
+        subs_hist_set: set,
+        subs_name_map: Dict[str, str]
+    ) -> List[AllergyItem]:
+        """Step 8: one row per allergy item sharing a SUBS with the current/history sets."""
+        return list(self.iter_allergy_rows(ctx, allergies, subs_curr_set, subs_hist_set, subs_name_map))
+
+    def iter_allergy_rows(
+        self,
+        ctx: ResolutionContext,
+        allergies: List[DrugItem],
+        subs_curr_set: set,
+        subs_hist_set: set,
+        subs_name_map: Dict[str, str]
+    ) -> Iterator[AllergyItem]:
+        """Step 8, yielding each row as soon as it is built."""
+        active_subs = subs_curr_set | subs_hist_set
+        for allergy in allergies:
             # collect all subs IDs for this allergy
             its_subs: set = set()
-            for code in its_codes:
-                info = detail_map.get(code, {})
-                its_subs |= set(info.get("subs_codes", []))
+            for code in ctx.item_codes(allergy):
+                its_subs.update(ctx.subs_codes(code))
 
             # find intersection with active
             common = its_subs & active_subs
             if not common:
                 continue
 
-            input_fields = await fill_codes("input", allergy)
+            input_fields = code_fields("input", allergy)
             in_curr = bool(common & subs_curr_set)
             in_hist = bool(common & subs_hist_set)
 
-            rows.append(AllergyItem(
+            values = dict(
                 **input_fields,
                 is_allergy=True,
                 allergy_type=(
@@ -117,23 +275,5 @@ class AllergyService:
                     {"code": sid, "name": subs_name_map.get(sid, "")}
                     for sid in sorted(common)
                 ]
-            ))
-
-        # 9) Paginate
-        total = len(rows)
-        start = (page - 1) * row
-        end   = start + row
-        page_data = rows[start:end]
-
-        # (Optional) log total time
-        # print(f"⏱ TOTAL get_allergy() took {time.perf_counter() - t0:.3f} sec")
-
-        return AllergyResponse(
-            status=True,
-            code=200,
-            message="get success",
-            data=PageResponse(
-                pagination=Pagination(page=page, row=len(page_data), total=total),
-                data=page_data
             )
-        )
+            yield trusted_model(AllergyItem, values) if self.fast_assembly else AllergyItem(**values)
@@ -1,142 +1,667 @@
 # File: domain/services/interaction_service.py
 
-import uuid
+import time
 from itertools import combinations
-from typing import List, Dict
+from typing import AsyncIterator, Iterable, List, Dict, Optional, Set, Tuple, Union
 
+from domain.contrast_engine import ContrastEngine
+from domain.metrics import NullMetrics, PipelineMetrics
 from domain.repository import DrugRepository
+from domain.services.resolution_context import ResolutionContext
+from domain.services.result_cache import ResultCache, item_key, payload_fingerprint, paginate
+from domain.services.session_store import ScreeningSession, SessionEntry, SessionStore
+from domain.services.stages import run_concurrently, run_stage
 from domain.models import (
     DrugItem,
     DrugPayload,
     ContrastItem,
     DrugsResponse,
     PageResponse,
-    Pagination,
+    ContrastRef,
+    InteractionMonograph,
+    NormalizedPage,
+    NormalizedDrugsResponse,
+    BatchDrugPayload,
+    BatchDrugsResponse,
+    PatientContrasts,
+    DrugSessionUpdate,
+    DrugSessionResult,
+    DrugSessionResponse,
 )
 from utils.helpers import (
-    codes_from_item,
-    fill_codes,
-    enrich_items,
+    LEVELS,
+    apply_details,
+    code_fields,
+    stable_ref_id,
+    trusted_model,
 )
 
 class InteractionService:
     """Orchestrates drug interaction contrast workflow."""
 
-    def __init__(self, repo: DrugRepository):
+    def __init__(
+        self,
+        repo: DrugRepository,
+        contrast_engine: Optional[ContrastEngine] = None,
+        contrast_strategy: str = "pairs",
+        result_cache: Optional[ResultCache] = None,
+        fast_assembly: bool = False,
+        stage_timeout: Optional[float] = None,
+        session_store: Optional[SessionStore] = None,
+        metrics: Optional[PipelineMetrics] = None
+    ):
         self.repo = repo
+        # When set and loaded, contrasts come from the in-memory adjacency
+        # instead of shipping every SUBS pair to CONTRAST_CYPHER.
+        self.contrast_engine = contrast_engine
+        # Database path otherwise: "pairs" (SUBS pair list) or "graph"
+        # (one traversal from the raw codes, see fetch_contrasts_for_codes)
+        self.contrast_strategy = contrast_strategy
+        self.result_cache = result_cache
+        self.fast_assembly = fast_assembly
+        # Per-stage budget (seconds) for repository round trips
+        self.stage_timeout = stage_timeout
+        # Prescribing sessions re-screened incrementally (open_session)
+        self.session_store = session_store
+        # Stage timings, pipeline totals, row and pair counts
+        self.metrics = metrics or NullMetrics()
 
     async def get_interactions(
         self,
         payload: DrugPayload,
         page: int = 1,
-        row: int = 10
-    ) -> DrugsResponse:
-        # 1) Resolve any history names to SUBS IDs
+        row: int = 10,
+        cursor: Optional[str] = None,
+        view: str = "full"
+    ) -> Union[DrugsResponse, NormalizedDrugsResponse]:
+        t0 = time.perf_counter()
+
+        # 0) Serve later pages of the same payload from the result cache
+        key = payload_fingerprint(
+            "drugs",
+            current=payload.drug_currents,
+            history=payload.drug_histories
+        )
+        rows = self.result_cache.get(key) if self.result_cache is not None else None
+        if rows is None:
+            rows = await self.build_rows(payload)
+            if self.result_cache is not None:
+                self.result_cache.put(key, rows)
+
+        # 9) Paginate
+        with self.metrics.timed("paginate"):
+            page_data, pagination = paginate(rows, key, page, row, cursor)
+
+        self.metrics.rows("interaction", len(rows))
+        if view == "normalized":
+            with self.metrics.timed("normalize"):
+                refs, monographs = self.normalize(page_data)
+            self.metrics.pipeline("interaction", time.perf_counter() - t0)
+            return NormalizedDrugsResponse(
+                status=True,
+                code=200,
+                message="get success",
+                data=NormalizedPage(
+                    pagination=pagination,
+                    data=refs,
+                    monographs=monographs
+                )
+            )
+        self.metrics.pipeline("interaction", time.perf_counter() - t0)
+        return DrugsResponse(
+            status=True,
+            code=200,
+            message="get success",
+            data=PageResponse(
+                pagination=pagination,
+                data=page_data
+            )
+        )
+
+    async def get_interactions_batch(self, batch: BatchDrugPayload) -> BatchDrugsResponse:
+        """Screen many patients at once; every patient gets all of its rows."""
+        t0 = time.perf_counter()
+        results = await self.build_rows_batch(batch.patients)
+
+        self.metrics.rows("interaction_batch", sum(len(rows) for rows in results))
+        self.metrics.pipeline("interaction_batch", time.perf_counter() - t0)
+        return BatchDrugsResponse(
+            status=True,
+            code=200,
+            message="get success",
+            data=[
+                PatientContrasts(patient_id=p.patient_id, total=len(rows), data=rows)
+                for p, rows in zip(batch.patients, results)
+            ]
+        )
+
+    async def open_session(self, payload: DrugPayload) -> DrugSessionResponse:
+        """Screen `payload` and keep its state server-side for later edits."""
+        t0 = time.perf_counter()
+        session = ScreeningSession()
+        await self._edit_session(session, payload.drug_currents, payload.drug_histories or [])
+        self.session_store.put(session)
+
+        self.metrics.pipeline("session_open", time.perf_counter() - t0)
+        return self._session_response(session, "create success")
+
+    async def update_session(self, session_id: str, change: DrugSessionUpdate) -> DrugSessionResponse:
+        """
+        Apply removals, then additions, to a session. Only SUBS pairs that
+        involve a newly present SUBS are checked; pairs whose SUBS left the
+        session are dropped, so an edit costs O(n) pair checks, not O(n²).
+        """
+        t0 = time.perf_counter()
+        session = self.session_store.get(session_id)
+        async with session.lock:
+            await self._edit_session(
+                session,
+                change.add_currents or [],
+                change.add_histories or [],
+                change.remove_currents or [],
+                change.remove_histories or []
+            )
+
+        self.metrics.pipeline("session_update", time.perf_counter() - t0)
+        return self._session_response(session, "update success")
+
+    def close_session(self, session_id: str) -> None:
+        self.session_store.drop(session_id)
+
+    def _session_response(self, session: ScreeningSession, message: str) -> DrugSessionResponse:
+        self.metrics.rows("session", len(session.rows))
+        return DrugSessionResponse(
+            status=True,
+            code=200,
+            message=message,
+            data=DrugSessionResult(
+                session_id=session.session_id,
+                total=len(session.rows),
+                data=session.rows
+            )
+        )
+
+    async def _edit_session(
+        self,
+        session: ScreeningSession,
+        add_currents: List[DrugItem],
+        add_histories: List[DrugItem],
+        remove_currents: List[DrugItem] = (),
+        remove_histories: List[DrugItem] = ()
+    ) -> None:
+        """Remove and add items, check the pairs of the new SUBS and refresh the rows."""
+        before = session.subs()
+        session.remove("current", remove_currents)
+        session.remove("history", remove_histories)
+
+        # 1–4) Resolve and enrich only the added items; keys are taken
+        #      before enrichment mutates them
+        added = add_currents + add_histories
+        if added:
+            keys = [item_key(it) for it in added]
+            ctx = ResolutionContext(self.repo)
+            curr_codes, hist_codes = await self.resolve_codes(
+                ctx,
+                DrugPayload.model_construct(drug_currents=add_currents, drug_histories=add_histories)
+            )
+            detail_map: Dict[str, dict] = await run_stage(
+                "details", ctx.fetch_details(curr_codes | hist_codes), self.stage_timeout, self.metrics
+            )
+            with self.metrics.timed("enrich"):
+                self.enrich(ctx, added, detail_map)
+                groups = ["current"] * len(add_currents) + ["history"] * len(add_histories)
+                for group, key, it in zip(groups, keys, added):
+                    session.entries.append(SessionEntry(group, key, it, self.item_subs(ctx, it)))
+
+        # 5) Forget pairs whose SUBS left the session
+        after = session.subs()
+        gone = before - after
+        if gone:
+            session.pair_to_data = {
+                pair: rec for pair, rec in session.pair_to_data.items()
+                if pair[0] not in gone and pair[1] not in gone
+            }
+
+        # 6–7) Check only the pairs that involve a newly present SUBS
+        new_subs = after - before
+        if new_subs:
+            if self._engine_ready():
+                with self.metrics.timed("contrasts"):
+                    records = [
+                        r for r in self.contrast_engine.find_contrasts(after)
+                        if r["sub1_id"] in new_subs or r["sub2_id"] in new_subs
+                    ]
+            else:
+                with self.metrics.timed("pairs"):
+                    pairs = sorted({
+                        (a, b) if a < b else (b, a)
+                        for a in new_subs for b in after if a != b
+                    })
+                self.metrics.pairs("candidate", len(pairs))
+                records = await run_stage(
+                    "contrasts",
+                    self.repo.fetch_contrasts([list(p) for p in pairs]),
+                    self.stage_timeout,
+                    self.metrics
+                )
+            self.metrics.pairs("interacting", len(records))
+            for r in records:
+                sid1, sid2 = r["sub1_id"], r["sub2_id"]
+                session.pair_to_data[(sid1, sid2) if sid1 < sid2 else (sid2, sid1)] = r
+
+        # 8) Re-assemble rows in the order a full screening produces
+        with self.metrics.timed("assemble"):
+            session.rows = self.assemble_rows(
+                [list(p) for p in sorted(session.pair_to_data)],
+                session.pair_to_data,
+                session.subs_to_items()
+            )
+
+    async def build_rows_batch(self, payloads: List[DrugPayload]) -> List[List[ContrastItem]]:
+        """
+        Run the pipeline for many payloads with one shared context: names,
+        details and contrasts each go to the repository once for the union
+        of all payloads, so the cost follows the distinct drugs rather than
+        the number of payloads. Rows are returned per payload, in order.
+        The graph strategy does not apply here; without a loaded contrast
+        engine the union of SUBS pairs goes through fetch_contrasts.
+        """
+        ctx = ResolutionContext(self.repo)
+        codes = await self.resolve_codes_many(ctx, payloads)
+
+        # 3–5) One detail lookup for every code of every payload, then link
+        all_codes = {c for curr, hist in codes for c in curr | hist}
+        detail_map = await run_stage(
+            "details", ctx.fetch_details(all_codes), self.stage_timeout, self.metrics
+        )
+        with self.metrics.timed("enrich"):
+            links = []
+            for p in payloads:
+                self.enrich(ctx, p.drug_currents + p.drug_histories, detail_map)
+                links.append(self.map_subs(ctx, p))
+
+        # 6–7) Interacting pairs per payload
+        pair_lists, pair_to_data = await self.contrasts_for(links)
+
+        # 8) Assemble each payload's rows
+        with self.metrics.timed("assemble"):
+            return [
+                self.assemble_rows(pairs, pair_to_data, subs_to_items)
+                for pairs, subs_to_items in zip(pair_lists, links)
+            ]
+
+    async def contrasts_for(
+        self,
+        links: List[Dict[str, List[DrugItem]]]
+    ) -> Tuple[List[List[List[str]]], Dict[tuple, dict]]:
+        """
+        Steps 6–7 for already linked payloads (one subs_to_items each): the
+        contrast engine when loaded, else one fetch_contrasts call for the
+        union of their candidate SUBS pairs.
+        Returns (SUBS pairs per payload in row order, pair -> contrast record).
+        """
+        if self._engine_ready():
+            with self.metrics.timed("contrasts"):
+                per_payload = [
+                    self.contrast_engine.find_contrasts(sorted(subs_to_items.keys()))
+                    for subs_to_items in links
+                ]
+            pair_lists = [[[r["sub1_id"], r["sub2_id"]] for r in recs] for recs in per_payload]
+            pair_to_data = {(r["sub1_id"], r["sub2_id"]): r for recs in per_payload for r in recs}
+        else:
+            pair_lists = [self._candidate_pairs(subs_to_items) for subs_to_items in links]
+            union = sorted({tuple(p) for pairs in pair_lists for p in pairs})
+            raw_records = await run_stage(
+                "contrasts",
+                self.repo.fetch_contrasts([list(p) for p in union]),
+                self.stage_timeout,
+                self.metrics
+            )
+            pair_to_data = {(r["sub1_id"], r["sub2_id"]): r for r in raw_records}
+        self.metrics.pairs("interacting", len(pair_to_data))
+        return pair_lists, pair_to_data
+
+    async def build_rows(self, payload: DrugPayload) -> List[ContrastItem]:
+        """Run the full pipeline and return every ContrastItem, unpaginated."""
+        subs_to_items, pairs, raw_records = await self.resolve_and_contrast(payload)
+        pair_to_data = { (r["sub1_id"], r["sub2_id"]): r for r in raw_records }
+
+        # 8) Assemble ContrastItem rows
+        with self.metrics.timed("assemble"):
+            return self.assemble_rows(pairs, pair_to_data, subs_to_items)
+
+    async def iter_rows(self, payload: DrugPayload) -> AsyncIterator[ContrastItem]:
+        """
+        Streaming variant of build_rows: yields ContrastItem rows as contrast
+        records arrive, without holding the full result in memory.
+        """
+        if self.contrast_strategy == "graph" or self._engine_ready():
+            subs_to_items, _, raw_records = await self.resolve_and_contrast(payload)
+            records = _aiter(raw_records)
+        else:
+            subs_to_items, _, _ = await self.prepare(payload)
+            pairs = self._candidate_pairs(subs_to_items)
+            records = self.repo.stream_contrasts(pairs)
+        assembler = _RowAssembler(subs_to_items, self.fast_assembly)
+
+        emitted = set()
+        async for rec in records:
+            pair = (rec["sub1_id"], rec["sub2_id"])
+            if pair in emitted:
+                continue
+            emitted.add(pair)
+            for item in assembler.rows_for(rec["sub1_id"], rec["sub2_id"], rec):
+                yield item
+
+    def _engine_ready(self) -> bool:
+        return self.contrast_engine is not None and self.contrast_engine.ready
+
+    def _candidate_pairs(self, subs_to_items: Dict[str, List[DrugItem]]) -> List[List[str]]:
+        with self.metrics.timed("pairs"):
+            pairs = [list(p) for p in combinations(sorted(subs_to_items.keys()), 2)]
+        self.metrics.pairs("candidate", len(pairs))
+        return pairs
+
+    async def resolve_and_contrast(
+        self,
+        payload: DrugPayload
+    ) -> Tuple[Dict[str, List[DrugItem]], List[List[str]], List[dict]]:
+        """
+        Steps 1–7: resolve the payload and fetch the raw contrast records.
+        Returns (subs_to_items, SUBS pairs in row order, contrast records).
+        """
+        ctx = ResolutionContext(self.repo)
+        curr_codes, hist_codes = await self.resolve_codes(ctx, payload)
+        return await self.link_and_contrast(ctx, payload, curr_codes, hist_codes)
+
+    async def link_and_contrast(
+        self,
+        ctx: ResolutionContext,
+        payload: DrugPayload,
+        curr_codes: Set[str],
+        hist_codes: Set[str]
+    ) -> Tuple[Dict[str, List[DrugItem]], List[List[str]], List[dict]]:
+        """
+        Steps 3–7 for a payload whose codes are resolved (resolve_codes):
+        enrich and link its items, then find the contrasts with the
+        configured strategy.
+        Returns (subs_to_items, SUBS pairs in row order, contrast records).
+        """
+        # 6–7) Find interacting SUBS pairs and their raw contrast records
+        if self._engine_ready():
+            subs_to_items = await self.link_subs(ctx, payload, curr_codes | hist_codes)
+            with self.metrics.timed("contrasts"):
+                raw_records = self.contrast_engine.find_contrasts(sorted(subs_to_items.keys()))
+            pairs = [[r["sub1_id"], r["sub2_id"]] for r in raw_records]
+        elif self.contrast_strategy == "graph":
+            # One traversal from the raw codes finds the interacting SUBS and
+            # names the input codes behind each (sub1_codes/sub2_codes); rows
+            # map back to items through the code item_subs reads their SUBS
+            # from, so both strategies link the same items. Details of the
+            # payload's codes came with step 1, only codes from name
+            # resolution are still fetched, alongside.
+            items = payload.drug_currents + payload.drug_histories
+            stages = await run_concurrently(
+                self.stage_timeout,
+                self.metrics,
+                details=ctx.fetch_details(curr_codes | hist_codes),
+                contrasts=self.repo.fetch_contrasts_for_codes(
+                    sorted(curr_codes), sorted(hist_codes)
+                ),
+            )
+            raw_records = stages["contrasts"]
+            with self.metrics.timed("enrich"):
+                self.enrich(ctx, items, stages["details"])
+                subs_to_items = self.link_records(
+                    raw_records, [(it, self.subs_source(ctx, it)) for it in items]
+                )
+            pairs = [[r["sub1_id"], r["sub2_id"]] for r in raw_records]
+        else:
+            subs_to_items = await self.link_subs(ctx, payload, curr_codes | hist_codes)
+            pairs = self._candidate_pairs(subs_to_items)
+            raw_records = await run_stage(
+                "contrasts", self.repo.fetch_contrasts(pairs), self.stage_timeout, self.metrics
+            )
+        self.metrics.pairs("interacting", len(raw_records))
+        return subs_to_items, pairs, raw_records
+
+    async def prepare(self, payload: DrugPayload) -> Tuple[Dict[str, List[DrugItem]], Set[str], Set[str]]:
+        """
+        Steps 1–5: resolve names and codes, enrich items, and map every
+        SUBS ID to the DrugItems that carry it.
+        Returns (subs_to_items, current codes, history codes).
+        """
+        ctx = ResolutionContext(self.repo)
+        curr_codes, hist_codes = await self.resolve_codes(ctx, payload)
+        subs_to_items = await self.link_subs(ctx, payload, curr_codes | hist_codes)
+        return subs_to_items, curr_codes, hist_codes
+
+    async def resolve_codes(self, ctx: ResolutionContext, payload: DrugPayload) -> Tuple[Set[str], Set[str]]:
+        """
+        Steps 1–2: resolve history names to SUBS IDs while the details of
+        the codes already in the payload are fetched.
+        Returns (current codes, history codes).
+        """
+        return (await self.resolve_codes_many(ctx, [payload]))[0]
+
+    async def resolve_codes_many(
+        self,
+        ctx: ResolutionContext,
+        payloads: List[DrugPayload]
+    ) -> List[Tuple[Set[str], Set[str]]]:
+        """Steps 1–2 for several payloads, with one name and one detail lookup."""
+        # 1) Resolve any history names to SUBS IDs; details for codes that
+        #    are already known do not depend on it and run alongside
         names_to_resolve: List[str] = []
-        for it in payload.drug_histories:
-            if not await codes_from_item(it) and it.name:
-                names_to_resolve.append(it.name)
+        known_codes: List[str] = []
+        for payload in payloads:
+            for it in payload.drug_histories:
+                if not ctx.item_codes(it) and it.name:
+                    names_to_resolve.append(it.name)
+            known_codes.extend(
+                c for it in payload.drug_currents + payload.drug_histories
+                for c in ctx.item_codes(it)
+            )
 
+        stages = {"details": ctx.fetch_details(known_codes)}
         if names_to_resolve:
-            name_map = await self.repo.resolve_names(names_to_resolve)
+            stages["names"] = ctx.resolve_names(names_to_resolve)
+        name_map = (await run_concurrently(self.stage_timeout, self.metrics, **stages)).get("names", {})
+
+        codes: List[Tuple[Set[str], Set[str]]] = []
+        for payload in payloads:
             for it in payload.drug_histories:
                 if it.name in name_map:
                     it.subs_code = name_map[it.name]
+                    ctx.forget(it)
 
-        print(names_to_resolve)
-        # 2) Collect all unique codes
-        curr_codes = {c for it in payload.drug_currents  for c in await codes_from_item(it)}
-        hist_codes = {c for it in payload.drug_histories for c in await codes_from_item(it)}
-        all_codes  = list(curr_codes | hist_codes)
-        print(f"All unique codes: {all_codes}")
-        # 3) Fetch detailed drug info (including SUBS mappings)
-        detail_map: Dict[str, dict] = await self.repo.query_details(all_codes)
-        print(detail_map)
-        # 4) ENRICH each DrugItem with full hierarchy codes & names
-        await enrich_items(self.repo.driver, payload.drug_currents, detail_map)
-        await enrich_items(self.repo.driver, payload.drug_histories, detail_map)
+            # 2) Collect all unique codes
+            curr_codes = {c for it in payload.drug_currents  for c in ctx.item_codes(it)}
+            hist_codes = {c for it in payload.drug_histories for c in ctx.item_codes(it)}
+            codes.append((curr_codes, hist_codes))
+        return codes
+
+    async def link_subs(
+        self,
+        ctx: ResolutionContext,
+        payload: DrugPayload,
+        all_codes: Set[str]
+    ) -> Dict[str, List[DrugItem]]:
+        """Steps 3–5: enrich every item and map each SUBS ID to its DrugItems."""
+        # 3) Fetch detailed drug info (including SUBS mappings); only the
+        #    codes that came out of name resolution are still missing here
+        detail_map: Dict[str, dict] = await run_stage(
+            "details", ctx.fetch_details(all_codes), self.stage_timeout, self.metrics
+        )
+        with self.metrics.timed("enrich"):
+            self.enrich(ctx, payload.drug_currents + payload.drug_histories, detail_map)
+            return self.map_subs(ctx, payload)
+
+    @staticmethod
+    def enrich(ctx: ResolutionContext, items: List[DrugItem], detail_map: Dict[str, dict]) -> None:
+        """Step 4: fill hierarchy codes & names and the external flag in place."""
+        # 4) ENRICH each DrugItem with full hierarchy codes & names; that
+        #    rewrites item codes, so step 5 must not reuse the memoized ones
+        apply_details(items, detail_map)
+        for it in items:
+            ctx.forget(it)
 
         # 4.1) Set external flag on each DrugItem (from detail_map using tpu_code)
-        for it in payload.drug_currents + payload.drug_histories:
+        for it in items:
             tpu_code = getattr(it, "tpu_code", None)
-            it.external = False
-            if tpu_code and tpu_code in detail_map:
-                it.external = detail_map[tpu_code].get("external", False)
+            it.external = ctx.is_external(tpu_code) if tpu_code else False
 
+    @staticmethod
+    def map_subs(ctx: ResolutionContext, payload: DrugPayload) -> Dict[str, List[DrugItem]]:
+        """Step 5: map each SUBS ID to the (enriched) DrugItems that carry it."""
         # 5) Build mapping from SUBS ID to DrugItem
         subs_to_items: Dict[str, List[DrugItem]] = {}
         for group in (payload.drug_currents, payload.drug_histories):
             for itm in group:
-                for code in await codes_from_item(itm):
-                    entry = detail_map.get(code)
-                    if entry and entry.get("subs_codes"):
-                        for sid in entry["subs_codes"]:
-                            subs_to_items.setdefault(sid, []).append(itm)
-                        break
-
-        # 6) Generate unique SUBS ID pairs
-        unique_sids = sorted(subs_to_items.keys())
-        pairs = [list(p) for p in combinations(unique_sids, 2)]
-
-        # 7) Fetch raw contrast records
-        raw_records = await self.repo.fetch_contrasts(pairs)
-        pair_to_data = { (r["sub1_id"], r["sub2_id"]): r for r in raw_records }
-        # print(pair_to_data)
+                for sid in InteractionService.item_subs(ctx, itm):
+                    subs_to_items.setdefault(sid, []).append(itm)
 
-        # 8) Assemble ContrastItem rows
+        return subs_to_items
+
+    @staticmethod
+    def link_records(
+        records: List[dict],
+        item_codes: List[Tuple[DrugItem, Optional[str]]]
+    ) -> Dict[str, List[DrugItem]]:
+        """
+        Map each SUBS of fetch_contrasts_for_codes records to the items whose
+        code led to it (sub1_codes/sub2_codes), in payload order.
+        """
+        subs_to_items: Dict[str, List[DrugItem]] = {}
+        for rec in records:
+            for sid, codes in ((rec["sub1_id"], rec["sub1_codes"]), (rec["sub2_id"], rec["sub2_codes"])):
+                if sid not in subs_to_items:
+                    codes = set(codes or [])
+                    subs_to_items[sid] = [it for it, code in item_codes if code in codes]
+        return subs_to_items
+
+    @staticmethod
+    def subs_source(ctx: ResolutionContext, itm: DrugItem) -> Optional[str]:
+        """The first code of an item that maps to any SUBS, if there is one."""
+        for code in ctx.item_codes(itm):
+            if ctx.subs_codes(code):
+                return code
+        return None
+
+    @staticmethod
+    def item_subs(ctx: ResolutionContext, itm: DrugItem) -> List[str]:
+        """SUBS IDs of an item: those of its first code that maps to any."""
+        code = InteractionService.subs_source(ctx, itm)
+        return ctx.subs_codes(code) if code else []
+
+    def assemble_rows(
+        self,
+        pairs: List[List[str]],
+        pair_to_data: Dict[tuple, dict],
+        subs_to_items: Dict[str, List[DrugItem]]
+    ) -> List[ContrastItem]:
+        """Cross the items behind each interacting SUBS pair into ContrastItem rows."""
+        assembler = _RowAssembler(subs_to_items, self.fast_assembly)
         rows: List[ContrastItem] = []
         for sid1, sid2 in pairs:
             rec = pair_to_data.get((sid1, sid2)) or pair_to_data.get((sid2, sid1))
-            if not rec:
-                continue
+            if rec:
+                rows.extend(assembler.rows_for(sid1, sid2, rec))
+        return rows
 
-            for in_item in subs_to_items.get(sid1, []):
-                for ct_item in subs_to_items.get(sid2, []):
-                    # 8.1) *** Filter: If any is external, skip ***
-                    if getattr(in_item, "external", False) or getattr(ct_item, "external", False):
-                        continue
-
-                    input_fields    = await fill_codes("input", in_item)
-                    contrast_fields = await fill_codes("contrast", ct_item)
-
-                    rows.append(ContrastItem(
-                        ref_id=str(uuid.uuid4()),
-                        **input_fields,
-                        **contrast_fields,
-                        contrast_type=0,
-
-                        interaction_detail_en=rec["interaction_detail_en"],
-                        interaction_detail_th=rec["interaction_detail_th"],
-                        onset=rec["onset"],
-                        severity=rec["severity"],
-                        documentation=rec["documentation"],
-                        significance=rec["significance"],
-                        management=rec["management"],
-                        discussion=rec["discussion"],
-                        reference=rec["reference"],
-
-                        input_substances=[{
-                            "code": rec["sub1_id"],
-                            "name": rec["sub1_name"]
-                        }],
-                        contrast_substances=[{
-                            "code": rec["sub2_id"],
-                            "name": rec["sub2_name"]
-                        }],
-                    ))
+    def normalize(
+        self,
+        rows: List[ContrastItem]
+    ) -> Tuple[List[ContrastRef], Dict[str, InteractionMonograph]]:
+        """
+        Split rows into ContrastRef rows and the interaction monographs they
+        share, one per SUBS pair, keyed "<input SUBS>|<contrast SUBS>".
+        """
+        monographs: Dict[str, InteractionMonograph] = {}
+        refs: List[ContrastRef] = []
+        for r in rows:
+            # a model's __dict__ holds exactly its fields
+            values = r.__dict__.copy()
+            mid = "|".join(s["code"] for s in values["input_substances"] + values["contrast_substances"])
+            if mid not in monographs:
+                text = {f: values[f] for f in _MONOGRAPH_FIELDS}
+                monographs[mid] = (
+                    trusted_model(InteractionMonograph, text)
+                    if self.fast_assembly else InteractionMonograph(**text)
+                )
+            for f in _MONOGRAPH_FIELDS:
+                del values[f]
+            values["monograph_id"] = mid
+            refs.append(trusted_model(ContrastRef, values) if self.fast_assembly else ContrastRef(**values))
+        return refs, monographs
 
-        # 9) Paginate
-        total = len(rows)
-        start = (page - 1) * row
-        end   = start + row
-        page_data = rows[start:end]
 
-        return DrugsResponse(
-            status=True,
-            code=200,
-            message="get success",
-            data=PageResponse(
-                pagination=Pagination(page=page, row=len(page_data), total=total),
-                data=page_data
-            )
-        )
+# ContrastItem fields moved from each row to its InteractionMonograph
+_MONOGRAPH_FIELDS = tuple(InteractionMonograph.model_fields)
+
+async def _aiter(items: Iterable[dict]) -> AsyncIterator[dict]:
+    for item in items:
+        yield item
+
+
+class _RowAssembler:
+    """
+    Builds ContrastItem rows pair by pair. Field blocks are built once per
+    item and once per pair; in fast mode rows skip Pydantic validation since
+    every value is already trusted.
+    """
+
+    def __init__(self, subs_to_items: Dict[str, List[DrugItem]], fast: bool):
+        self.subs_to_items = subs_to_items
+        self.fast = fast
+        # id(item) -> (field block, "|"-joined codes for the ref_id key)
+        self.input_blocks:    Dict[int, tuple] = {}
+        self.contrast_blocks: Dict[int, tuple] = {}
+        self.seen_refs: Dict[str, int] = {}
+
+    @staticmethod
+    def _block(cache: Dict[int, tuple], prefix: str, it: DrugItem) -> tuple:
+        entry = cache.get(id(it))
+        if entry is None:
+            fields = code_fields(prefix, it)
+            key = "|".join(fields[f"{prefix}_{lvl}_code"] for lvl in LEVELS)
+            entry = cache[id(it)] = (fields, key)
+        return entry
+
+    def rows_for(self, sid1: str, sid2: str, rec: dict) -> List[ContrastItem]:
+        # 8.1) *** Filter: If any is external, skip ***
+        in_items = [it for it in self.subs_to_items.get(sid1, []) if not getattr(it, "external", False)]
+        ct_items = [it for it in self.subs_to_items.get(sid2, []) if not getattr(it, "external", False)]
+        if not in_items or not ct_items:
+            return []
+
+        pair_fields = {
+            "contrast_type":         0,
+            "interaction_detail_en": rec["interaction_detail_en"],
+            "interaction_detail_th": rec["interaction_detail_th"],
+            "onset":                 rec["onset"],
+            "severity":              rec["severity"],
+            "documentation":         rec["documentation"],
+            "significance":          rec["significance"],
+            "management":            rec["management"],
+            "discussion":            rec["discussion"],
+            "reference":             rec["reference"],
+            "input_substances":      [{"code": rec["sub1_id"], "name": rec["sub1_name"]}],
+            "contrast_substances":   [{"code": rec["sub2_id"], "name": rec["sub2_name"]}],
+        }
+
+        rows: List[ContrastItem] = []
+        for in_item in in_items:
+            input_fields, in_key = self._block(self.input_blocks, "input", in_item)
+            for ct_item in ct_items:
+                contrast_fields, ct_key = self._block(self.contrast_blocks, "contrast", ct_item)
+                values = {
+                    "ref_id": stable_ref_id(self.seen_refs, sid1, sid2, in_key, ct_key),
+                    **input_fields,
+                    **contrast_fields,
+                    **pair_fields,
+                }
+                rows.append(
+                    trusted_model(ContrastItem, values) if self.fast else ContrastItem(**values)
+                )
+        return rows
@@ -0,0 +1,90 @@
+# File: domain/services/resolution_context.py
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Dict, Iterable, Set
+
+from domain.repository import DrugRepository
+from domain.models import DrugItem
+from utils.helpers import item_codes
+
+class ResolutionContext:
+    """
+    Request-scoped memo of everything resolved through the repository.
+
+    Each distinct code, name and SUBS ID goes to the graph at most once per
+    request; later stages read SUBS lists, details and external flags from
+    here instead of repeating DRUGSEARCH_CYPHER lookups. Stages may call it
+    concurrently: keys already in flight are awaited, not queried again.
+    """
+
+    def __init__(self, repo: DrugRepository):
+        self.repo = repo
+        self.details: Dict[str, dict] = {}
+        self.names: Dict[str, List[str]] = {}
+        self.subs_names: Dict[str, str] = {}
+        self._codes: Dict[int, List[str]] = {}
+        self._queried_codes: Set[str] = set()
+        self._queried_names: Set[str] = set()
+        self._queried_subs: Set[str] = set()
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+
+    def item_codes(self, it: DrugItem) -> List[str]:
+        """Flat list of the item's codes, computed once per item."""
+        key = id(it)
+        codes = self._codes.get(key)
+        if codes is None:
+            codes = self._codes[key] = item_codes(it)
+        return codes
+
+    def set_codes(self, it: DrugItem, codes: List[str]) -> None:
+        self._codes[id(it)] = list(codes)
+
+    def forget(self, it: DrugItem) -> None:
+        """Drop the memoized codes after the item's code fields changed."""
+        self._codes.pop(id(it), None)
+
+    async def _load(
+        self,
+        kind: str,
+        keys: Iterable[str],
+        done: Set[str],
+        fetch: Callable[[List[str]], Awaitable[Dict[str, Any]]],
+        into: Dict[str, Any]
+    ) -> None:
+        keys = [k for k in dict.fromkeys(keys) if k]
+        todo = [k for k in keys if k not in done and (kind, k) not in self._inflight]
+        if todo:
+            async def run() -> None:
+                try:
+                    into.update(await fetch(todo))
+                    done.update(todo)
+                finally:
+                    for k in todo:
+                        self._inflight.pop((kind, k), None)
+            fut = asyncio.ensure_future(run())
+            for k in todo:
+                self._inflight[(kind, k)] = fut
+        waits = {self._inflight[(kind, k)] for k in keys if (kind, k) in self._inflight}
+        if waits:
+            await asyncio.gather(*waits)
+
+    async def resolve_names(self, names: Iterable[str]) -> Dict[str, List[str]]:
+        await self._load("name", names, self._queried_names, self.repo.resolve_names, self.names)
+        return self.names
+
+    async def fetch_details(self, codes: Iterable[str]) -> Dict[str, dict]:
+        """Run query_details for codes not seen yet; return the shared detail map."""
+        await self._load("code", codes, self._queried_codes, self.repo.query_details, self.details)
+        return self.details
+
+    def subs_codes(self, code: str) -> List[str]:
+        info = self.details.get(code)
+        return info.get("subs_codes", []) if info else []
+
+    def is_external(self, code: str) -> bool:
+        info = self.details.get(code)
+        return bool(info.get("external", False)) if info else False
+
+    async def fetch_subs_names(self, subs_ids: Iterable[str]) -> Dict[str, str]:
+        await self._load("subs", subs_ids, self._queried_subs, self.repo.fetch_subs_name_map, self.subs_names)
+        return self.subs_names
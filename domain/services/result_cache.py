@@ -0,0 +1,134 @@
+# File: domain/services/result_cache.py
+
+import json
+import time
+import base64
+import hashlib
+from collections import OrderedDict
+from typing import Any, Callable, List, Dict, Optional, Tuple
+
+from domain.models import DrugItem, Pagination
+from utils.helpers import LEVELS
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor is malformed or belongs to another payload."""
+
+
+def item_key(it: DrugItem) -> list:
+    """Canonical (codes, name) of an item as the client sent it."""
+    return [[getattr(it, f"{lvl}_code") or "" for lvl in LEVELS + ["subs"]], it.name or ""]
+
+
+def payload_fingerprint(kind: str, **groups: List[DrugItem]) -> str:
+    """
+    Canonical hash of a payload: per group, the sorted (codes, name) of
+    every item. Must be taken before the pipeline mutates the items.
+    """
+    canon = {
+        group: sorted(item_key(it) for it in items)
+        for group, items in sorted(groups.items())
+    }
+    raw = json.dumps([kind, canon], separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def encode_cursor(key: str, offset: int) -> str:
+    raw = f"{key}:{offset}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, key: str) -> int:
+    """Return the row offset encoded in `cursor` for the payload `key`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cur_key, offset = base64.urlsafe_b64decode(padded).decode("ascii").rsplit(":", 1)
+        offset = int(offset)
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursor("malformed cursor")
+    if cur_key != key or offset < 0:
+        raise InvalidCursor("cursor does not match this payload")
+    return offset
+
+
+def paginate(
+    rows: List[Any],
+    key: str,
+    page: int,
+    row: int,
+    cursor: Optional[str] = None
+) -> Tuple[List[Any], Pagination]:
+    """Slice `rows` by cursor (if given) or page, and build the Pagination block."""
+    start = decode_cursor(cursor, key) if cursor else (page - 1) * row
+    end   = start + row
+    page_data = rows[start:end]
+    return page_data, Pagination(
+        page=start // row + 1,
+        row=len(page_data),
+        total=len(rows),
+        next=encode_cursor(key, end) if end < len(rows) else None
+    )
+
+
+class ResultCache:
+    """
+    Fully assembled result rows keyed by payload fingerprint, so later
+    pages of the same payload skip resolution and row assembly.
+    Bounded by TTL and by the total number of cached rows (LRU).
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 300.0,
+        max_rows: int = 200_000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        self._clock = clock
+        self._data: "OrderedDict[str, Tuple[float, List[Any]]]" = OrderedDict()
+        self._rows = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[List[Any]]:
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= self._clock():
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: str, rows: List[Any]) -> None:
+        if len(rows) > self.max_rows:
+            return
+        if key in self._data:
+            self._drop(key)
+        self._data[key] = (self._clock() + self.ttl_seconds, rows)
+        self._rows += len(rows)
+        while self._rows > self.max_rows:
+            self._drop(next(iter(self._data)))
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        _, rows = self._data.pop(key)
+        self._rows -= len(rows)
+
+    def clear(self) -> int:
+        size = len(self._data)
+        self._data.clear()
+        self._rows = 0
+        return size
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries":   len(self._data),
+            "rows":      self._rows,
+            "max_rows":  self.max_rows,
+            "hits":      self.hits,
+            "misses":    self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,120 @@
+# File: domain/services/screening_service.py
+
+import time
+import asyncio
+from typing import List, Tuple
+
+from domain.services.allergy_service import AllergyService
+from domain.services.interaction_service import InteractionService
+from domain.services.resolution_context import ResolutionContext
+from domain.services.stages import run_concurrently, run_stage
+from domain.models import (
+    DrugPayload,
+    ScreeningPayload,
+    ScreeningResult,
+    ScreeningResponse,
+    ContrastItem,
+    AllergyItem,
+)
+from utils.helpers import apply_details
+
+class ScreeningService:
+    """
+    Runs the interaction and the allergy check on one payload: names,
+    details and enrichment happen once and both checks read the same
+    enriched items.
+    """
+
+    def __init__(self, interactions: InteractionService, allergies: AllergyService):
+        self.interactions = interactions
+        self.allergies = allergies
+        self.stage_timeout = interactions.stage_timeout
+        self.metrics = interactions.metrics
+
+    async def screen(self, payload: ScreeningPayload) -> ScreeningResponse:
+        t0 = time.perf_counter()
+        contrasts, allergies = await self.build_results(payload)
+
+        self.metrics.rows("screening", len(contrasts) + len(allergies))
+        self.metrics.pipeline("screening", time.perf_counter() - t0)
+        return ScreeningResponse(
+            status=True,
+            code=200,
+            message="get success",
+            data=ScreeningResult(contrasts=contrasts, allergies=allergies)
+        )
+
+    async def build_results(
+        self,
+        payload: ScreeningPayload
+    ) -> Tuple[List[ContrastItem], List[AllergyItem]]:
+        """
+        Every contrast row and every allergy row of the payload, unpaginated;
+        the same rows /drugs and /allergy return for it.
+        """
+        ctx = ResolutionContext(self.interactions.repo)
+        currents = payload.drug_currents
+        histories = payload.drug_histories or []
+        allergies = payload.drug_allergies or []
+        drugs = DrugPayload.model_construct(drug_currents=currents, drug_histories=histories)
+
+        # 1) Resolve history/allergy names without codes to SUBS IDs while
+        #    details for the codes already in the payload are fetched
+        known_codes = [c for it in currents + histories + allergies for c in ctx.item_codes(it)]
+        name_items = [it for it in histories + allergies if not ctx.item_codes(it) and it.name]
+        stages = {"details": ctx.fetch_details(known_codes)}
+        if name_items:
+            stages["names"] = ctx.resolve_names([it.name for it in name_items])
+        name_map = (await run_concurrently(self.stage_timeout, self.metrics, **stages)).get("names", {})
+
+        # 2) Apply the names the way each check does: histories through the
+        #    interaction steps (answered from the context), allergies as
+        #    AllergyService does; then collect all unique codes
+        curr_codes, hist_codes = await self.interactions.resolve_codes(ctx, drugs)
+        for it in allergies:
+            subs = name_map.get(it.name) if not ctx.item_codes(it) else None
+            if subs:
+                subs = subs if isinstance(subs, list) else [subs]
+                it.subs_code = subs[0]
+                ctx.set_codes(it, subs)
+        all_codes = list(dict.fromkeys(
+            c for it in currents + histories + allergies for c in ctx.item_codes(it)
+        ))
+
+        # 3) Fetch details for the codes that came out of name resolution
+        detail_map = await run_stage(
+            "details", ctx.fetch_details(all_codes), self.stage_timeout, self.metrics
+        )
+        subs_curr_set = {sid for code in curr_codes for sid in ctx.subs_codes(code)}
+        subs_hist_set = {sid for code in hist_codes for sid in ctx.subs_codes(code)}
+
+        # 4) SUBS names for the allergy rows load while contrasts are found
+        subs_names = None
+        if allergies:
+            subs_names = asyncio.ensure_future(run_stage(
+                "subs_names",
+                ctx.fetch_subs_names(subs_curr_set | subs_hist_set),
+                self.stage_timeout,
+                self.metrics
+            ))
+        try:
+            # 5–7) Enrich and link the drugs, then find their contrasts with
+            #      the configured strategy; details come from the context
+            subs_to_items, pairs, raw_records = await self.interactions.link_and_contrast(
+                ctx, drugs, curr_codes, hist_codes
+            )
+            with self.metrics.timed("enrich"):
+                apply_details(allergies, detail_map)
+            subs_name_map = await subs_names if subs_names is not None else {}
+        finally:
+            if subs_names is not None:
+                subs_names.cancel()
+
+        # 8) Assemble both result sets
+        with self.metrics.timed("assemble"):
+            pair_to_data = {(r["sub1_id"], r["sub2_id"]): r for r in raw_records}
+            contrast_rows = self.interactions.assemble_rows(pairs, pair_to_data, subs_to_items)
+            allergy_rows = self.allergies.allergy_rows(
+                ctx, allergies, subs_curr_set, subs_hist_set, subs_name_map
+            )
+        return contrast_rows, allergy_rows
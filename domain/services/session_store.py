@@ -0,0 +1,124 @@
+# File: domain/services/session_store.py
+
+import time
+import uuid
+import asyncio
+from collections import OrderedDict
+from typing import Any, Callable, List, Dict, Iterable, Set
+
+from domain.models import DrugItem
+from domain.services.result_cache import item_key
+
+class SessionNotFound(LookupError):
+    """Raised when a screening session is unknown or has expired."""
+
+    def __init__(self, session_id: str):
+        super().__init__(f"session '{session_id}' not found or expired")
+        self.session_id = session_id
+
+
+class SessionEntry:
+    """One drug of a session: its input key, enriched item and SUBS IDs."""
+
+    __slots__ = ("group", "key", "item", "subs")
+
+    def __init__(self, group: str, key: list, item: DrugItem, subs: List[str]):
+        self.group = group
+        self.key = key
+        self.item = item
+        self.subs = subs
+
+
+class ScreeningSession:
+    """
+    Server-side state of one patient's prescribing session: the enriched
+    items with their SUBS IDs, every interacting SUBS pair among them and
+    the assembled rows. Edits go through `lock`, one at a time.
+    """
+
+    __slots__ = ("session_id", "entries", "pair_to_data", "rows", "lock")
+
+    def __init__(self):
+        self.session_id = uuid.uuid4().hex
+        self.entries: List[SessionEntry] = []
+        self.pair_to_data: Dict[tuple, dict] = {}
+        self.rows: List[Any] = []
+        self.lock = asyncio.Lock()
+
+    def subs(self) -> Set[str]:
+        return {sid for e in self.entries for sid in e.subs}
+
+    def subs_to_items(self) -> Dict[str, List[DrugItem]]:
+        """SUBS ID -> items, currents before histories as in map_subs."""
+        subs_to_items: Dict[str, List[DrugItem]] = {}
+        for group in ("current", "history"):
+            for e in self.entries:
+                if e.group == group:
+                    for sid in e.subs:
+                        subs_to_items.setdefault(sid, []).append(e.item)
+        return subs_to_items
+
+    def remove(self, group: str, items: Iterable[DrugItem]) -> int:
+        """Drop the first entry of `group` matching each item; returns how many went."""
+        removed = 0
+        for it in items:
+            key = item_key(it)
+            for i, e in enumerate(self.entries):
+                if e.group == group and e.key == key:
+                    del self.entries[i]
+                    removed += 1
+                    break
+        return removed
+
+
+class SessionStore:
+    """
+    Screening sessions by id. Each access extends a session's TTL; the
+    least recently used session is evicted beyond max_sessions.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 1800.0,
+        max_sessions: int = 10_000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._clock = clock
+        self._data: "OrderedDict[str, List[Any]]" = OrderedDict()
+        self.evictions = 0
+
+    def get(self, session_id: str) -> ScreeningSession:
+        entry = self._data.get(session_id)
+        if entry is None or entry[0] <= self._clock():
+            if entry is not None:
+                del self._data[session_id]
+            raise SessionNotFound(session_id)
+        entry[0] = self._clock() + self.ttl_seconds
+        self._data.move_to_end(session_id)
+        return entry[1]
+
+    def put(self, session: ScreeningSession) -> None:
+        self._data[session.session_id] = [self._clock() + self.ttl_seconds, session]
+        self._data.move_to_end(session.session_id)
+        while len(self._data) > self.max_sessions:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def drop(self, session_id: str) -> None:
+        if self._data.pop(session_id, None) is None:
+            raise SessionNotFound(session_id)
+
+    def clear(self) -> int:
+        size = len(self._data)
+        self._data.clear()
+        return size
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries":      len(self._data),
+            "max_sessions": self.max_sessions,
+            "ttl_seconds":  self.ttl_seconds,
+            "evictions":    self.evictions,
+        }
@@ -0,0 +1,58 @@
+# File: domain/services/stages.py
+
+import time
+import asyncio
+from typing import Any, Awaitable, Dict, Optional
+
+from domain.metrics import PipelineMetrics
+
+class StageTimeoutError(Exception):
+    """Raised when one pipeline stage exceeds its time budget."""
+
+    def __init__(self, stage: str, timeout: float):
+        super().__init__(f"stage '{stage}' timed out after {timeout:g}s")
+        self.stage = stage
+        self.timeout = timeout
+
+
+async def run_stage(
+    name: str,
+    aw: Awaitable[Any],
+    timeout: Optional[float] = None,
+    metrics: Optional[PipelineMetrics] = None
+) -> Any:
+    """Await one timed stage, converting a timeout into StageTimeoutError."""
+    started = time.perf_counter()
+    try:
+        if timeout is None:
+            return await aw
+        return await asyncio.wait_for(aw, timeout)
+    except asyncio.TimeoutError:
+        raise StageTimeoutError(name, timeout) from None
+    finally:
+        if metrics is not None:
+            metrics.stage(name, time.perf_counter() - started)
+
+
+async def run_concurrently(
+    timeout: Optional[float] = None,
+    metrics: Optional[PipelineMetrics] = None,
+    **stages: Awaitable[Any]
+) -> Dict[str, Any]:
+    """
+    Run independent stages concurrently (each repository call opens its own
+    session) and return their results by name. Each stage gets its own
+    timeout; the first failure cancels the rest.
+    """
+    names = list(stages)
+    tasks = [
+        asyncio.ensure_future(run_stage(name, stages[name], timeout, metrics))
+        for name in names
+    ]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    return dict(zip(names, results))
@@ -0,0 +1,152 @@
+# File: infrastructure/batching.py
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Dict, Iterable, Optional, Set
+
+from neo4j import AsyncGraphDatabase
+from domain.repository import DrugRepository
+
+BatchFn = Callable[[List[str]], Awaitable[Dict[str, Any]]]
+
+class BatchLoader:
+    """
+    DataLoader-style coalescing of key lookups.
+
+    Keys requested within `window_ms` of each other are merged into one
+    `batch_fn` call (one UNWIND query), and keys already queued or in
+    flight are shared with the request that asked first.
+    """
+
+    def __init__(self, batch_fn: BatchFn, window_ms: float = 2.0, max_batch: int = 1000):
+        self.batch_fn = batch_fn
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._timer: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.keys_requested = 0
+        self.keys_shared = 0
+
+    async def load_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Resolve `keys`; keys the batch function did not return are omitted."""
+        loop = asyncio.get_running_loop()
+        futures: Dict[str, asyncio.Future] = {}
+        for key in dict.fromkeys(keys):
+            self.keys_requested += 1
+            fut = self._pending.get(key) or self._inflight.get(key)
+            if fut is None:
+                fut = self._pending[key] = loop.create_future()
+            else:
+                self.keys_shared += 1
+            futures[key] = fut
+
+        if len(self._pending) >= self.max_batch:
+            self._spawn(self._dispatch())
+        elif self._pending and self._timer is None:
+            self._timer = self._spawn(self._dispatch_later())
+
+        # shield: one caller being cancelled must not cancel a shared lookup
+        results = await asyncio.gather(*(asyncio.shield(f) for f in futures.values()))
+        return {k: v for k, v in zip(futures, results) if v is not None}
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _dispatch_later(self) -> None:
+        await asyncio.sleep(self.window)
+        self._timer = None
+        await self._dispatch()
+
+    async def _dispatch(self) -> None:
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        self._inflight.update(batch)
+        self.batches += 1
+        try:
+            results = await self.batch_fn(list(batch))
+        except Exception as exc:
+            for fut in batch.values():
+                if not fut.done():
+                    fut.set_exception(exc)
+        else:
+            for key, fut in batch.items():
+                if not fut.done():
+                    fut.set_result(results.get(key))
+        finally:
+            for key in batch:
+                self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches":        self.batches,
+            "keys_requested": self.keys_requested,
+            "keys_shared":    self.keys_shared,
+            "keys_per_batch": (self.keys_requested - self.keys_shared) / self.batches
+                              if self.batches else 0.0,
+        }
+
+
+class RepositoryBatcher:
+    """Process-wide BatchLoaders for one underlying repository/driver."""
+
+    def __init__(self, repo: DrugRepository, window_ms: float = 2.0, max_batch: int = 1000):
+        self.details    = BatchLoader(repo.query_details,       window_ms, max_batch)
+        self.subs       = BatchLoader(repo.resolve_subs,        window_ms, max_batch)
+        self.subs_names = BatchLoader(repo.fetch_subs_name_map, window_ms, max_batch)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "query_details":       self.details.stats(),
+            "resolve_subs":        self.subs.stats(),
+            "fetch_subs_name_map": self.subs_names.stats(),
+        }
+
+
+class BatchingDrugRepository(DrugRepository):
+    """
+    DrugRepository that routes code lookups through a shared
+    RepositoryBatcher, so concurrent requests share UNWIND queries.
+    """
+
+    def __init__(self, inner: DrugRepository, batcher: RepositoryBatcher):
+        self.inner = inner
+        self.batcher = batcher
+
+    @property
+    def driver(self) -> AsyncGraphDatabase:
+        return self.inner.driver
+
+    async def resolve_names(self, names: List[str]) -> Dict[str, List[str]]:
+        return await self.inner.resolve_names(names)
+
+    async def query_details(self, codes: List[str]) -> Dict[str, dict]:
+        found = await self.batcher.details.load_many(codes)
+        return {code: dict(info) for code, info in found.items()}
+
+    async def resolve_subs(self, codes: List[str]) -> Dict[str, List[str]]:
+        mapping = await self.batcher.subs.load_many(codes)
+        for code in codes:
+            mapping.setdefault(code, [])
+        return mapping
+
+    async def fetch_contrasts(self, pairs: List[List[str]]) -> List[dict]:
+        return await self.inner.fetch_contrasts(pairs)
+
+    def stream_contrasts(self, pairs: List[List[str]]) -> AsyncIterator[dict]:
+        return self.inner.stream_contrasts(pairs)
+
+    async def fetch_contrasts_for_codes(
+        self,
+        current_codes: List[str],
+        history_codes: List[str]
+    ) -> List[dict]:
+        return await self.inner.fetch_contrasts_for_codes(current_codes, history_codes)
+
+    async def fetch_subs_name_map(self, subs_ids: List[str]) -> Dict[str, str]:
+        return await self.batcher.subs_names.load_many(subs_ids)
@@ -0,0 +1,154 @@
+# File: infrastructure/cached_repository.py
+
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Callable, List, Dict, Hashable, Tuple
+
+from neo4j import AsyncGraphDatabase
+from domain.repository import DrugRepository
+
+# Marker stored for codes the graph does not know about
+_NEGATIVE = object()
+_MISS = object()
+
+class LruTtlCache:
+    """
+    Bounded LRU cache with per-entry TTL and negative entries.
+    Shared across requests; all access happens on the event loop thread.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 50_000,
+        ttl_seconds: float = 3600.0,
+        negative_ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, None for a negative entry, or _MISS."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return _MISS
+        expires, value = entry
+        if expires <= self._clock():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return _MISS
+        self._data.move_to_end(key)
+        if value is _NEGATIVE:
+            self.negative_hits += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store `value`; None is stored as a negative entry with the shorter TTL."""
+        if value is None:
+            ttl, value = self.negative_ttl_seconds, _NEGATIVE
+        else:
+            ttl = self.ttl_seconds
+        self._data[key] = (self._clock() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> int:
+        size = len(self._data)
+        self._data.clear()
+        return size
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "size":          len(self._data),
+            "max_entries":   self.max_entries,
+            "hits":          self.hits,
+            "negative_hits": self.negative_hits,
+            "misses":        self.misses,
+            "evictions":     self.evictions,
+            "expirations":   self.expirations,
+            "hit_rate":      (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+        }
+
+
+class CachedDrugRepository(DrugRepository):
+    """
+    DrugRepository that keeps per-code results in a shared LruTtlCache and
+    only sends cache misses to the wrapped repository.
+    """
+
+    def __init__(self, inner: DrugRepository, cache: LruTtlCache):
+        self.inner = inner
+        self.cache = cache
+
+    @property
+    def driver(self) -> AsyncGraphDatabase:
+        return self.inner.driver
+
+    async def _cached(
+        self,
+        kind: str,
+        keys: List[str],
+        fetch: Callable[[List[str]], Any]
+    ) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        misses: List[str] = []
+        for key in dict.fromkeys(keys):
+            value = self.cache.get((kind, key))
+            if value is _MISS:
+                misses.append(key)
+            elif value is not None:
+                out[key] = value
+        if misses:
+            fetched = await fetch(misses)
+            for key in misses:
+                value = fetched.get(key)
+                if not value and not isinstance(value, str):
+                    value = None
+                self.cache.put((kind, key), value)
+                if value is not None:
+                    out[key] = value
+        return out
+
+    async def resolve_names(self, names: List[str]) -> Dict[str, List[str]]:
+        return await self._cached("name", names, self.inner.resolve_names)
+
+    async def query_details(self, codes: List[str]) -> Dict[str, dict]:
+        found = await self._cached("details", codes, self.inner.query_details)
+        return {code: dict(info) for code, info in found.items()}
+
+    async def resolve_subs(self, codes: List[str]) -> Dict[str, List[str]]:
+        mapping = await self._cached("subs", codes, self.inner.resolve_subs)
+        for code in codes:
+            mapping.setdefault(code, [])
+        return mapping
+
+    async def fetch_contrasts(self, pairs: List[List[str]]) -> List[dict]:
+        return await self.inner.fetch_contrasts(pairs)
+
+    def stream_contrasts(self, pairs: List[List[str]]) -> AsyncIterator[dict]:
+        return self.inner.stream_contrasts(pairs)
+
+    async def fetch_contrasts_for_codes(
+        self,
+        current_codes: List[str],
+        history_codes: List[str]
+    ) -> List[dict]:
+        return await self.inner.fetch_contrasts_for_codes(current_codes, history_codes)
+
+    async def fetch_subs_name_map(self, subs_ids: List[str]) -> Dict[str, str]:
+        return await self._cached("subs_name", subs_ids, self.inner.fetch_subs_name_map)
@@ -0,0 +1,79 @@
+# File: infrastructure/catalogue_watcher.py
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+from neo4j import AsyncGraphDatabase, READ_ACCESS
+from utils.cypher import CATALOGUE_VERSION_CYPHER
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[AsyncGraphDatabase], Awaitable[None]]
+
+class CatalogueWatcher:
+    """
+    Polls the catalogue version marker and reloads every subscribed
+    in-memory snapshot (TMT index, contrast adjacency, ...) when it changes.
+    """
+
+    def __init__(self, poll_seconds: float = 300.0):
+        self.poll_seconds = poll_seconds
+        self.version: Optional[str] = None
+        self._loaders: List[Loader] = []
+        self._driver: Optional[AsyncGraphDatabase] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, loader: Loader) -> None:
+        """Register a coroutine `loader(driver)` to run on every catalogue change."""
+        self._loaders.append(loader)
+
+    async def start(self, driver: AsyncGraphDatabase) -> None:
+        """Load all snapshots once, then keep polling in the background."""
+        self._driver = driver
+        if not self._loaders:
+            return
+        await self.check()
+        self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def fetch_version(self) -> str:
+        async with self._driver.session(default_access_mode=READ_ACCESS) as session:
+            result = await session.run(CATALOGUE_VERSION_CYPHER)
+            record = await result.single()
+            return record["version"] if record else ""
+
+    async def check(self) -> bool:
+        """Reload subscribers if the version marker moved. Returns True on reload."""
+        try:
+            version = await self.fetch_version()
+        except Exception:
+            logger.exception("catalogue version check failed")
+            return False
+        if version == self.version:
+            return False
+
+        for loader in self._loaders:
+            try:
+                await loader(self._driver)
+            except Exception:
+                # keep serving the previous snapshot (or pass-through) and retry next poll
+                logger.exception("catalogue reload failed for %r", loader)
+                return False
+
+        logger.info("catalogue reloaded: %s -> %s", self.version, version)
+        self.version = version
+        return True
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            await self.check()
@@ -0,0 +1,115 @@
+# File: infrastructure/contrast_engine.py
+
+import sys
+from typing import List, Dict, Iterable, Optional, Tuple
+
+from neo4j import AsyncGraphDatabase, READ_ACCESS
+
+from domain.contrast_engine import ContrastEngine
+from utils.cypher import ALL_CONTRASTS_CYPHER
+
+# Interaction attributes, in the order they are stored per edge
+ATTR_FIELDS = (
+    "severity",
+    "documentation",
+    "interaction_detail_en",
+    "interaction_detail_th",
+    "onset",
+    "significance",
+    "management",
+    "discussion",
+    "reference",
+)
+
+class _Graph:
+    """Immutable adjacency snapshot; swapped atomically on reload."""
+
+    __slots__ = ("adjacency", "attrs", "names")
+
+    def __init__(
+        self,
+        adjacency: Dict[str, Dict[str, int]],
+        attrs: List[Tuple[str, ...]],
+        names: Dict[str, str]
+    ):
+        self.adjacency = adjacency
+        self.attrs = attrs
+        self.names = names
+
+
+class AdjacencyContrastEngine(ContrastEngine):
+    """
+    In-memory CONTRAST_WITH graph keyed by SUBS ID.
+
+    Each SUBS maps to {neighbour SUBS: attribute id}; identical attribute
+    blocks (monograph text) are stored once and shared by every edge.
+    """
+
+    def __init__(self):
+        self._graph: Optional[_Graph] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._graph is not None
+
+    @property
+    def edge_count(self) -> int:
+        g = self._graph
+        return sum(len(n) for n in g.adjacency.values()) // 2 if g else 0
+
+    async def load(self, driver: AsyncGraphDatabase) -> None:
+        """Rebuild the adjacency from Neo4j and swap it in."""
+        adjacency: Dict[str, Dict[str, int]] = {}
+        attrs: List[Tuple[str, ...]] = []
+        attr_ids: Dict[Tuple[str, ...], int] = {}
+        names: Dict[str, str] = {}
+
+        async with driver.session(default_access_mode=READ_ACCESS) as session:
+            result = await session.run(ALL_CONTRASTS_CYPHER)
+            async for record in result:
+                sid1 = sys.intern(record["sub1_id"])
+                sid2 = sys.intern(record["sub2_id"])
+                names[sid1] = record["sub1_name"] or ""
+                names[sid2] = record["sub2_name"] or ""
+
+                block = tuple(record[f] for f in ATTR_FIELDS)
+                aid = attr_ids.get(block)
+                if aid is None:
+                    aid = attr_ids[block] = len(attrs)
+                    attrs.append(block)
+
+                adjacency.setdefault(sid1, {})[sid2] = aid
+                adjacency.setdefault(sid2, {})[sid1] = aid
+
+        self._graph = _Graph(adjacency, attrs, names)
+
+    def find_contrasts(self, subs_ids: Iterable[str]) -> List[dict]:
+        """
+        Return the CONTRAST_WITH records among `subs_ids`, shaped like
+        CONTRAST_CYPHER rows with sub1_id < sub2_id, sorted by pair.
+        Cost is O(n + interactions) rather than O(n²).
+        """
+        g = self._graph
+        sids = set(subs_ids)
+        records: List[dict] = []
+        for sid in sorted(sids):
+            neighbours = g.adjacency.get(sid)
+            if not neighbours:
+                continue
+            # intersect from the smaller side
+            if len(neighbours) < len(sids):
+                hits = [o for o in neighbours if o in sids]
+            else:
+                hits = [o for o in sids if o in neighbours]
+            for other in sorted(hits):
+                if other <= sid:
+                    continue
+                rec = {
+                    "sub1_id":   sid,
+                    "sub1_name": g.names.get(sid, ""),
+                    "sub2_id":   other,
+                    "sub2_name": g.names.get(other, ""),
+                }
+                rec.update(zip(ATTR_FIELDS, g.attrs[neighbours[other]]))
+                records.append(rec)
+        return records
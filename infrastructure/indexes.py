@@ -0,0 +1,154 @@
+# File: infrastructure/indexes.py
+#
+# Indexes and constraints the queries in utils/cypher.py rely on, and a
+# deploy-time command to create, verify and plan-check them.
+#
+# Usage (connection from api.env, like the app):
+#   python -m infrastructure.indexes ensure   # create what is missing, wait until ONLINE
+#   python -m infrastructure.indexes check    # exit 1 if anything is missing or not ONLINE
+#   python -m infrastructure.indexes plans    # EXPLAIN every query in utils.cypher;
+#                                             # exit 1 if a plan contains an AllNodesScan
+
+import os
+import sys
+import asyncio
+import argparse
+from typing import Any, List, Dict, Optional
+
+from dotenv import load_dotenv
+from neo4j import basic_auth, AsyncGraphDatabase
+
+from infrastructure.query_profile import flatten_plan
+from utils import cypher
+
+# name -> statement; a constraint's backing index carries the same name
+INDEXES: Dict[str, str] = {
+    # CONTRAST_CYPHER / SUBS_NAME_CYPHER seek SUBS by ID
+    "subs_code_unique":
+        "CREATE CONSTRAINT subs_code_unique IF NOT EXISTS "
+        "FOR (n:SUBS) REQUIRE n.`TMTID(SUBS)` IS UNIQUE",
+    # Per-label anchors of RESOLVE_SUBS_FALLBACK / SEARCHSUBS / CONTRAST_BY_CODES
+    "tpu_code":
+        "CREATE RANGE INDEX tpu_code IF NOT EXISTS FOR (n:TPU) ON (n.`TMTID(TPU)`)",
+    "tp_code":
+        "CREATE RANGE INDEX tp_code IF NOT EXISTS FOR (n:TP) ON (n.`TMTID(TP)`)",
+    "gpu_code":
+        "CREATE RANGE INDEX gpu_code IF NOT EXISTS FOR (n:GPU) ON (n.`TMTID(GPU)`)",
+    "gp_code":
+        "CREATE RANGE INDEX gp_code IF NOT EXISTS FOR (n:GP) ON (n.`TMTID(GP)`)",
+    "vtm_code":
+        "CREATE RANGE INDEX vtm_code IF NOT EXISTS FOR (n:VTM) ON (n.`TMTID(VTM)`)",
+    # DRUGSEARCH_CYPHER / STRING_SEARCH_CYPHER
+    "DrugSearch":
+        "CREATE FULLTEXT INDEX DrugSearch IF NOT EXISTS FOR (d:DRUG) ON EACH ["
+        "d.`TPUNAME`, d.`TPNAME`, d.`GPUNAME`, d.`GPNAME`, d.`VTMNAME`, d.`SUBSNAME_LIST`, "
+        "d.`TMTID(TPU)`, d.`TMTID(TP)`, d.`TMTID(GPU)`, d.`TMTID(GP)`, d.`TMTID(VTM)`, "
+        "d.`TMTID(SUBS)_LIST`]",
+}
+
+# Representative parameters, so EXPLAIN plans the queries as they are run
+PLAN_PARAMS: Dict[str, Dict[str, Any]] = {
+    "STRING_SEARCH_CYPHER":      {"q": "paracetamol", "lucene": "paracetamol*"},
+    "DRUGSEARCH_CYPHER":         {"qs": ["paracetamol"]},
+    "RESOLVE_SUBS_FALLBACK":     {"codes": ["0"]},
+    "SEARCHSUBS_CYPHER":         {"codes": ["0"]},
+    "CONTRAST_CYPHER":           {"pairs": [["0", "1"]]},
+    "SUBS_NAME_CYPHER":          {"subs_ids": ["0"]},
+    "CONTRAST_BY_CODES_CYPHER":  {"current": ["0"], "history": ["1"]},
+    "STRING_LISTS_CYPHER":       {"batch": 1000},
+    "SET_NATIVE_LISTS_CYPHER":   {"rows": [{"id": "0", "subs_codes": ["0"], "subs_names": ["x"]}]},
+    "SUBS_CLOSURE_CYPHER":       {"batch": 1000},
+}
+
+FORBIDDEN_OPERATORS = {"AllNodesScan"}
+
+def _connect() -> AsyncGraphDatabase:
+    load_dotenv("api.env")
+    return AsyncGraphDatabase.driver(
+        os.getenv("NEO4J_URI_STAGING"),
+        auth=basic_auth(os.getenv("NEO4J_USERNAME_STAGING"), os.getenv("NEO4J_PASSWORD_STAGING"))
+    )
+
+async def index_states(driver: AsyncGraphDatabase) -> Dict[str, str]:
+    """Name -> state (ONLINE, POPULATING, FAILED) of every index in the database."""
+    async with driver.session() as session:
+        result = await session.run("SHOW INDEXES YIELD name, state")
+        return {record["name"]: record["state"] async for record in result}
+
+async def missing_indexes(driver: AsyncGraphDatabase) -> Dict[str, Optional[str]]:
+    """Required indexes that are absent (None) or not ONLINE (their state)."""
+    states = await index_states(driver)
+    return {
+        name: states.get(name)
+        for name in INDEXES
+        if states.get(name) != "ONLINE"
+    }
+
+async def ensure_indexes(driver: AsyncGraphDatabase, wait_seconds: int = 300) -> List[str]:
+    """
+    Create the required indexes that do not exist yet and wait for them to
+    come ONLINE. Returns the failures (e.g. duplicate IDs blocking a
+    uniqueness constraint); other indexes are still created.
+    """
+    failures: List[str] = []
+    async with driver.session() as session:
+        for name, statement in INDEXES.items():
+            try:
+                await (await session.run(statement)).consume()
+            except Exception as exc:
+                failures.append(f"{name}: {exc}")
+        await (await session.run("CALL db.awaitIndexes($seconds)", {"seconds": wait_seconds})).consume()
+    return failures
+
+async def forbidden_scans(driver: AsyncGraphDatabase) -> Dict[str, List[str]]:
+    """Query constant -> forbidden operators in its EXPLAIN plan."""
+    found: Dict[str, List[str]] = {}
+    async with driver.session() as session:
+        for query, name in cypher.QUERY_NAMES.items():
+            result = await session.run("EXPLAIN " + query, PLAN_PARAMS.get(name, {}))
+            summary = await result.consume()
+            # operator names carry the runtime, e.g. "AllNodesScan@neo4j"
+            operators = {op["operator"].split("@")[0] for op in flatten_plan(summary.plan)}
+            bad = sorted(operators & FORBIDDEN_OPERATORS)
+            if bad:
+                found[name] = bad
+    return found
+
+async def run(args) -> int:
+    driver = _connect()
+    try:
+        if args.command == "ensure":
+            failures = await ensure_indexes(driver, args.wait_seconds)
+            for failure in failures:
+                print(f"FAIL {failure}")
+            missing = await missing_indexes(driver)
+        elif args.command == "check":
+            failures = []
+            missing = await missing_indexes(driver)
+        else:
+            scans = await forbidden_scans(driver)
+            for name, operators in scans.items():
+                print(f"FAIL {name}: {', '.join(operators)}")
+            print(f"planned {len(cypher.QUERY_NAMES)} queries, {len(scans)} with a forbidden scan")
+            return 1 if scans else 0
+    finally:
+        await driver.close()
+
+    for name, state in missing.items():
+        print(f"{'MISSING' if state is None else state:<10} {name}")
+    print(f"{len(INDEXES) - len(missing)}/{len(INDEXES)} indexes ONLINE")
+    return 1 if failures or missing else 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Create and verify the drug graph's indexes")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ensure = sub.add_parser("ensure", help="create missing indexes and constraints")
+    ensure.add_argument("--wait-seconds", type=int, default=300, help="how long to wait for ONLINE")
+    sub.add_parser("check", help="verify every index exists and is ONLINE")
+    sub.add_parser("plans", help="EXPLAIN every query and reject AllNodesScan plans")
+
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+# File: infrastructure/instrumentation.py
+
+import time
+import asyncio
+from typing import Any, AsyncIterator, List, Dict, Optional
+
+from neo4j import AsyncGraphDatabase
+from domain.repository import DrugRepository
+from infrastructure.metrics import (
+    POOL_IN_USE,
+    POOL_TIMEOUTS,
+    POOL_WAIT_SECONDS,
+    POOL_WAITING,
+    QUERY_ERRORS,
+    QUERY_ROWS,
+    QUERY_SECONDS,
+    REPOSITORY_ERRORS,
+    REPOSITORY_SECONDS,
+    add_timing,
+)
+from infrastructure.query_profile import QueryProfile, RequestProfile, current_profile
+from utils.cypher import query_name
+
+class PoolAcquisitionTimeout(Exception):
+    """Raised when no pooled connection frees up within the acquisition timeout."""
+
+    def __init__(self, timeout: float):
+        super().__init__(f"no Neo4j connection available within {timeout:g}s")
+        self.timeout = timeout
+
+
+class _InstrumentedResult:
+    """
+    Result proxy that observes the query once its rows are consumed. For a
+    query run under PROFILE it also consumes the summary to read the plan.
+    """
+
+    def __init__(self, inner, name: str, started: float, profile: Optional[RequestProfile] = None):
+        self._inner = inner
+        self._name = name
+        self._started = started
+        self._profile = profile
+        self._rows = 0
+        self._done = False
+
+    async def _finish(self, summary: Any = None) -> None:
+        if self._done:
+            return
+        self._done = True
+        if self._profile is not None and summary is None:
+            summary = await self._inner.consume()
+        elapsed = time.perf_counter() - self._started
+        QUERY_SECONDS.observe(elapsed, query=self._name)
+        QUERY_ROWS.inc(self._rows, query=self._name)
+        add_timing("db", elapsed)
+        if self._profile is not None:
+            self._profile.add(QueryProfile(self._name, elapsed * 1000, summary))
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        try:
+            async for record in self._inner:
+                self._rows += 1
+                yield record
+        finally:
+            await self._finish()
+
+    async def single(self, *args, **kwargs):
+        try:
+            record = await self._inner.single(*args, **kwargs)
+            self._rows += record is not None
+            return record
+        finally:
+            await self._finish()
+
+    async def data(self, *args, **kwargs):
+        try:
+            rows = await self._inner.data(*args, **kwargs)
+            self._rows += len(rows)
+            return rows
+        finally:
+            await self._finish()
+
+    async def consume(self):
+        summary = await self._inner.consume()
+        await self._finish(summary)
+        return summary
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+
+class _InstrumentedRunner:
+    """Times `run` on a session or transaction; prefixes PROFILE when profiling."""
+
+    def __init__(self, inner):
+        self._inner = inner
+        self._results: List[_InstrumentedResult] = []
+
+    async def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs):
+        name = query_name(query)
+        profile = current_profile()
+        if profile is not None:
+            query = "PROFILE " + query.lstrip()
+        started = time.perf_counter()
+        try:
+            result = await self._inner.run(query, parameters, **kwargs)
+        except Exception:
+            QUERY_ERRORS.inc(query=name)
+            raise
+        wrapped = _InstrumentedResult(result, name, started, profile)
+        self._results.append(wrapped)
+        return wrapped
+
+    async def _finish_results(self) -> None:
+        # results never consumed still count, up to the end of the session
+        for result in self._results:
+            await result._finish()
+        self._results.clear()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+
+class _InstrumentedSession(_InstrumentedRunner):
+    """
+    Session proxy. Holding a slot of the driver's gate stands for holding a
+    pooled connection, so the time spent waiting for it is the pool wait.
+    """
+
+    def __init__(self, driver: "InstrumentedDriver", inner):
+        super().__init__(inner)
+        self._driver = driver
+        self._holding = False
+
+    async def __aenter__(self):
+        waited = await self._driver.acquire()
+        self._holding = True
+        add_timing("pool-wait", waited)
+        try:
+            await self._inner.__aenter__()
+        except BaseException:
+            self._release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        try:
+            try:
+                await self._finish_results()
+            finally:
+                await self._inner.__aexit__(*exc)
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        if self._holding:
+            self._holding = False
+            self._driver.release()
+
+    async def execute_read(self, work, *args, **kwargs):
+        async def instrumented(tx, *a, **kw):
+            runner = _InstrumentedRunner(tx)
+            try:
+                return await work(runner, *a, **kw)
+            finally:
+                await runner._finish_results()
+        return await self._inner.execute_read(instrumented, *args, **kwargs)
+
+    async def execute_write(self, work, *args, **kwargs):
+        async def instrumented(tx, *a, **kw):
+            runner = _InstrumentedRunner(tx)
+            try:
+                return await work(runner, *a, **kw)
+            finally:
+                await runner._finish_results()
+        return await self._inner.execute_write(instrumented, *args, **kwargs)
+
+
+class InstrumentedDriver:
+    """
+    AsyncDriver proxy recording per-query latency/rows and pool wait time.
+    `pool_size` should match the driver's max_connection_pool_size and
+    `acquisition_timeout` its connection_acquisition_timeout: sessions queue
+    on the gate rather than inside the driver, so the timeout applies here.
+    """
+
+    def __init__(
+        self,
+        inner: AsyncGraphDatabase,
+        pool_size: int,
+        acquisition_timeout: Optional[float] = None
+    ):
+        self.inner = inner
+        self.pool_size = pool_size
+        self.acquisition_timeout = acquisition_timeout
+        self.gate = asyncio.Semaphore(pool_size)
+        self.in_use = 0
+        self.waiting = 0
+        self.peak_in_use = 0
+        self.acquisitions = 0
+        self.contended = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def session(self, **kwargs) -> _InstrumentedSession:
+        return _InstrumentedSession(self, self.inner.session(**kwargs))
+
+    async def acquire(self) -> float:
+        """Take a pool slot; returns the seconds spent waiting for it."""
+        started = time.perf_counter()
+        self.waiting += 1
+        POOL_WAITING.inc()
+        try:
+            if self.acquisition_timeout is None:
+                await self.gate.acquire()
+            else:
+                await asyncio.wait_for(self.gate.acquire(), self.acquisition_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            POOL_TIMEOUTS.inc()
+            raise PoolAcquisitionTimeout(self.acquisition_timeout) from None
+        finally:
+            self.waiting -= 1
+            POOL_WAITING.dec()
+        waited = time.perf_counter() - started
+
+        self.in_use += 1
+        self.peak_in_use = max(self.peak_in_use, self.in_use)
+        self.acquisitions += 1
+        self.contended += waited > 0.001
+        self.wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        POOL_WAIT_SECONDS.observe(waited)
+        POOL_IN_USE.inc()
+        return waited
+
+    def release(self) -> None:
+        self.in_use -= 1
+        POOL_IN_USE.dec()
+        self.gate.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pool_size":           self.pool_size,
+            "in_use":              self.in_use,
+            "waiting":             self.waiting,
+            "saturation":          round(self.in_use / self.pool_size, 3),
+            "peak_in_use":         self.peak_in_use,
+            "acquisitions":        self.acquisitions,
+            "contended":           self.contended,
+            "timeouts":            self.timeouts,
+            "avg_wait_ms":         round(self.wait_seconds * 1000 / max(self.acquisitions, 1), 3),
+            "max_wait_ms":         round(self.max_wait_seconds * 1000, 3),
+            "acquisition_timeout": self.acquisition_timeout,
+        }
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.inner, name)
+
+
+class InstrumentedDrugRepository(DrugRepository):
+    """DrugRepository that records a latency histogram per method."""
+
+    def __init__(self, inner: DrugRepository):
+        self.inner = inner
+
+    @property
+    def driver(self) -> AsyncGraphDatabase:
+        return self.inner.driver
+
+    async def _timed(self, method: str, call):
+        started = time.perf_counter()
+        try:
+            return await call
+        except Exception:
+            REPOSITORY_ERRORS.inc(method=method)
+            raise
+        finally:
+            REPOSITORY_SECONDS.observe(time.perf_counter() - started, method=method)
+
+    async def resolve_names(self, names: List[str]) -> Dict[str, List[str]]:
+        return await self._timed("resolve_names", self.inner.resolve_names(names))
+
+    async def query_details(self, codes: List[str]) -> Dict[str, dict]:
+        return await self._timed("query_details", self.inner.query_details(codes))
+
+    async def resolve_subs(self, codes: List[str]) -> Dict[str, List[str]]:
+        return await self._timed("resolve_subs", self.inner.resolve_subs(codes))
+
+    async def fetch_contrasts(self, pairs: List[List[str]]) -> List[dict]:
+        return await self._timed("fetch_contrasts", self.inner.fetch_contrasts(pairs))
+
+    async def stream_contrasts(self, pairs: List[List[str]]) -> AsyncIterator[dict]:
+        started = time.perf_counter()
+        try:
+            async for record in self.inner.stream_contrasts(pairs):
+                yield record
+        except Exception:
+            REPOSITORY_ERRORS.inc(method="stream_contrasts")
+            raise
+        finally:
+            REPOSITORY_SECONDS.observe(time.perf_counter() - started, method="stream_contrasts")
+
+    async def fetch_contrasts_for_codes(
+        self,
+        current_codes: List[str],
+        history_codes: List[str]
+    ) -> List[dict]:
+        return await self._timed(
+            "fetch_contrasts_for_codes",
+            self.inner.fetch_contrasts_for_codes(current_codes, history_codes)
+        )
+
+    async def fetch_subs_name_map(self, subs_ids: List[str]) -> Dict[str, str]:
+        return await self._timed("fetch_subs_name_map", self.inner.fetch_subs_name_map(subs_ids))
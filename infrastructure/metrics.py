@@ -0,0 +1,213 @@
+# File: infrastructure/metrics.py
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from domain.metrics import PipelineMetrics
+
+# Seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Rows / pairs per request
+COUNT_BUCKETS = (0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _num(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labels)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """Sample lines of every label combination."""
+        ...
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_labels(self.labels, k)} {_num(v)}" for k, v in self._values.items()]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def _samples(self) -> List[str]:
+        lines: List[str] = []
+        for key, (counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = 'le="' + _num(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_num(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide metrics rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for m in self._metrics for line in m.render()) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_SECONDS = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route", "status")
+))
+PIPELINE_SECONDS = REGISTRY.register(Histogram(
+    "drug_pipeline_duration_seconds", "End-to-end service pipeline latency", ("pipeline",)
+))
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "drug_pipeline_stage_seconds", "Latency of one pipeline stage", ("stage",)
+))
+RESULT_ROWS = REGISTRY.register(Histogram(
+    "drug_pipeline_rows", "Result rows per request", ("pipeline",), COUNT_BUCKETS
+))
+PIPELINE_PAIRS = REGISTRY.register(Histogram(
+    "drug_pipeline_pairs", "SUBS pairs per request (candidate or interacting)", ("kind",), COUNT_BUCKETS
+))
+REPOSITORY_SECONDS = REGISTRY.register(Histogram(
+    "drug_repository_call_seconds", "Latency of one DrugRepository call", ("method",)
+))
+REPOSITORY_ERRORS = REGISTRY.register(Counter(
+    "drug_repository_errors_total", "Failed DrugRepository calls", ("method",)
+))
+QUERY_SECONDS = REGISTRY.register(Histogram(
+    "neo4j_query_seconds", "Cypher query latency until the result is consumed", ("query",)
+))
+QUERY_ROWS = REGISTRY.register(Counter(
+    "neo4j_query_rows_total", "Rows returned per Cypher query", ("query",)
+))
+QUERY_ERRORS = REGISTRY.register(Counter(
+    "neo4j_query_errors_total", "Failed Cypher queries", ("query",)
+))
+POOL_WAIT_SECONDS = REGISTRY.register(Histogram(
+    "neo4j_pool_wait_seconds", "Time spent waiting for a pooled session"
+))
+POOL_IN_USE = REGISTRY.register(Gauge(
+    "neo4j_pool_sessions_in_use", "Sessions currently holding a pool slot"
+))
+POOL_WAITING = REGISTRY.register(Gauge(
+    "neo4j_pool_sessions_waiting", "Sessions currently waiting for a pool slot"
+))
+POOL_TIMEOUTS = REGISTRY.register(Counter(
+    "neo4j_pool_acquisition_timeouts_total", "Sessions that gave up waiting for a pool slot"
+))
+
+
+class RequestTimings:
+    """Per-request durations, summarized into a Server-Timing header."""
+
+    def __init__(self):
+        self._totals: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self._totals[name] = self._totals.get(name, 0.0) + seconds
+
+    def header(self) -> str:
+        return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in self._totals.items())
+
+
+_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+def begin_request() -> RequestTimings:
+    """Start collecting timings for the current request (and its tasks)."""
+    timings = RequestTimings()
+    _timings.set(timings)
+    return timings
+
+def add_timing(name: str, seconds: float) -> None:
+    timings = _timings.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+def record_stage(stage: str, seconds: float) -> None:
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    add_timing(stage, seconds)
+
+
+class PrometheusPipelineMetrics(PipelineMetrics):
+    """PipelineMetrics adapter feeding the registry and Server-Timing."""
+
+    def stage(self, stage: str, seconds: float) -> None:
+        record_stage(stage, seconds)
+
+    def pipeline(self, pipeline: str, seconds: float) -> None:
+        PIPELINE_SECONDS.observe(seconds, pipeline=pipeline)
+
+    def rows(self, pipeline: str, count: int) -> None:
+        RESULT_ROWS.observe(count, pipeline=pipeline)
+
+    def pairs(self, kind: str, count: int) -> None:
+        PIPELINE_PAIRS.observe(count, kind=kind)
@@ -0,0 +1,156 @@
+# File: infrastructure/name_index.py
+
+import re
+from bisect import bisect_left
+from heapq import merge
+from typing import List, Dict, Iterable, Optional, Tuple
+
+from utils.helpers import normalize_query
+
+# Preferred level when several names match equally well: the most general
+# name carries the SUBS set the user most likely meant.
+LEVEL_RANK = {"SUBS": 0, "VTM": 1, "GP": 2, "GPU": 3, "TP": 4, "TPU": 5}
+
+# Runs of digits, Latin letters or Thai: "500mg" -> "500", "mg"
+_TOKEN = re.compile(r'[0-9]+|[a-z]+|[\u0E01-\u0E4E]+')
+
+# Tokens shorter than this get no typo variants
+MIN_TYPO_LEN = 4
+# A truncated last token expanding to more vocabulary than this is ignored
+MAX_PREFIX_EXPANSION = 64
+
+def name_key(text: str) -> str:
+    """Normalized lookup key of a drug name (Latin lower-cased, Thai folded)."""
+    return normalize_query(text or "").lower()
+
+def tokenize(key: str) -> List[str]:
+    return _TOKEN.findall(key)
+
+def _deletes(token: str) -> List[str]:
+    return [token[:i] + token[i + 1:] for i in range(len(token))]
+
+def _has(posting: List[int], idx: int) -> bool:
+    i = bisect_left(posting, idx)
+    return i < len(posting) and posting[i] == idx
+
+
+class NameIndex:
+    """
+    In-memory resolver of TPU/TP/GPU/GP/VTM/SUBS names to SUBS codes.
+
+    Names are tokenized (digits / Latin / Thai runs) into an inverted index.
+    Each query word matches the vocabulary exactly, as a prefix (last
+    token, for truncated input) or through a symmetric-delete dictionary
+    (one deletion on each side, i.e. roughly one typo); numbers (strengths)
+    only match exactly. Only names holding every query token are
+    candidates, so an extra word (another substance of a combination, a
+    different strength) makes the lookup miss rather than match less.
+    Ids are assigned in rank order (fewest tokens, most general level,
+    shortest), so the best candidate is the smallest id.
+
+    Build with add(), then freeze() before lookups.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, Tuple[int, Tuple[str, ...]]] = {}
+        self._keys: List[str] = []
+        self._subs: List[Tuple[str, ...]] = []
+        self._by_key: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = {}
+        self._vocab: List[str] = []
+        self._typos: Dict[str, Tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, name: str, level: str, subs_codes: Tuple[str, ...]) -> None:
+        """Index `name`; a name seen at several levels keeps its most general one."""
+        key = name_key(name)
+        if not key or not subs_codes:
+            return
+        rank = LEVEL_RANK[level]
+        seen = self._pending.get(key)
+        if seen is None or rank < seen[0]:
+            self._pending[key] = (rank, subs_codes)
+
+    def freeze(self) -> "NameIndex":
+        """Assign rank-ordered ids and build the token structures."""
+        ordered = sorted(
+            self._pending.items(),
+            key=lambda kv: (len(tokenize(kv[0])), kv[1][0], len(kv[0]), kv[0])
+        )
+        for idx, (key, (_, subs)) in enumerate(ordered):
+            self._by_key[key] = idx
+            self._keys.append(key)
+            self._subs.append(subs)
+            for token in dict.fromkeys(tokenize(key)):
+                self._postings.setdefault(token, []).append(idx)
+        self._pending = {}
+
+        self._vocab = sorted(self._postings)
+        typos: Dict[str, set] = {}
+        for token in self._vocab:
+            if len(token) >= MIN_TYPO_LEN:
+                for variant in _deletes(token):
+                    typos.setdefault(variant, set()).add(token)
+        self._typos = {v: tuple(tokens) for v, tokens in typos.items()}
+        return self
+
+    def _alternatives(self, token: str, last: bool) -> List[str]:
+        """Vocabulary tokens a query token may stand for."""
+        if token in self._postings:
+            return [token]
+        if token.isdigit():
+            return []
+        if last:
+            lo = bisect_left(self._vocab, token)
+            hi = bisect_left(self._vocab, token + "\uffff")
+            if 0 < hi - lo <= MAX_PREFIX_EXPANSION:
+                return self._vocab[lo:hi]
+        if len(token) < MIN_TYPO_LEN - 1:
+            return []
+        found = set(self._typos.get(token, ()))               # query has one extra char
+        for variant in _deletes(token):
+            if variant in self._postings:                     # query has one missing char
+                found.add(variant)
+            found.update(self._typos.get(variant, ()))        # one substituted char
+        return sorted(found)
+
+    def _posting(self, tokens: List[str]) -> List[int]:
+        if len(tokens) == 1:
+            return self._postings[tokens[0]]
+        return list(dict.fromkeys(merge(*(self._postings[t] for t in tokens))))
+
+    def lookup(self, name: str) -> Optional[List[str]]:
+        """Sorted SUBS codes of the best matching name, or None."""
+        key = name_key(name)
+        if not key:
+            return None
+        idx = self._by_key.get(key)
+        if idx is None:
+            tokens = list(dict.fromkeys(tokenize(key)))
+            postings = []
+            for i, token in enumerate(tokens):
+                alternatives = self._alternatives(token, last=i == len(tokens) - 1)
+                if not alternatives:
+                    return None
+                postings.append(self._posting(alternatives))
+            if not postings:
+                return None
+            postings.sort(key=len)
+            candidates = postings[0]
+            for posting in postings[1:]:
+                candidates = [i for i in candidates if _has(posting, i)]
+                if not candidates:
+                    return None
+            idx = candidates[0]
+        return sorted(set(self._subs[idx]))
+
+    def resolve(self, names: Iterable[str]) -> Dict[str, List[str]]:
+        """name -> SUBS codes for every name the index can resolve."""
+        resolved: Dict[str, List[str]] = {}
+        for name in names:
+            subs = self.lookup(name)
+            if subs:
+                resolved[name] = subs
+        return resolved
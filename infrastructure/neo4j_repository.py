@@ -1,44 +1,52 @@
 # File: infrastructure/neo4j_repository.py
 
-import ast
 from collections import Counter
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict
 
-from neo4j import AsyncGraphDatabase
+from neo4j import AsyncGraphDatabase, READ_ACCESS
 from domain.repository import DrugRepository
 from utils.cypher import (
     DRUGSEARCH_CYPHER,
     RESOLVE_SUBS_FALLBACK,
     SEARCHSUBS_CYPHER,
     CONTRAST_CYPHER,
+    CONTRAST_BY_CODES_CYPHER,
     SUBS_NAME_CYPHER,
     STRING_SEARCH_CYPHER
 )
-from utils.helpers import normalize_query, sanitize_for_lucene
+from utils.helpers import (
+    fulltext_prefix_query,
+    normalize_query,
+    parse_list_property,
+    sanitize_for_lucene
+)
 
 class Neo4jDrugRepository(DrugRepository):
     """Neo4j adapter implementing the DrugRepository interface."""
 
-    def __init__(self, driver: AsyncGraphDatabase):
+    def __init__(self, driver: AsyncGraphDatabase, stream_batch_pairs: int = 500):
         self.driver = driver
+        self.stream_batch_pairs = stream_batch_pairs
+
+    def _session(self):
+        # Every query here is a read; a cluster routes these to followers
+        return self.driver.session(default_access_mode=READ_ACCESS)
 
     async def resolve_names(self, names: List[str]) -> Dict[str, List[str]]:
         name_map: Dict[str, List[str]] = {}
         unresolved = set(names)
     
-        async with self.driver.session() as session:
+        async with self._session() as session:
             # Step 1: Try STRING_SEARCH_CYPHER
             for name in list(unresolved):
                 query = normalize_query(name).lower()
-                result = await session.run(STRING_SEARCH_CYPHER, {"q": query})
+                lucene = fulltext_prefix_query(query)
+                if not lucene:
+                    continue
+                result = await session.run(STRING_SEARCH_CYPHER, {"q": query, "lucene": lucene})
                 record = await result.single()
                 if record:
-                    subs_codes = record["subs_codes"] or []
-                    if isinstance(subs_codes, str):
-                        try:
-                            subs_codes = ast.literal_eval(subs_codes)
-                        except:
-                            subs_codes = []
+                    subs_codes = parse_list_property(record["subs_codes"])
                     if subs_codes:
                         name_map[name] = list(sorted(set(subs_codes)))  # remove duplicates
                         unresolved.discard(name)
@@ -56,12 +64,7 @@ class Neo4jDrugRepository(DrugRepository):
                     best = record["best"]
                     if not best:
                         continue
-                    subs_codes = best.get("subs_codes") or []
-                    if isinstance(subs_codes, str):
-                        try:
-                            subs_codes = ast.literal_eval(subs_codes)
-                        except:
-                            subs_codes = []
+                    subs_codes = parse_list_property(best.get("subs_codes"))
                     if subs_codes:
                         original_name = query_to_name.get(q, q)
                         name_map[original_name] = list(sorted(set(subs_codes)))
@@ -73,7 +76,7 @@ class Neo4jDrugRepository(DrugRepository):
         details: Dict[str, dict] = {}
         found = set()
 
-        async with self.driver.session() as session:
+        async with self._session() as session:
             # primary detail lookup
             result = await session.run(DRUGSEARCH_CYPHER, {"qs": codes})
             async for record in result:
@@ -82,25 +85,11 @@ class Neo4jDrugRepository(DrugRepository):
                 if not best:
                     continue
 
-                subs_codes = best.get("subs_codes") or []
-                subs_names = best.get("subs_names") or []
-                
                 # เพิ่มดึง external flag
                 external_flag = str(best.get("external", "false")).lower() == "true"
 
-                if isinstance(subs_codes, str):
-                    try:
-                        subs_codes = ast.literal_eval(subs_codes)
-                    except:
-                        subs_codes = []
-                if isinstance(subs_names, str):
-                    try:
-                        subs_names = ast.literal_eval(subs_names)
-                    except:
-                        subs_names = []
-
-                best["subs_codes"] = subs_codes
-                best["subs_names"] = subs_names
+                best["subs_codes"] = parse_list_property(best.get("subs_codes"))
+                best["subs_names"] = parse_list_property(best.get("subs_names"))
                 best["external"] = external_flag   # <--- เพิ่ม
                 details[code] = best
                 found.add(code)
@@ -138,7 +127,7 @@ class Neo4jDrugRepository(DrugRepository):
     async def resolve_subs(self, codes: List[str]) -> Dict[str, List[str]]:
         mapping: Dict[str, List[str]] = {}
 
-        async with self.driver.session() as session:
+        async with self._session() as session:
             result = await session.run(DRUGSEARCH_CYPHER, {"qs": codes})
             async for record in result:
                 code = record["code"]
@@ -146,14 +135,7 @@ class Neo4jDrugRepository(DrugRepository):
                 if not best:
                     continue
 
-                subs_codes = best.get("subs_codes") or []
-                if isinstance(subs_codes, str):
-                    try:
-                        subs_codes = ast.literal_eval(subs_codes)
-                    except:
-                        subs_codes = []
-
-                mapping[code] = subs_codes
+                mapping[code] = parse_list_property(best.get("subs_codes"))
 
         # Ensure every code appears in the result
         for code in codes:
@@ -162,14 +144,34 @@ class Neo4jDrugRepository(DrugRepository):
         return mapping
 
     async def fetch_contrasts(self, pairs: List[List[str]]) -> List[dict]:
-        async with self.driver.session() as session:
+        async with self._session() as session:
             result = await session.run(CONTRAST_CYPHER, {"pairs": pairs})
             return [record.data() async for record in result]
 
+    async def stream_contrasts(self, pairs: List[List[str]]) -> AsyncIterator[dict]:
+        # Each batch of pairs runs to completion in its own session, and the
+        # session is released before its records are yielded: a slow client
+        # then holds no connection (or pool slot) while it reads
+        for i in range(0, len(pairs), self.stream_batch_pairs):
+            for record in await self.fetch_contrasts(pairs[i:i + self.stream_batch_pairs]):
+                yield record
+
+    async def fetch_contrasts_for_codes(
+        self,
+        current_codes: List[str],
+        history_codes: List[str]
+    ) -> List[dict]:
+        async with self._session() as session:
+            result = await session.run(
+                CONTRAST_BY_CODES_CYPHER,
+                {"current": current_codes, "history": history_codes}
+            )
+            return [record.data() async for record in result]
+
     async def fetch_subs_name_map(self, subs_ids: List[str]) -> Dict[str, str]:
         name_map: Dict[str, str] = {}
 
-        async with self.driver.session() as session:
+        async with self._session() as session:
             result = await session.run(SUBS_NAME_CYPHER, {"subs_ids": subs_ids})
             async for record in result:
                 name_map[record["code"]] = record["name"]
@@ -0,0 +1,84 @@
+# File: infrastructure/normalize_catalogue.py
+#
+# Offline normalization of the drug graph, run after each catalogue load.
+#
+#   1) DRUG.`TMTID(SUBS)_LIST` / `SUBSNAME_LIST` stored as their string
+#      repr ("['123', '456']") are rewritten as native string lists.
+#   2) Every SUBS/VTM/GP/GPU/TP/TPU node gets `TMTID(SUBS)_CLOSURE`: the
+#      SUBS IDs below it in the hierarchy, read by the code lookups instead
+#      of a variable-length expansion per request.
+#
+# Both steps are idempotent. The queries accept graphs in either state, so
+# the service keeps working before, during and after the job.
+#
+# Usage (connection from api.env, like the app):
+#   python -m infrastructure.normalize_catalogue
+#   python -m infrastructure.normalize_catalogue --batch-size 500 --skip-closure
+
+import os
+import sys
+import asyncio
+import argparse
+from typing import List
+
+from dotenv import load_dotenv
+from neo4j import basic_auth, AsyncGraphDatabase
+
+from utils.cypher import STRING_LISTS_CYPHER, SET_NATIVE_LISTS_CYPHER, SUBS_CLOSURE_CYPHER
+from utils.helpers import parse_list_property
+
+def _as_strings(value) -> List[str]:
+    return [str(v) for v in parse_list_property(value)]
+
+async def normalize_lists(driver: AsyncGraphDatabase, batch_size: int) -> int:
+    """Rewrite string-encoded SUBS lists as native lists; returns the DRUG nodes changed."""
+    changed = 0
+    async with driver.session() as session:
+        while True:
+            result = await session.run(STRING_LISTS_CYPHER, {"batch": batch_size})
+            rows = [
+                {
+                    "id":         record["id"],
+                    "subs_codes": _as_strings(record["subs_codes"]),
+                    "subs_names": _as_strings(record["subs_names"]),
+                }
+                async for record in result
+            ]
+            if not rows:
+                return changed
+            # rewritten nodes no longer match, so the next batch moves on
+            await (await session.run(SET_NATIVE_LISTS_CYPHER, {"rows": rows})).consume()
+            changed += len(rows)
+
+async def precompute_closure(driver: AsyncGraphDatabase, batch_size: int) -> int:
+    """Store each hierarchy node's SUBS closure; returns the nodes written."""
+    async with driver.session() as session:
+        result = await session.run(SUBS_CLOSURE_CYPHER, {"batch": batch_size})
+        summary = await result.consume()
+        return summary.counters.properties_set
+
+async def run(args) -> int:
+    load_dotenv("api.env")
+    driver = AsyncGraphDatabase.driver(
+        os.getenv("NEO4J_URI_STAGING"),
+        auth=basic_auth(os.getenv("NEO4J_USERNAME_STAGING"), os.getenv("NEO4J_PASSWORD_STAGING"))
+    )
+    try:
+        changed = await normalize_lists(driver, args.batch_size)
+        print(f"native SUBS lists written on {changed} DRUG nodes")
+        if not args.skip_closure:
+            written = await precompute_closure(driver, args.batch_size)
+            print(f"SUBS closure written on {written} hierarchy nodes")
+    finally:
+        await driver.close()
+    return 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Normalize list properties and precompute SUBS closures")
+    parser.add_argument("--batch-size", type=int, default=1000, help="nodes per write transaction")
+    parser.add_argument("--skip-closure", action="store_true", help="only rewrite the SUBS lists")
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+# File: infrastructure/query_profile.py
+
+import json
+import heapq
+import logging
+from contextvars import ContextVar
+from typing import Any, List, Dict, Optional
+
+logger = logging.getLogger("drug_service.cypher_profile")
+
+def _stat(plan: dict, key: str, arg: str) -> int:
+    value = plan.get(key)
+    if value is None:
+        value = (plan.get("args") or {}).get(arg, 0)
+    return int(value or 0)
+
+def flatten_plan(plan: Optional[dict], depth: int = 0) -> List[Dict[str, Any]]:
+    """Operators of a PROFILE plan tree (depth-first) with db hits, rows and time."""
+    if not plan:
+        return []
+    ops = [{
+        "operator": plan.get("operatorType", "?"),
+        "depth":    depth,
+        "db_hits":  _stat(plan, "dbHits", "DbHits"),
+        "rows":     _stat(plan, "rows", "Rows"),
+        # reported in nanoseconds when the server tracks operator time
+        "time_ms":  round(_stat(plan, "time", "Time") / 1e6, 3),
+    }]
+    for child in plan.get("children") or []:
+        ops.extend(flatten_plan(child, depth + 1))
+    return ops
+
+
+class QueryProfile:
+    """Profile of one query execution."""
+
+    __slots__ = ("query", "elapsed_ms", "server_ms", "db_hits", "rows", "operators")
+
+    def __init__(self, query: str, elapsed_ms: float, summary: Any):
+        self.query = query
+        self.elapsed_ms = elapsed_ms
+        self.operators = flatten_plan(getattr(summary, "profile", None))
+        self.server_ms = (
+            (getattr(summary, "result_available_after", None) or 0)
+            + (getattr(summary, "result_consumed_after", None) or 0)
+        )
+        self.db_hits = sum(op["db_hits"] for op in self.operators)
+        self.rows = self.operators[0]["rows"] if self.operators else 0
+
+    def top_operators(self, n: int = 3) -> List[Dict[str, Any]]:
+        return sorted(self.operators, key=lambda op: op["db_hits"], reverse=True)[:n]
+
+    def as_dict(self, operators: bool = True) -> Dict[str, Any]:
+        out = {
+            "query":      self.query,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+            "server_ms":  self.server_ms,
+            "db_hits":    self.db_hits,
+            "rows":       self.rows,
+        }
+        if operators:
+            out["operators"] = self.operators
+        return out
+
+
+class ProfileStore:
+    """
+    Rolling aggregates of profiled queries: per-query totals/maxima and the
+    `top_n` slowest individual executions, for /api/v1/admin/profile.
+    """
+
+    def __init__(self, top_n: int = 20):
+        self.top_n = top_n
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._worst: List[tuple] = []   # min-heap of (elapsed_ms, seq, profile dict)
+        self._seq = 0
+
+    def record(self, profile: QueryProfile) -> None:
+        agg = self._totals.setdefault(profile.query, {
+            "count": 0, "total_ms": 0.0, "max_ms": 0.0, "total_db_hits": 0, "max_db_hits": 0,
+        })
+        agg["count"] += 1
+        agg["total_ms"] += profile.elapsed_ms
+        agg["max_ms"] = max(agg["max_ms"], profile.elapsed_ms)
+        agg["total_db_hits"] += profile.db_hits
+        agg["max_db_hits"] = max(agg["max_db_hits"], profile.db_hits)
+
+        self._seq += 1
+        entry = (profile.elapsed_ms, self._seq, profile.as_dict())
+        if len(self._worst) < self.top_n:
+            heapq.heappush(self._worst, entry)
+        elif entry[0] > self._worst[0][0]:
+            heapq.heapreplace(self._worst, entry)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queries": {
+                name: {
+                    **agg,
+                    "total_ms": round(agg["total_ms"], 3),
+                    "max_ms":   round(agg["max_ms"], 3),
+                    "avg_ms":   round(agg["total_ms"] / agg["count"], 3),
+                }
+                for name, agg in sorted(
+                    self._totals.items(), key=lambda kv: kv[1]["total_ms"], reverse=True
+                )
+            },
+            "worst": [e[2] for e in sorted(self._worst, reverse=True)],
+        }
+
+    def clear(self) -> int:
+        size = len(self._totals)
+        self._totals.clear()
+        self._worst.clear()
+        return size
+
+
+class RequestProfile:
+    """Queries profiled while serving one request."""
+
+    def __init__(self, store: Optional[ProfileStore] = None):
+        self.store = store
+        self.queries: List[QueryProfile] = []
+
+    def add(self, profile: QueryProfile) -> None:
+        self.queries.append(profile)
+        if self.store is not None:
+            self.store.record(profile)
+        logger.info(json.dumps(profile.as_dict(), ensure_ascii=False))
+
+    def header(self) -> str:
+        """Compact per-query summary for the X-Cypher-Profile header."""
+        parts = []
+        for q in self.queries:
+            top = q.top_operators(1)
+            hot = f";hot={top[0]['operator']}:{top[0]['db_hits']}" if top else ""
+            parts.append(f"{q.query};ms={q.elapsed_ms:.1f};hits={q.db_hits};rows={q.rows}{hot}")
+        return ", ".join(parts)
+
+
+_profile: ContextVar[Optional[RequestProfile]] = ContextVar("cypher_profile", default=None)
+
+def begin_profile(store: Optional[ProfileStore] = None) -> RequestProfile:
+    """Run the current request's queries (and its tasks') under PROFILE."""
+    profile = RequestProfile(store)
+    _profile.set(profile)
+    return profile
+
+def current_profile() -> Optional[RequestProfile]:
+    return _profile.get()
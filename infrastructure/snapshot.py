@@ -0,0 +1,599 @@
+# File: infrastructure/snapshot.py
+#
+# Read-only binary snapshot of the TMT catalogue (hierarchy rows, SUBS
+# names, CONTRAST_WITH edges) that every uvicorn worker memory-maps, so a
+# host keeps one physical copy in the page cache and workers start without
+# loading the catalogue from Neo4j. Subscribed to the CatalogueWatcher, a
+# worker re-maps the file once an export has replaced it.
+#
+# Usage (connection from api.env, like the app):
+#   python -m infrastructure.snapshot export catalogue.snap   # write atomically
+#   python -m infrastructure.snapshot info catalogue.snap     # header and counts
+#
+# Layout: a header, a section table and uint32 sections. All strings live
+# once in a pool sorted by code point, so a string id orders like its
+# string and every key table below is a sorted id array searched by bisect.
+#
+#   STR_OFFSETS  n_strings + 1 byte offsets into STR_DATA
+#   STR_DATA     UTF-8 bytes
+#   ROWS         13 per DRUG row: 10 ids (code, name per level),
+#                subs_codes list, subs_names list, external flag
+#   LIST_OFFSETS / LIST_DATA   interned string-id lists
+#   CODE_KEYS / CODE_VALS      sorted code id -> (row, level)
+#   SUBS_KEYS / SUBS_NAMES     sorted SUBS id -> name id
+#   ADJ_KEYS / ADJ_OFFSETS / ADJ_DATA   sorted SUBS id -> (neighbour id, attrs id),
+#                                       neighbours sorted
+#   ATTRS        ATTR_FIELDS string ids per distinct interaction block
+#   META         JSON (catalogue version, export time, counts)
+
+import os
+import sys
+import json
+import mmap
+import time
+import struct
+import asyncio
+import argparse
+from array import array
+from bisect import bisect_left
+from typing import AsyncIterator, Iterable, List, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+from neo4j import basic_auth, AsyncGraphDatabase, READ_ACCESS
+
+from domain.contrast_engine import ContrastEngine
+from domain.repository import DrugRepository
+from infrastructure.contrast_engine import ATTR_FIELDS
+from infrastructure.tmt_index import fetch_catalogue
+from utils.cypher import ALL_CONTRASTS_CYPHER, CATALOGUE_VERSION_CYPHER
+from utils.helpers import LEVELS
+
+MAGIC = b"TMTSNAP\0"
+VERSION = 1
+# Written in native order; a reader on the other byte order rejects the file
+BYTE_ORDER_MARK = 0x01020304
+
+SECTIONS = (
+    "STR_OFFSETS", "STR_DATA", "ROWS", "LIST_OFFSETS", "LIST_DATA",
+    "CODE_KEYS", "CODE_VALS", "SUBS_KEYS", "SUBS_NAMES",
+    "ADJ_KEYS", "ADJ_OFFSETS", "ADJ_DATA", "ATTRS", "META",
+)
+_HEADER = struct.Struct("<8sII")
+_SECTION = struct.Struct("<QQ")
+
+ROW_WIDTH = 2 * len(LEVELS) + 3
+_SUBS_CODES = 2 * len(LEVELS)
+_SUBS_NAMES = _SUBS_CODES + 1
+_EXTERNAL   = _SUBS_NAMES + 1
+LEVEL_NAMES = [lvl.upper() for lvl in LEVELS] + ["SUBS"]
+
+class SnapshotFormatError(ValueError):
+    """Raised when a file is not a snapshot this version can read."""
+
+
+class SnapshotStaleError(RuntimeError):
+    """Raised when the snapshot holds an older catalogue version than Neo4j."""
+
+
+# ── Writing ────────────────────────────────────────────────────────
+
+def write_snapshot(
+    path: str,
+    rows: List[tuple],
+    subs_names: Dict[str, str],
+    edges: List[Tuple[str, str, tuple]],
+    meta: Optional[dict] = None
+) -> dict:
+    """
+    Write a snapshot to `path` atomically (temp file + rename), so workers
+    mapping the previous file keep a consistent view.
+    `rows` use the fetch_catalogue layout; `edges` are (sid1, sid2, attrs)
+    with attrs in ATTR_FIELDS order. Returns the counts stored in META.
+    """
+    # 1) Sorted string pool
+    strings = {""}
+    for row in rows:
+        strings.update(row[:_SUBS_CODES])
+        strings.update(row[_SUBS_CODES])
+        strings.update(row[_SUBS_NAMES])
+    strings.update(subs_names)
+    strings.update(subs_names.values())
+    for sid1, sid2, attrs in edges:
+        strings.update((sid1, sid2))
+        strings.update(attrs)
+    pool = sorted(strings)
+    sid_of = {s: i for i, s in enumerate(pool)}
+
+    str_offsets = array("I", [0])
+    str_data = bytearray()
+    for s in pool:
+        str_data += s.encode("utf-8")
+        str_offsets.append(len(str_data))
+
+    # 2) Rows with interned lists
+    list_ids: Dict[tuple, int] = {}
+    list_offsets = array("I", [0])
+    list_data = array("I")
+
+    def _list(values: tuple) -> int:
+        lid = list_ids.get(values)
+        if lid is None:
+            lid = list_ids[values] = len(list_offsets) - 1
+            list_data.extend(sid_of[v] for v in values)
+            list_offsets.append(len(list_data))
+        return lid
+
+    row_data = array("I")
+    by_code: Dict[int, Tuple[int, int]] = {}
+    for idx, row in enumerate(rows):
+        row_data.extend(sid_of[v] for v in row[:_SUBS_CODES])
+        row_data.extend((_list(row[_SUBS_CODES]), _list(row[_SUBS_NAMES]), int(row[_EXTERNAL])))
+        # first row carrying a code wins, as in TmtIndex
+        for i in range(len(LEVELS)):
+            if row[2 * i]:
+                by_code.setdefault(sid_of[row[2 * i]], (idx, i))
+        for sid in row[_SUBS_CODES]:
+            by_code.setdefault(sid_of[sid], (idx, len(LEVELS)))
+
+    code_keys = array("I", sorted(by_code))
+    code_vals = array("I")
+    for key in code_keys:
+        code_vals.extend(by_code[key])
+
+    subs_keys = array("I", sorted(sid_of[s] for s in subs_names))
+    subs_vals = array("I", (sid_of[subs_names[pool[k]]] for k in subs_keys))
+
+    # 3) Adjacency in CSR form with shared interaction blocks
+    attr_ids: Dict[tuple, int] = {}
+    attr_data = array("I")
+    adjacency: Dict[int, Dict[int, int]] = {}
+    for sid1, sid2, attrs in edges:
+        aid = attr_ids.get(attrs)
+        if aid is None:
+            aid = attr_ids[attrs] = len(attr_ids)
+            attr_data.extend(sid_of[v] for v in attrs)
+        a, b = sid_of[sid1], sid_of[sid2]
+        adjacency.setdefault(a, {})[b] = aid
+        adjacency.setdefault(b, {})[a] = aid
+
+    adj_keys = array("I", sorted(adjacency))
+    adj_offsets = array("I", [0])
+    adj_data = array("I")
+    for key in adj_keys:
+        for other, aid in sorted(adjacency[key].items()):
+            adj_data.extend((other, aid))
+        adj_offsets.append(len(adj_data) // 2)
+
+    counts = {
+        "strings": len(pool),
+        "rows":    len(rows),
+        "codes":   len(code_keys),
+        "subs":    len(subs_keys),
+        "edges":   len(edges),
+        "attrs":   len(attr_ids),
+    }
+    meta_bytes = json.dumps({**(meta or {}), "counts": counts}, ensure_ascii=False).encode("utf-8")
+
+    # 4) Header, section table, 8-byte aligned sections
+    payloads = [
+        str_offsets.tobytes(), bytes(str_data), row_data.tobytes(),
+        list_offsets.tobytes(), list_data.tobytes(),
+        code_keys.tobytes(), code_vals.tobytes(),
+        subs_keys.tobytes(), subs_vals.tobytes(),
+        adj_keys.tobytes(), adj_offsets.tobytes(), adj_data.tobytes(),
+        attr_data.tobytes(), meta_bytes,
+    ]
+    offset = _HEADER.size + 4 + _SECTION.size * len(SECTIONS)
+    table = []
+    for payload in payloads:
+        offset += -offset % 8
+        table.append((offset, len(payload)))
+        offset += len(payload)
+
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(SECTIONS)))
+        f.write(array("I", [BYTE_ORDER_MARK]).tobytes())
+        for entry in table:
+            f.write(_SECTION.pack(*entry))
+        for (start, _), payload in zip(table, payloads):
+            f.write(b"\0" * (start - f.tell()))
+            f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return counts
+
+
+async def export_snapshot(driver: AsyncGraphDatabase, path: str) -> dict:
+    """Read the catalogue and every CONTRAST_WITH edge from Neo4j into `path`."""
+    rows, subs_names = await fetch_catalogue(driver)
+    edges: List[Tuple[str, str, tuple]] = []
+    async with driver.session(default_access_mode=READ_ACCESS) as session:
+        result = await session.run(ALL_CONTRASTS_CYPHER)
+        async for record in result:
+            edges.append((
+                record["sub1_id"],
+                record["sub2_id"],
+                tuple(record[f] or "" for f in ATTR_FIELDS),
+            ))
+            # edge endpoints always have a name entry, as in AdjacencyContrastEngine
+            subs_names.setdefault(record["sub1_id"], record["sub1_name"] or "")
+            subs_names.setdefault(record["sub2_id"], record["sub2_name"] or "")
+        result = await session.run(CATALOGUE_VERSION_CYPHER)
+        record = await result.single()
+        version = record["version"] if record else ""
+
+    meta = {"catalogue_version": version, "exported_at": int(time.time())}
+    return write_snapshot(path, rows, subs_names, edges, meta)
+
+
+# ── Reading ────────────────────────────────────────────────────────
+
+class _Pool:
+    """The string pool as a sorted sequence of UTF-8 byte strings, for bisect."""
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(self, data: memoryview, offsets: memoryview):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> bytes:
+        return bytes(self.data[self.offsets[i]:self.offsets[i + 1]])
+
+
+class MmapSnapshot(ContrastEngine):
+    """
+    Memory-mapped snapshot. Nothing is copied into the process up front;
+    lookups binary-search the mapped tables and decode only the strings
+    they return. Also usable as the InteractionService contrast engine.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mm: Optional[mmap.mmap] = None
+        self._map()
+
+    def _map(self) -> None:
+        """Map `path` and swap it in, then release the previous mapping, if any."""
+        file = open(self.path, "rb")
+        try:
+            mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            file.close()
+            raise
+        try:
+            sections = self._sections(mm)
+        except Exception:
+            self._release(file, mm, [])
+            raise
+        st = os.fstat(file.fileno())
+        stale = (self._file, self._mm, self._views) if self._mm is not None else None
+
+        self._file = file
+        self._mm = mm
+        self._identity = (st.st_dev, st.st_ino, st.st_mtime_ns)
+        self._views = list(sections.values())
+        self._pool = _Pool(sections["STR_DATA"], sections["STR_OFFSETS"])
+        self._rows = sections["ROWS"]
+        self._list_offsets = sections["LIST_OFFSETS"]
+        self._list_data = sections["LIST_DATA"]
+        self._code_keys = sections["CODE_KEYS"]
+        self._code_vals = sections["CODE_VALS"]
+        self._subs_keys = sections["SUBS_KEYS"]
+        self._subs_names = sections["SUBS_NAMES"]
+        self._adj_keys = sections["ADJ_KEYS"]
+        self._adj_offsets = sections["ADJ_OFFSETS"]
+        self._adj_data = sections["ADJ_DATA"]
+        self._attrs = sections["ATTRS"]
+        self.meta = json.loads(bytes(sections["META"]).decode("utf-8"))
+        if stale is not None:
+            self._release(*stale)
+
+    def _sections(self, mm: mmap.mmap) -> Dict[str, memoryview]:
+        """Validate the header and return a view per section."""
+        if len(mm) < _HEADER.size + 4 + _SECTION.size * len(SECTIONS):
+            raise SnapshotFormatError(f"{self.path}: too short for a catalogue snapshot")
+        magic, version, n_sections = _HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or version != VERSION or n_sections != len(SECTIONS):
+            raise SnapshotFormatError(f"{self.path}: not a v{VERSION} catalogue snapshot")
+        if array("I", mm[_HEADER.size:_HEADER.size + 4])[0] != BYTE_ORDER_MARK:
+            raise SnapshotFormatError(f"{self.path}: written on a machine of the other byte order")
+
+        view = memoryview(mm)
+        sections: Dict[str, memoryview] = {}
+        base = _HEADER.size + 4
+        for i, name in enumerate(SECTIONS):
+            start, length = _SECTION.unpack_from(mm, base + i * _SECTION.size)
+            raw = view[start:start + length]
+            sections[name] = raw if name in ("STR_DATA", "META") else raw.cast("I")
+        return sections
+
+    @staticmethod
+    def _release(file, mm: mmap.mmap, views: List[memoryview]) -> None:
+        for view in views:
+            view.release()
+        try:
+            mm.close()
+        except BufferError:
+            # a view is still alive somewhere; the map goes when it does
+            pass
+        file.close()
+
+    @property
+    def ready(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        self._release(self._file, self._mm, self._views)
+
+    async def load(self, driver: AsyncGraphDatabase) -> None:
+        """
+        CatalogueWatcher loader: re-map the file if an export replaced it
+        since it was mapped. Raises SnapshotStaleError while the file still
+        holds an older catalogue than Neo4j, so the watcher retries on its
+        next poll instead of recording the new version as loaded.
+        """
+        st = os.stat(self.path)
+        if (st.st_dev, st.st_ino, st.st_mtime_ns) != self._identity:
+            self._map()
+        async with driver.session(default_access_mode=READ_ACCESS) as session:
+            result = await session.run(CATALOGUE_VERSION_CYPHER)
+            record = await result.single()
+            version = record["version"] if record else ""
+        if self.meta.get("catalogue_version", "") != version:
+            raise SnapshotStaleError(
+                f"{self.path} holds catalogue {self.meta.get('catalogue_version')!r}, "
+                f"Neo4j has {version!r}; re-export it"
+            )
+
+    # -- primitives
+
+    def _str(self, i: int) -> str:
+        return self._pool[i].decode("utf-8")
+
+    def _id(self, text: str) -> Optional[int]:
+        """Pool id of `text`, or None if the snapshot does not contain it."""
+        key = text.encode("utf-8")
+        i = bisect_left(self._pool, key)
+        return i if i < len(self._pool) and self._pool[i] == key else None
+
+    @staticmethod
+    def _find(keys: memoryview, key: int) -> Optional[int]:
+        i = bisect_left(keys, key)
+        return i if i < len(keys) and keys[i] == key else None
+
+    def _list(self, lid: int) -> List[str]:
+        lo, hi = self._list_offsets[lid], self._list_offsets[lid + 1]
+        return [self._str(i) for i in self._list_data[lo:hi]]
+
+    def _code(self, code: str) -> Optional[Tuple[int, int]]:
+        sid = self._id(code) if code else None
+        pos = self._find(self._code_keys, sid) if sid is not None else None
+        if pos is None:
+            return None
+        return self._code_vals[2 * pos], self._code_vals[2 * pos + 1]
+
+    def _name_of(self, sid: int) -> str:
+        pos = self._find(self._subs_keys, sid)
+        return self._str(self._subs_names[pos]) if pos is not None else ""
+
+    def _neighbours(self, sid: int) -> Tuple[memoryview, memoryview]:
+        """(neighbour ids, attrs ids) of a SUBS id, both sorted by neighbour."""
+        pos = self._find(self._adj_keys, sid)
+        if pos is None:
+            return self._adj_data[0:0], self._adj_data[0:0]
+        lo, hi = self._adj_offsets[pos], self._adj_offsets[pos + 1]
+        pairs = self._adj_data[2 * lo:2 * hi]
+        return pairs[0::2], pairs[1::2]
+
+    def _record(self, a: int, b: int, aid: int) -> dict:
+        rec = {
+            "sub1_id":   self._str(a),
+            "sub1_name": self._name_of(a),
+            "sub2_id":   self._str(b),
+            "sub2_name": self._name_of(b),
+        }
+        block = self._attrs[aid * len(ATTR_FIELDS):(aid + 1) * len(ATTR_FIELDS)]
+        rec.update(zip(ATTR_FIELDS, (self._str(i) for i in block)))
+        return rec
+
+    # -- TmtIndex-compatible lookups
+
+    def details(self, code: str) -> Optional[dict]:
+        """Detail record shaped like DRUGSEARCH_CYPHER's `best`, or None."""
+        hit = self._code(code)
+        if hit is None:
+            return None
+        idx, level = hit
+        row = self._rows[idx * ROW_WIDTH:(idx + 1) * ROW_WIDTH]
+        best = {"level": LEVEL_NAMES[level]}
+        for i, lvl in enumerate(LEVELS):
+            best[f"{lvl}_code"] = self._str(row[2 * i])
+            best[f"{lvl}_name"] = self._str(row[2 * i + 1])
+        best["subs_codes"] = self._list(row[_SUBS_CODES])
+        best["subs_names"] = self._list(row[_SUBS_NAMES])
+        best["score"] = None
+        best["external"] = bool(row[_EXTERNAL])
+        return best
+
+    def subs_codes(self, code: str) -> Optional[List[str]]:
+        hit = self._code(code)
+        if hit is None:
+            return None
+        return self._list(self._rows[hit[0] * ROW_WIDTH + _SUBS_CODES])
+
+    def subs_name(self, sid: str) -> Optional[str]:
+        i = self._id(sid) if sid else None
+        pos = self._find(self._subs_keys, i) if i is not None else None
+        return self._str(self._subs_names[pos]) if pos is not None else None
+
+    # -- ContrastEngine lookups
+
+    def find_contrasts(self, subs_ids: Iterable[str]) -> List[dict]:
+        """
+        CONTRAST_WITH records among `subs_ids` with sub1_id < sub2_id,
+        sorted by pair, like AdjacencyContrastEngine.find_contrasts.
+        """
+        ids = sorted({i for i in map(self._id, set(subs_ids)) if i is not None})
+        wanted = set(ids)
+        records: List[dict] = []
+        for a in ids:
+            others, attrs = self._neighbours(a)
+            # neighbours are sorted: only those after `a` can be new pairs
+            for k in range(bisect_left(others, a + 1), len(others)):
+                if others[k] in wanted:
+                    records.append(self._record(a, others[k], attrs[k]))
+        return records
+
+    def knows(self, sid: str) -> bool:
+        """True if `sid` was a SUBS of the catalogue when the snapshot was exported."""
+        return self.subs_name(sid) is not None
+
+    def contrast(self, sid1: str, sid2: str) -> Optional[dict]:
+        """The CONTRAST_WITH record between two SUBS, oriented as given."""
+        a, b = self._id(sid1), self._id(sid2)
+        if a is None or b is None:
+            return None
+        others, attrs = self._neighbours(a)
+        k = self._find(others, b)
+        return self._record(a, b, attrs[k]) if k is not None else None
+
+
+class SnapshotDrugRepository(DrugRepository):
+    """
+    DrugRepository answering codes, SUBS names and contrasts from a
+    MmapSnapshot. Names and codes the snapshot does not know go to the
+    wrapped repository, if any. So do contrasts of pairs with a SUBS the
+    snapshot does not know (added after the export): for those a missing
+    edge proves nothing.
+    """
+
+    def __init__(self, inner: Optional[DrugRepository], snapshot: MmapSnapshot):
+        self.inner = inner
+        self.snapshot = snapshot
+
+    @property
+    def driver(self) -> Optional[AsyncGraphDatabase]:
+        return self.inner.driver if self.inner is not None else None
+
+    async def resolve_names(self, names: List[str]) -> Dict[str, List[str]]:
+        return await self.inner.resolve_names(names) if self.inner is not None else {}
+
+    async def query_details(self, codes: List[str]) -> Dict[str, dict]:
+        details: Dict[str, dict] = {}
+        missing: List[str] = []
+        for code in codes:
+            best = self.snapshot.details(code)
+            if best is None:
+                missing.append(code)
+            else:
+                details[code] = best
+        if missing and self.inner is not None:
+            details.update(await self.inner.query_details(missing))
+        return details
+
+    async def resolve_subs(self, codes: List[str]) -> Dict[str, List[str]]:
+        mapping: Dict[str, List[str]] = {}
+        missing: List[str] = []
+        for code in codes:
+            subs = self.snapshot.subs_codes(code)
+            if subs is None:
+                missing.append(code)
+            else:
+                mapping[code] = subs
+        if missing and self.inner is not None:
+            mapping.update(await self.inner.resolve_subs(missing))
+        for code in codes:
+            mapping.setdefault(code, [])
+        return mapping
+
+    def _contrasts(self, pairs: List[List[str]]) -> Tuple[List[dict], List[List[str]]]:
+        """Snapshot records of `pairs`, and the pairs the snapshot cannot answer."""
+        records: List[dict] = []
+        missing: List[List[str]] = []
+        for sid1, sid2 in pairs:
+            if self.inner is not None and not (self.snapshot.knows(sid1) and self.snapshot.knows(sid2)):
+                missing.append([sid1, sid2])
+                continue
+            rec = self.snapshot.contrast(sid1, sid2)
+            if rec is not None:
+                records.append(rec)
+        return records, missing
+
+    async def fetch_contrasts(self, pairs: List[List[str]]) -> List[dict]:
+        records, missing = self._contrasts(pairs)
+        if missing:
+            records.extend(await self.inner.fetch_contrasts(missing))
+        return records
+
+    async def stream_contrasts(self, pairs: List[List[str]]) -> AsyncIterator[dict]:
+        records, missing = self._contrasts(pairs)
+        for rec in records:
+            yield rec
+        if missing:
+            async for rec in self.inner.stream_contrasts(missing):
+                yield rec
+
+    async def fetch_subs_name_map(self, subs_ids: List[str]) -> Dict[str, str]:
+        name_map: Dict[str, str] = {}
+        missing: List[str] = []
+        for sid in subs_ids:
+            name = self.snapshot.subs_name(sid)
+            if name is None:
+                missing.append(sid)
+            else:
+                name_map[sid] = name
+        if missing and self.inner is not None:
+            name_map.update(await self.inner.fetch_subs_name_map(missing))
+        return name_map
+
+
+# ── Command line ───────────────────────────────────────────────────
+
+async def _export(path: str) -> dict:
+    load_dotenv("api.env")
+    driver = AsyncGraphDatabase.driver(
+        os.getenv("NEO4J_URI_STAGING"),
+        auth=basic_auth(os.getenv("NEO4J_USERNAME_STAGING"), os.getenv("NEO4J_PASSWORD_STAGING"))
+    )
+    try:
+        return await export_snapshot(driver, path)
+    finally:
+        await driver.close()
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Export or inspect a catalogue snapshot")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="write the catalogue from Neo4j to a snapshot file")
+    export.add_argument("path", help="snapshot file to (re)write")
+    info = sub.add_parser("info", help="print a snapshot's header and counts")
+    info.add_argument("path", help="snapshot file to read")
+
+    args = parser.parse_args()
+    if args.command == "export":
+        started = time.perf_counter()
+        counts = asyncio.run(_export(args.path))
+        size = os.path.getsize(args.path)
+        print(f"wrote {args.path}: {size / 1e6:.1f} MB in {time.perf_counter() - started:.1f}s")
+    else:
+        try:
+            snapshot = MmapSnapshot(args.path)
+        except ValueError as exc:
+            print(exc, file=sys.stderr)
+            return 1
+        counts = snapshot.meta.get("counts", {})
+        for key, value in snapshot.meta.items():
+            if key != "counts":
+                print(f"{key:<18} {value}")
+        snapshot.close()
+    for key, value in counts.items():
+        print(f"{key:<18} {value}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
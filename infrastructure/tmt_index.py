@@ -0,0 +1,225 @@
+# File: infrastructure/tmt_index.py
+
+import sys
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+
+from neo4j import AsyncGraphDatabase, READ_ACCESS
+from domain.repository import DrugRepository
+from utils.cypher import TMT_INDEX_CYPHER, SUBS_INDEX_CYPHER
+from infrastructure.name_index import NameIndex
+from utils.helpers import LEVELS, parse_list_property
+
+# Row layout: (tpu_code, tpu_name, tp_code, tp_name, ..., vtm_name,
+#              subs_codes, subs_names, external)
+_SUBS_CODES = 2 * len(LEVELS)
+_SUBS_NAMES = _SUBS_CODES + 1
+_EXTERNAL   = _SUBS_NAMES + 1
+
+class _Snapshot:
+    """Immutable view of one catalogue load; swapped atomically on reload."""
+
+    __slots__ = ("rows", "by_code", "subs_names", "names")
+
+    def __init__(
+        self,
+        rows: List[tuple],
+        by_code: Dict[str, Tuple[int, str]],
+        subs_names: Dict[str, str],
+        names: Optional[NameIndex] = None
+    ):
+        self.rows = rows
+        self.by_code = by_code
+        self.subs_names = subs_names
+        self.names = names
+
+
+async def fetch_catalogue(driver: AsyncGraphDatabase) -> Tuple[List[tuple], Dict[str, str]]:
+    """
+    Every DRUG row (interned, in the row layout above) and every SUBS name.
+    Shared by TmtIndex.load and the snapshot export.
+    """
+    rows: List[tuple] = []
+    subs_names: Dict[str, str] = {}
+    interned: Dict[tuple, tuple] = {}
+
+    def _s(v) -> str:
+        return sys.intern(str(v)) if v else ""
+
+    def _t(values) -> tuple:
+        t = tuple(_s(v) for v in parse_list_property(values))
+        return interned.setdefault(t, t)
+
+    async with driver.session(default_access_mode=READ_ACCESS) as session:
+        result = await session.run(TMT_INDEX_CYPHER)
+        async for record in result:
+            rows.append(tuple(
+                _s(record[f"{lvl}_{kind}"])
+                for lvl in LEVELS for kind in ("code", "name")
+            ) + (
+                _t(record["subs_codes"]),
+                _t(record["subs_names"]),
+                str(record["external"]).lower() == "true",
+            ))
+
+        result = await session.run(SUBS_INDEX_CYPHER)
+        async for record in result:
+            if record["code"]:
+                subs_names[_s(record["code"])] = record["name"] or ""
+
+    return rows, subs_names
+
+
+class TmtIndex:
+    """
+    Compact in-memory code → hierarchy → SUBS index of the TMT catalogue.
+
+    Every hierarchy code (TPU/TP/GPU/GP/VTM) and every SUBS ID points at the
+    first DRUG row that carries it, mirroring the "best" record that
+    DRUGSEARCH_CYPHER returns for an exact code match.
+
+    With `name_index`, every hierarchy and SUBS name is also indexed for
+    fuzzy name resolution (see NameIndex).
+    """
+
+    def __init__(self, name_index: bool = False):
+        self.name_index = name_index
+        self._snap: Optional[_Snapshot] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._snap is not None
+
+    async def load(self, driver: AsyncGraphDatabase) -> None:
+        """Rebuild the index from Neo4j and swap it in."""
+        rows, subs_names = await fetch_catalogue(driver)
+        by_code: Dict[str, Tuple[int, str]] = {}
+        for idx, row in enumerate(rows):
+            for i, lvl in enumerate(LEVELS):
+                if row[2 * i]:
+                    by_code.setdefault(row[2 * i], (idx, lvl.upper()))
+            for sid in row[_SUBS_CODES]:
+                by_code.setdefault(sid, (idx, "SUBS"))
+
+        names = None
+        if self.name_index:
+            names = NameIndex()
+            for sid, name in subs_names.items():
+                names.add(name, "SUBS", (sid,))
+            for row in rows:
+                for i, lvl in enumerate(LEVELS):
+                    names.add(row[2 * i + 1], lvl.upper(), row[_SUBS_CODES])
+            names.freeze()
+
+        self._snap = _Snapshot(rows, by_code, subs_names, names)
+
+    def details(self, code: str) -> Optional[dict]:
+        """Detail record shaped like DRUGSEARCH_CYPHER's `best`, or None."""
+        snap = self._snap
+        hit = snap.by_code.get(code) if snap else None
+        if hit is None:
+            return None
+        idx, level = hit
+        row = snap.rows[idx]
+        best = {"level": level}
+        for i, lvl in enumerate(LEVELS):
+            best[f"{lvl}_code"] = row[2 * i]
+            best[f"{lvl}_name"] = row[2 * i + 1]
+        best["subs_codes"] = list(row[_SUBS_CODES])
+        best["subs_names"] = list(row[_SUBS_NAMES])
+        best["score"] = None
+        best["external"] = row[_EXTERNAL]
+        return best
+
+    def subs_codes(self, code: str) -> Optional[List[str]]:
+        snap = self._snap
+        hit = snap.by_code.get(code) if snap else None
+        if hit is None:
+            return None
+        return list(snap.rows[hit[0]][_SUBS_CODES])
+
+    def subs_name(self, sid: str) -> Optional[str]:
+        snap = self._snap
+        return snap.subs_names.get(sid) if snap else None
+
+    def resolve_names(self, names: List[str]) -> Optional[Dict[str, List[str]]]:
+        """name -> SUBS codes for the names the index matches; None without a name index."""
+        snap = self._snap
+        if snap is None or snap.names is None:
+            return None
+        return snap.names.resolve(names)
+
+
+class TmtIndexRepository(DrugRepository):
+    """
+    DrugRepository that answers code lookups from a TmtIndex and only
+    delegates codes the index does not know about to the wrapped repository.
+    """
+
+    def __init__(self, inner: DrugRepository, index: TmtIndex):
+        self.inner = inner
+        self.index = index
+
+    @property
+    def driver(self) -> AsyncGraphDatabase:
+        return self.inner.driver
+
+    async def resolve_names(self, names: List[str]) -> Dict[str, List[str]]:
+        name_map = self.index.resolve_names(names)
+        if name_map is None:
+            return await self.inner.resolve_names(names)
+        missing = [n for n in names if n not in name_map]
+        if missing:
+            name_map.update(await self.inner.resolve_names(missing))
+        return name_map
+
+    async def query_details(self, codes: List[str]) -> Dict[str, dict]:
+        details: Dict[str, dict] = {}
+        missing: List[str] = []
+        for code in codes:
+            best = self.index.details(code)
+            if best is None:
+                missing.append(code)
+            else:
+                details[code] = best
+        if missing:
+            details.update(await self.inner.query_details(missing))
+        return details
+
+    async def resolve_subs(self, codes: List[str]) -> Dict[str, List[str]]:
+        mapping: Dict[str, List[str]] = {}
+        missing: List[str] = []
+        for code in codes:
+            subs = self.index.subs_codes(code)
+            if subs is None:
+                missing.append(code)
+            else:
+                mapping[code] = subs
+        if missing:
+            mapping.update(await self.inner.resolve_subs(missing))
+        return mapping
+
+    async def fetch_contrasts(self, pairs: List[List[str]]) -> List[dict]:
+        return await self.inner.fetch_contrasts(pairs)
+
+    def stream_contrasts(self, pairs: List[List[str]]) -> AsyncIterator[dict]:
+        return self.inner.stream_contrasts(pairs)
+
+    async def fetch_contrasts_for_codes(
+        self,
+        current_codes: List[str],
+        history_codes: List[str]
+    ) -> List[dict]:
+        return await self.inner.fetch_contrasts_for_codes(current_codes, history_codes)
+
+    async def fetch_subs_name_map(self, subs_ids: List[str]) -> Dict[str, str]:
+        name_map: Dict[str, str] = {}
+        missing: List[str] = []
+        for sid in subs_ids:
+            name = self.index.subs_name(sid)
+            if name is None:
+                missing.append(sid)
+            else:
+                name_map[sid] = name
+        if missing:
+            name_map.update(await self.inner.fetch_subs_name_map(missing))
+        return name_map
@@ -0,0 +1,122 @@
+# File: infrastructure/warmup.py
+
+import time
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI
+from neo4j import AsyncGraphDatabase, READ_ACCESS
+from pydantic import BaseModel
+
+from infrastructure.indexes import PLAN_PARAMS
+from utils import cypher
+
+logger = logging.getLogger(__name__)
+
+# Full-catalogue reads (run by the snapshot loaders anyway) and maintenance
+# writes of normalize_catalogue; everything else in utils.cypher is warmed
+WARMUP_SKIP = {
+    "TMT_INDEX_CYPHER",
+    "SUBS_INDEX_CYPHER",
+    "ALL_CONTRASTS_CYPHER",
+    "STRING_LISTS_CYPHER",
+    "SET_NATIVE_LISTS_CYPHER",
+    "SUBS_CLOSURE_CYPHER",
+}
+
+class WarmupState:
+    """Progress of the startup warm-up, reported by GET /ready."""
+
+    def __init__(self):
+        self.ready = False
+        self.attempts = 0
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.seconds: Optional[float] = None
+        self.steps: Dict[str, float] = {}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready":    self.ready,
+            "attempts": self.attempts,
+            "error":    self.error,
+            "seconds":  self.seconds,
+            "steps_ms": {k: round(v * 1000, 1) for k, v in self.steps.items()},
+        }
+
+
+async def open_connections(driver: AsyncGraphDatabase, connections: int) -> None:
+    """Verify the server is reachable and open `connections` pooled connections."""
+    await driver.verify_connectivity()
+
+    async def ping() -> None:
+        async with driver.session(default_access_mode=READ_ACCESS) as session:
+            await (await session.run("RETURN 1")).consume()
+
+    # concurrent sessions each need their own connection
+    await asyncio.gather(*(ping() for _ in range(connections)))
+
+async def warm_plans(driver: AsyncGraphDatabase) -> int:
+    """Run every request-path query once so its plan is in Neo4j's query cache."""
+    warmed = 0
+    async with driver.session(default_access_mode=READ_ACCESS) as session:
+        for query, name in cypher.QUERY_NAMES.items():
+            if name in WARMUP_SKIP:
+                continue
+            await (await session.run(query, PLAN_PARAMS.get(name, {}))).consume()
+            warmed += 1
+    return warmed
+
+def warm_models(app: FastAPI) -> int:
+    """Build the response models' schemas and the cached OpenAPI document."""
+    models = {
+        route.response_model for route in app.routes
+        if isinstance(getattr(route, "response_model", None), type)
+        and issubclass(route.response_model, BaseModel)
+    }
+    for model in models:
+        model.model_rebuild()
+        model.model_json_schema()
+    app.openapi()
+    return len(models)
+
+async def warm_up(
+    app: FastAPI,
+    driver: AsyncGraphDatabase,
+    state: WarmupState,
+    connections: int,
+    retry_seconds: float = 10.0
+) -> None:
+    """
+    Run the warm-up steps and mark `state` ready. Database steps are retried
+    every `retry_seconds` until they succeed; the instance stays not-ready
+    meanwhile.
+    """
+    async def models() -> None:
+        warm_models(app)
+
+    state.started_at = time.perf_counter()
+    pending = [
+        ("models",      models),
+        ("connections", lambda: open_connections(driver, connections)),
+        ("plans",       lambda: warm_plans(driver)),
+    ]
+    while pending:
+        state.attempts += 1
+        try:
+            while pending:
+                name, step = pending[0]
+                started = time.perf_counter()
+                await step()
+                state.steps[name] = time.perf_counter() - started
+                pending.pop(0)
+        except Exception as exc:
+            state.error = f"{pending[0][0]}: {exc}"
+            logger.warning("warm-up step %s failed, retrying in %gs: %s", pending[0][0], retry_seconds, exc)
+            await asyncio.sleep(retry_seconds)
+
+    state.error = None
+    state.seconds = round(time.perf_counter() - state.started_at, 3)
+    state.ready = True
+    logger.info("warm-up finished in %.2fs", state.seconds)
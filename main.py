@@ -1,23 +1,142 @@
 # File: main.py
 
-import os
-from fastapi import FastAPI
-from dotenv import load_dotenv
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
 from api.routers.drugs import router as drugs_router
 from api.routers.allergy import router as allergy_router
+from api.routers.admin import router as admin_router
+from api.routers.metrics import router as metrics_router
+from api.routers.health import router as health_router
+from api.dependencies import (
+    catalogue_watcher,
+    create_driver,
+    warmup_state,
+    GZIP_ENABLED,
+    GZIP_LEVEL,
+    GZIP_MIN_BYTES,
+    METRICS_ENABLED,
+    SERVER_TIMING_ENABLED,
+    WARMUP_ENABLED,
+    WARMUP_CONNECTIONS,
+    WARMUP_RETRY_SECONDS,
+)
+from infrastructure.metrics import HTTP_SECONDS, begin_request
+from api.requests import PayloadTooLarge, payload_schemas
+from api.responses import StreamingGZipMiddleware
+from domain.services.result_cache import InvalidCursor
+from domain.services.session_store import SessionNotFound
+from domain.services.stages import StageTimeoutError
+from infrastructure.instrumentation import PoolAcquisitionTimeout
+from infrastructure.warmup import warm_up
 
-# Load environment variables (so routers can pick them up if needed)
-load_dotenv("api.env")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One Neo4j driver (and connection pool) for every router, see get_repo
+    app.state.driver = create_driver()
+    warmup = None
+    try:
+        # Load in-memory catalogue snapshots and keep them fresh in the background
+        await catalogue_watcher.start(app.state.driver)
+        # Warm pool, query plans and models in the background; /ready is 503 until done
+        if WARMUP_ENABLED:
+            warmup = asyncio.create_task(warm_up(
+                app, app.state.driver, warmup_state, WARMUP_CONNECTIONS, WARMUP_RETRY_SECONDS
+            ))
+        else:
+            warmup_state.ready = True
+        yield
+    finally:
+        # Background tasks go first, even when startup or the app failed:
+        # they must not outlive the driver they query
+        if warmup is not None:
+            warmup.cancel()
+        await catalogue_watcher.stop()
+        await app.state.driver.close()
 
 app = FastAPI(
     title="Drug Interaction API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# Mount our two routers
+# Compress responses for clients that accept gzip (outermost, after timing);
+# streamed rows are flushed chunk by chunk
+if GZIP_ENABLED:
+    app.add_middleware(StreamingGZipMiddleware, minimum_size=GZIP_MIN_BYTES, compresslevel=GZIP_LEVEL)
+
+@app.middleware("http")
+async def request_timing(request: Request, call_next):
+    # Stage/query timings of this request are collected into `timings`
+    timings = begin_request()
+    t0 = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - t0
+
+    route = request.scope.get("route")
+    HTTP_SECONDS.observe(
+        elapsed,
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=str(response.status_code)
+    )
+    if SERVER_TIMING_ENABLED:
+        timings.add("total", elapsed)
+        response.headers["Server-Timing"] = timings.header()
+    # Set by ?profile=true (see api.dependencies.cypher_profile)
+    profile = getattr(request.state, "cypher_profile", None)
+    if profile is not None:
+        response.headers["X-Cypher-Profile"] = profile.header()
+    return response
+
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor) -> JSONResponse:
+    return JSONResponse(
+        status_code=400,
+        content={"status": False, "code": 400, "message": str(exc)}
+    )
+
+@app.exception_handler(SessionNotFound)
+async def session_not_found_handler(request: Request, exc: SessionNotFound) -> JSONResponse:
+    return JSONResponse(
+        status_code=404,
+        content={"status": False, "code": 404, "message": str(exc)}
+    )
+
+@app.exception_handler(PoolAcquisitionTimeout)
+async def pool_timeout_handler(request: Request, exc: PoolAcquisitionTimeout) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"status": False, "code": 503, "message": str(exc)}
+    )
+
+@app.exception_handler(StageTimeoutError)
+async def stage_timeout_handler(request: Request, exc: StageTimeoutError) -> JSONResponse:
+    return JSONResponse(
+        status_code=504,
+        content={"status": False, "code": 504, "message": str(exc)}
+    )
+
+@app.exception_handler(PayloadTooLarge)
+async def payload_too_large_handler(request: Request, exc: PayloadTooLarge) -> JSONResponse:
+    return JSONResponse(
+        status_code=413,
+        content={"status": False, "code": 413, "message": str(exc)}
+    )
+
+# Mount our routers
 app.include_router(drugs_router)
 app.include_router(allergy_router)
+app.include_router(admin_router)
+app.include_router(health_router)
+if METRICS_ENABLED:
+    app.include_router(metrics_router)
+
+# Body models read through api.requests.payload_body
+payload_schemas(app)
 
 if __name__ == "__main__":
     import uvicorn
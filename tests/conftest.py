@@ -0,0 +1,35 @@
+# File: tests/conftest.py
+#
+# Tests run offline: services over InMemoryDrugRepository, Cypher-speaking
+# adapters over tests/fake_neo4j.SyntheticDriver. Tests that need a real
+# database are skipped unless NEO4J_URI_STAGING is set.
+#
+# Usage:
+#   pip install -r requirements-dev.txt
+#   python -m pytest -q
+
+import os
+import sys
+
+import pytest
+
+# the repository root, so `domain`, `infrastructure`, ... import as in the app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import SyntheticCatalogue  # noqa: E402
+
+# Catalogue seeds the equivalence tests run over
+SEEDS = range(8)
+
+@pytest.fixture(scope="session")
+def catalogue() -> SyntheticCatalogue:
+    """A small catalogue dense enough for most payloads to interact."""
+    return SyntheticCatalogue(subs=120, vtm=100, contrast_density=0.05, text_len=40, seed=7)
+
+@pytest.fixture(scope="session")
+def catalogues() -> list:
+    """One small catalogue per seed in SEEDS."""
+    return [
+        SyntheticCatalogue(subs=120, vtm=100, contrast_density=0.05, text_len=40, seed=seed)
+        for seed in SEEDS
+    ]
@@ -0,0 +1,106 @@
+# File: tests/fake_neo4j.py
+#
+# Async Neo4j driver double answering the utils.cypher queries from a
+# SyntheticCatalogue, so adapters that talk Cypher (Neo4jDrugRepository,
+# TmtIndex.load, ContrastEngine.load, the snapshot export, the catalogue
+# watcher) run in tests without a database. Repository queries are
+# answered through InMemoryDrugRepository, so both give the same results.
+
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from benchmarks.replay_driver import ReplayResult
+from benchmarks.synthetic import InMemoryDrugRepository, SyntheticCatalogue
+from utils.cypher import query_name
+
+class _Session:
+
+    def __init__(self, driver: "SyntheticDriver"):
+        self._driver = driver
+
+    async def __aenter__(self) -> "_Session":
+        self._driver.open_sessions += 1
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        self._driver.open_sessions -= 1
+
+    async def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs) -> ReplayResult:
+        name = query_name(query)
+        self._driver.round_trips[name] += 1
+        answer = self._driver.answers.get(name)
+        if answer is None:
+            raise NotImplementedError(f"SyntheticDriver cannot answer {name}")
+        return ReplayResult(await answer(dict(parameters or {}, **kwargs)))
+
+    async def execute_read(self, work, *args, **kwargs):
+        return await work(self, *args, **kwargs)
+
+
+class SyntheticDriver:
+    """Driver double over a SyntheticCatalogue; `version` is the catalogue version marker."""
+
+    def __init__(self, catalogue: SyntheticCatalogue, version: str = "1"):
+        self.catalogue = catalogue
+        self.version = version
+        self.repo = InMemoryDrugRepository(catalogue)
+        self.round_trips: Counter = Counter()
+        self.open_sessions = 0
+        self.answers: Dict[str, Callable[[Dict[str, Any]], Awaitable[List[dict]]]] = {
+            "STRING_SEARCH_CYPHER":     self._string_search,
+            "DRUGSEARCH_CYPHER":        self._drugsearch,
+            "RESOLVE_SUBS_FALLBACK":    self._fallback,
+            "CONTRAST_CYPHER":          self._contrasts,
+            "CONTRAST_BY_CODES_CYPHER": self._contrasts_by_codes,
+            "SUBS_NAME_CYPHER":         self._subs_names,
+            "CATALOGUE_VERSION_CYPHER": self._version,
+            "TMT_INDEX_CYPHER":         self._tmt_index,
+            "SUBS_INDEX_CYPHER":        self._subs_index,
+            "ALL_CONTRASTS_CYPHER":     self._all_contrasts,
+        }
+
+    def session(self, **kwargs) -> _Session:
+        return _Session(self)
+
+    async def close(self) -> None:
+        return None
+
+    async def _string_search(self, params: Dict[str, Any]) -> List[dict]:
+        name_map = await self.repo.resolve_names([params["q"]])
+        return [{"subs_codes": codes} for codes in name_map.values()]
+
+    async def _drugsearch(self, params: Dict[str, Any]) -> List[dict]:
+        return [{"code": q, "best": self.catalogue.best(q)} for q in params["qs"]]
+
+    async def _fallback(self, params: Dict[str, Any]) -> List[dict]:
+        mapping = await self.repo.resolve_subs(params["codes"])
+        return [{"sid": sid} for sid in dict.fromkeys(s for subs in mapping.values() for s in subs)]
+
+    async def _contrasts(self, params: Dict[str, Any]) -> List[dict]:
+        return await self.repo.fetch_contrasts(params["pairs"])
+
+    async def _contrasts_by_codes(self, params: Dict[str, Any]) -> List[dict]:
+        return await self.repo.fetch_contrasts_for_codes(params["current"], params["history"])
+
+    async def _subs_names(self, params: Dict[str, Any]) -> List[dict]:
+        name_map = await self.repo.fetch_subs_name_map(params["subs_ids"])
+        return [{"code": sid, "name": name} for sid, name in name_map.items()]
+
+    async def _version(self, params: Dict[str, Any]) -> List[dict]:
+        return [{"version": self.version}]
+
+    async def _tmt_index(self, params: Dict[str, Any]) -> List[dict]:
+        return sorted(self.catalogue.drugs, key=lambda row: row["tpu_code"])
+
+    async def _subs_index(self, params: Dict[str, Any]) -> List[dict]:
+        return [{"code": sid, "name": name} for sid, name in self.catalogue.subs_names.items()]
+
+    async def _all_contrasts(self, params: Dict[str, Any]) -> List[dict]:
+        names = self.catalogue.subs_names
+        return [
+            {"sub1_id": a, "sub1_name": names[a], "sub2_id": b, "sub2_name": names[b], **attrs}
+            for (a, b), attrs in sorted(self.catalogue.contrasts.items())
+        ]
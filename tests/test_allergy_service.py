@@ -0,0 +1,64 @@
+# File: tests/test_allergy_service.py
+
+import asyncio
+from typing import Dict, List
+
+import pytest
+
+import domain.services.allergy_service as allergy_service
+from benchmarks.synthetic import InMemoryDrugRepository, allergy_payload
+from domain.metrics import PipelineMetrics
+from domain.services.allergy_service import AllergyService
+
+class RecordingMetrics(PipelineMetrics):
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def stage(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def pipeline(self, pipeline: str, seconds: float) -> None:
+        return None
+
+    def rows(self, pipeline: str, count: int) -> None:
+        self.counts[pipeline] = count
+
+    def pairs(self, kind: str, count: int) -> None:
+        return None
+
+def test_streamed_rows_match_built_rows(catalogue):
+    for seed in range(5):
+        metrics = RecordingMetrics()
+        service = AllergyService(InMemoryDrugRepository(catalogue), metrics=metrics)
+        expected = asyncio.run(service.build_rows(allergy_payload(catalogue, 15, seed=seed)))
+
+        async def stream():
+            return [row async for row in service.iter_rows(allergy_payload(catalogue, 15, seed=seed))]
+
+        metrics.stages.clear()
+        streamed = asyncio.run(stream())
+        assert [r.model_dump() for r in streamed] == [r.model_dump() for r in expected]
+        assert metrics.counts["allergy_stream"] == len(streamed)
+        assert {"details", "enrich", "assemble"} <= set(metrics.stages)
+
+def test_failed_enrichment_cancels_the_subs_name_lookup(catalogue, monkeypatch):
+    class SlowNamesRepository(InMemoryDrugRepository):
+        async def fetch_subs_name_map(self, subs_ids: List[str]) -> Dict[str, str]:
+            await asyncio.sleep(60)
+            return {}
+
+    def broken(items, detail_map):
+        raise RuntimeError("enrichment failed")
+
+    monkeypatch.setattr(allergy_service, "apply_details", broken)
+    service = AllergyService(SlowNamesRepository(catalogue))
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await service.build_rows(allergy_payload(catalogue, 10, seed=2))
+        # let the cancellation reach the lookup
+        await asyncio.sleep(0)
+        return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    assert asyncio.run(run()) == []
@@ -0,0 +1,40 @@
+# File: tests/test_batch.py
+
+import json
+import asyncio
+
+import pytest
+from fastapi.exceptions import RequestValidationError
+
+from api.requests import PayloadTooLarge, decode_payload
+from benchmarks.synthetic import InMemoryDrugRepository, allergy_payload, drug_payload
+from domain.models import BatchDrugPayload
+from domain.services.allergy_service import AllergyService
+from domain.services.interaction_service import InteractionService
+
+def _dumps(rows) -> list:
+    return [r.model_dump() for r in rows]
+
+def test_drug_batch_matches_single_requests(catalogue):
+    seeds = range(6)
+    service = InteractionService(InMemoryDrugRepository(catalogue))
+    batch = asyncio.run(service.build_rows_batch([drug_payload(catalogue, 12, seed=s) for s in seeds]))
+    single = [asyncio.run(service.build_rows(drug_payload(catalogue, 12, seed=s))) for s in seeds]
+    assert any(batch)
+    assert [_dumps(rows) for rows in batch] == [_dumps(rows) for rows in single]
+
+def test_allergy_batch_matches_single_requests(catalogue):
+    seeds = range(6)
+    service = AllergyService(InMemoryDrugRepository(catalogue))
+    batch = asyncio.run(service.build_rows_batch([allergy_payload(catalogue, 12, seed=s) for s in seeds]))
+    single = [asyncio.run(service.build_rows(allergy_payload(catalogue, 12, seed=s))) for s in seeds]
+    assert any(batch)
+    assert [_dumps(rows) for rows in batch] == [_dumps(rows) for rows in single]
+
+def test_batch_limit_is_enforced_before_validation():
+    # items that would fail validation still get the 413, not a 422
+    body = json.dumps({"patients": [{"drug_currents": "not a list"}] * 3}).encode()
+    with pytest.raises(PayloadTooLarge):
+        decode_payload(BatchDrugPayload, body, max_items={"patients": 2})
+    with pytest.raises(RequestValidationError):
+        decode_payload(BatchDrugPayload, body, max_items={"patients": 3})
@@ -0,0 +1,40 @@
+# File: tests/test_contrast_engine.py
+
+import asyncio
+from itertools import combinations
+
+from benchmarks.synthetic import InMemoryDrugRepository, drug_payload
+from domain.services.interaction_service import InteractionService
+from infrastructure.contrast_engine import AdjacencyContrastEngine
+from fake_neo4j import SyntheticDriver
+
+def _engine(catalogue) -> AdjacencyContrastEngine:
+    engine = AdjacencyContrastEngine()
+    asyncio.run(engine.load(SyntheticDriver(catalogue)))
+    return engine
+
+def test_find_contrasts_matches_every_pair(catalogue):
+    engine = _engine(catalogue)
+    repo = InMemoryDrugRepository(catalogue)
+    subs = sorted(catalogue.subs_names)[:60]
+    expected = asyncio.run(repo.fetch_contrasts([list(p) for p in combinations(subs, 2)]))
+    assert engine.find_contrasts(subs) == expected
+    assert engine.edge_count == len(catalogue.contrasts)
+
+def test_rows_match_pairs_strategy(catalogues):
+    for catalogue in catalogues:
+        engine = _engine(catalogue)
+        for seed in range(5):
+            pairs = InteractionService(InMemoryDrugRepository(catalogue))
+            repo = InMemoryDrugRepository(catalogue)
+            with_engine = InteractionService(repo, contrast_engine=engine)
+            expected = asyncio.run(pairs.build_rows(drug_payload(catalogue, 15, seed=seed)))
+            actual = asyncio.run(with_engine.build_rows(drug_payload(catalogue, 15, seed=seed)))
+            assert [r.model_dump() for r in actual] == [r.model_dump() for r in expected]
+            assert "fetch_contrasts" not in repo.round_trips
+
+def test_unloaded_engine_falls_back_to_the_repository(catalogue):
+    repo = InMemoryDrugRepository(catalogue)
+    service = InteractionService(repo, contrast_engine=AdjacencyContrastEngine())
+    asyncio.run(service.build_rows(drug_payload(catalogue, 10, seed=1)))
+    assert repo.round_trips["fetch_contrasts"] == 1
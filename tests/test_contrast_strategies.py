@@ -0,0 +1,45 @@
+# File: tests/test_contrast_strategies.py
+
+import asyncio
+from typing import List
+
+from benchmarks.synthetic import InMemoryDrugRepository, drug_payload
+from domain.models import DrugItem, DrugPayload
+from domain.services.interaction_service import InteractionService
+
+def _rows(service: InteractionService, payload: DrugPayload) -> list:
+    return [r.model_dump() for r in asyncio.run(service.build_rows(payload))]
+
+def test_graph_strategy_matches_pairs(catalogues):
+    for catalogue in catalogues:
+        for seed in range(5):
+            pairs = InteractionService(InMemoryDrugRepository(catalogue), contrast_strategy="pairs")
+            graph = InteractionService(InMemoryDrugRepository(catalogue), contrast_strategy="graph")
+            expected = _rows(pairs, drug_payload(catalogue, 15, seed=seed))
+            assert _rows(graph, drug_payload(catalogue, 15, seed=seed)) == expected
+
+def test_graph_strategy_keeps_edges_found_by_the_traversal(catalogue):
+    # CONTRAST_BY_CODES_CYPHER expands codes through the SUBS closure, which
+    # can reach SUBS that the DRUG rows of the details do not list; their
+    # rows map back to items through sub1_codes/sub2_codes
+    a, b = catalogue.drugs[0], catalogue.drugs[-1]
+    extra = {
+        "sub1_id": "0000001", "sub1_name": "CLOSURE ONLY",
+        "sub2_id": b["subs_codes"][0], "sub2_name": "",
+        "sub1_codes": [a["tpu_code"]], "sub2_codes": [b["tpu_code"]],
+        **next(iter(catalogue.contrasts.values())),
+    }
+
+    class ClosureRepository(InMemoryDrugRepository):
+        async def fetch_contrasts_for_codes(self, current: List[str], history: List[str]) -> List[dict]:
+            return await super().fetch_contrasts_for_codes(current, history) + [dict(extra)]
+
+    payload = DrugPayload(
+        drug_currents=[DrugItem(tpu_code=a["tpu_code"]), DrugItem(tpu_code=b["tpu_code"])]
+    )
+    service = InteractionService(ClosureRepository(catalogue), contrast_strategy="graph")
+    rows = asyncio.run(service.build_rows(payload))
+    closure_rows = [r for r in rows if r.input_substances[0]["code"] == "0000001"]
+    assert len(closure_rows) == 1
+    assert closure_rows[0].input_tpu_code == a["tpu_code"]
+    assert closure_rows[0].contrast_tpu_code == b["tpu_code"]
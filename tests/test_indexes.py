@@ -0,0 +1,28 @@
+# File: tests/test_indexes.py
+#
+# Plan checks against a real database: set NEO4J_URI_STAGING (and the
+# username/password, as in api.env) to run them.
+
+import os
+import asyncio
+
+import pytest
+
+from infrastructure.indexes import _connect, forbidden_scans, missing_indexes
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("NEO4J_URI_STAGING"), reason="NEO4J_URI_STAGING is not set"
+)
+
+async def _with_driver(check):
+    driver = _connect()
+    try:
+        return await check(driver)
+    finally:
+        await driver.close()
+
+def test_no_query_plans_an_all_nodes_scan():
+    assert asyncio.run(_with_driver(forbidden_scans)) == {}
+
+def test_required_indexes_are_online():
+    assert asyncio.run(_with_driver(missing_indexes)) == {}
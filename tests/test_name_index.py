@@ -0,0 +1,42 @@
+# File: tests/test_name_index.py
+
+import pytest
+
+from infrastructure.name_index import NameIndex
+
+@pytest.fixture
+def index() -> NameIndex:
+    names = NameIndex()
+    names.add("Paracetamol", "SUBS", ("100",))
+    names.add("Codeine", "SUBS", ("200",))
+    names.add("Ibuprofen", "SUBS", ("300",))
+    names.add("Paracetamol 500 mg tablet", "GPU", ("100",))
+    names.add("Ibuprofen 400 mg tablet", "GPU", ("300",))
+    names.add("Paracetamol + Codeine 500/30 mg tablet", "GPU", ("100", "200"))
+    return names.freeze()
+
+@pytest.mark.parametrize("name, subs", [
+    ("paracetamol", ["100"]),
+    ("  PARACETAMOL ", ["100"]),
+    ("paracetmol", ["100"]),                        # one missing letter
+    ("paracetamoll", ["100"]),                      # one extra letter
+    ("paracetamol 500", ["100"]),
+    ("paracet", ["100"]),                           # truncated last word
+    ("paracetamol codeine", ["100", "200"]),        # a catalogued combination
+])
+def test_close_names_resolve(index, name, subs):
+    assert index.lookup(name) == subs
+
+@pytest.mark.parametrize("name", [
+    "parcetmol",                                    # two typos
+    "paracetamol 650",                              # strength not in the catalogue
+    "ibuprofen 40",                                 # a digit short
+    "ibuprofen codeine",                            # combination not in the catalogue
+    "paracetamol tramadol",                         # one substance unknown
+    "codeine syrup",
+])
+def test_near_misses_do_not_resolve(index, name):
+    assert index.lookup(name) is None
+
+def test_resolve_keeps_only_matched_names(index):
+    assert index.resolve(["Ibuprofen", "ibuprofen codeine"]) == {"Ibuprofen": ["300"]}
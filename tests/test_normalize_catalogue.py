@@ -0,0 +1,77 @@
+# File: tests/test_normalize_catalogue.py
+
+import asyncio
+from typing import Any, Dict, List
+
+from infrastructure.neo4j_repository import Neo4jDrugRepository
+from infrastructure.normalize_catalogue import normalize_lists
+from utils.helpers import parse_list_property
+from fake_neo4j import SyntheticDriver
+
+class UnmigratedDriver(SyntheticDriver):
+    """DRUG rows as loaded, before the job: SUBS lists stored as their string repr."""
+
+    async def _drugsearch(self, params: Dict[str, Any]) -> List[dict]:
+        rows = await super()._drugsearch(params)
+        for row in rows:
+            best = row["best"]
+            if best:
+                row["best"] = dict(
+                    best, subs_codes=str(list(best["subs_codes"])), subs_names=str(list(best["subs_names"]))
+                )
+        return rows
+
+    async def _string_search(self, params: Dict[str, Any]) -> List[dict]:
+        return [{"subs_codes": str(r["subs_codes"])} for r in await super()._string_search(params)]
+
+def test_parse_list_property_reads_both_shapes():
+    assert parse_list_property(["1", "2"]) == ["1", "2"]
+    assert parse_list_property("['1', '2']") == ["1", "2"]
+    assert parse_list_property("") == []
+    assert parse_list_property(None) == []
+    assert parse_list_property("not a list") == []
+
+def test_repository_reads_string_encoded_lists(catalogue):
+    codes = sorted(catalogue.by_code)[:80]
+    names = list(catalogue.subs_names.values())[:20]
+
+    async def lookups(driver):
+        repo = Neo4jDrugRepository(driver)
+        return (
+            await repo.query_details(codes),
+            await repo.resolve_subs(codes),
+            await repo.resolve_names(names),
+        )
+
+    assert asyncio.run(lookups(UnmigratedDriver(catalogue))) == asyncio.run(lookups(SyntheticDriver(catalogue)))
+
+def test_normalize_lists_rewrites_every_node_in_batches():
+    nodes = {
+        str(i): {"subs_codes": str([str(1000000 + i)]), "subs_names": str([f"SUBSTANCE {i}"])}
+        for i in range(25)
+    }
+    nodes["native"] = {"subs_codes": ["1"], "subs_names": ["ONE"]}
+
+    class CatalogueDriver(SyntheticDriver):
+        def __init__(self):
+            super().__init__(catalogue=None)
+            self.answers["STRING_LISTS_CYPHER"] = self._string_lists
+            self.answers["SET_NATIVE_LISTS_CYPHER"] = self._set_lists
+
+        async def _string_lists(self, params: Dict[str, Any]) -> List[dict]:
+            pending = [
+                {"id": i, **n} for i, n in nodes.items()
+                if isinstance(n["subs_codes"], str) or isinstance(n["subs_names"], str)
+            ]
+            return pending[:params["batch"]]
+
+        async def _set_lists(self, params: Dict[str, Any]) -> List[dict]:
+            for row in params["rows"]:
+                nodes[row["id"]] = {"subs_codes": row["subs_codes"], "subs_names": row["subs_names"]}
+            return []
+
+    driver = CatalogueDriver()
+    assert asyncio.run(normalize_lists(driver, batch_size=10)) == 25
+    assert driver.round_trips["SET_NATIVE_LISTS_CYPHER"] == 3
+    assert nodes["3"] == {"subs_codes": ["1000003"], "subs_names": ["SUBSTANCE 3"]}
+    assert nodes["native"] == {"subs_codes": ["1"], "subs_names": ["ONE"]}
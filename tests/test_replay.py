@@ -0,0 +1,43 @@
+# File: tests/test_replay.py
+
+import json
+import asyncio
+from argparse import Namespace
+
+from benchmarks.replay import replay, run_payload
+from benchmarks.replay_driver import RecordingDriver
+from benchmarks.synthetic import allergy_payload, drug_payload
+from fake_neo4j import SyntheticDriver
+
+def _record(catalogue, tmp_path) -> Namespace:
+    payloads = {
+        "drugs.json":   drug_payload(catalogue, 15, seed=4),
+        "allergy.json": allergy_payload(catalogue, 15, seed=4),
+    }
+    driver = RecordingDriver(SyntheticDriver(catalogue))
+    paths = []
+    for name, payload in payloads.items():
+        asyncio.run(run_payload(driver, payload, "pairs"))
+        path = tmp_path / name
+        path.write_text(payload.model_dump_json(), encoding="utf-8")
+        paths.append(str(path))
+    driver.save(str(tmp_path / "replay.json"))
+    return Namespace(
+        payloads=paths, fixtures=str(tmp_path / "replay.json"), strategy="pairs", runs=2,
+        latency_ms=0.0, recorded_latency=False, lenient=False,
+        budget=str(tmp_path / "budget.json"), update_budget=False,
+    )
+
+def test_replay_stays_within_the_recorded_budget(catalogue, tmp_path):
+    args = _record(catalogue, tmp_path)
+    assert asyncio.run(replay(Namespace(**{**vars(args), "update_budget": True}))) == 0
+    budget = json.loads((tmp_path / "budget.json").read_text(encoding="utf-8"))
+    assert set(budget) == {"drugs.json", "allergy.json"}
+    assert asyncio.run(replay(args)) == 0
+
+def test_replay_fails_over_budget(catalogue, tmp_path):
+    args = _record(catalogue, tmp_path)
+    (tmp_path / "budget.json").write_text(
+        json.dumps({"drugs.json": {"round_trips": 1}}), encoding="utf-8"
+    )
+    assert asyncio.run(replay(args)) == 1
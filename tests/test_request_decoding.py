@@ -0,0 +1,59 @@
+# File: tests/test_request_decoding.py
+
+import json
+
+import pytest
+from fastapi import HTTPException
+from fastapi.exceptions import RequestValidationError
+
+from api.requests import decode_payload
+from benchmarks.request_decoding import body, ehr_item
+from domain.models import AllergyPayload, DrugItem, DrugPayload, ScreeningPayload
+
+VALID = [
+    (DrugPayload, body(DrugPayload, 50)),
+    (AllergyPayload, body(AllergyPayload, 50)),
+    # values that need coercion, nulls, unknown keys, absent and null lists
+    (DrugPayload, json.dumps({
+        "drug_currents": [
+            {"tpu_code": "100001", "quantity": "2", "external": "true"},
+            {"name": "drug 500 mg", "quantity": 3.0, "subs_code": None, "note": "x"},
+        ],
+        "drug_histories": None,
+    }).encode()),
+    (ScreeningPayload, json.dumps({"drug_currents": [ehr_item(1)]}).encode()),
+]
+
+INVALID = [
+    (DrugPayload, b'{"drug_histories": []}'),
+    (DrugPayload, b'{"drug_currents": []}'),
+    (DrugPayload, b'{"drug_currents": "not a list"}'),
+    (DrugPayload, b'{"drug_currents": [{"quantity": "two"}]}'),
+    (AllergyPayload, json.dumps({"drug_currents": [ehr_item(0)]}).encode()),
+    (DrugPayload, b'{"drug_currents": [{}'),
+    (DrugPayload, b'[]'),
+]
+
+def _decode(model, raw: bytes, fast: bool):
+    try:
+        return decode_payload(model, raw, "application/json", fast=fast)
+    except RequestValidationError as exc:
+        return 422, exc.errors()
+    except HTTPException as exc:
+        return exc.status_code, exc.detail
+
+@pytest.mark.parametrize("model, raw", VALID, ids=["drugs", "allergy", "coercion", "screening"])
+def test_fast_decode_equals_validated_decode(model, raw):
+    fast = decode_payload(model, raw, "application/json", fast=True)
+    validated = decode_payload(model, raw, "application/json", fast=False)
+    assert type(fast) is model
+    assert all(type(item) is DrugItem for group in model.model_fields for item in getattr(fast, group) or [])
+    assert fast.model_dump() == validated.model_dump()
+    assert fast.model_fields_set == validated.model_fields_set
+
+@pytest.mark.parametrize(
+    "model, raw", INVALID,
+    ids=["missing", "empty", "not-a-list", "bad-int", "no-allergies", "truncated", "array"]
+)
+def test_fast_decode_reports_the_same_errors(model, raw):
+    assert _decode(model, raw, fast=True) == _decode(model, raw, fast=False)
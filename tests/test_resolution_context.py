@@ -0,0 +1,60 @@
+# File: tests/test_resolution_context.py
+
+import asyncio
+from typing import Dict, List
+
+from benchmarks.synthetic import InMemoryDrugRepository, drug_payload
+from domain.models import DrugItem, DrugPayload
+from domain.services.interaction_service import InteractionService
+from domain.services.resolution_context import ResolutionContext
+
+class CodeCountingRepository(InMemoryDrugRepository):
+    """Counts how often each code is sent to query_details."""
+
+    def __init__(self, catalogue):
+        super().__init__(catalogue)
+        self.queried: Dict[str, int] = {}
+
+    async def query_details(self, codes: List[str]) -> Dict[str, dict]:
+        for code in codes:
+            self.queried[code] = self.queried.get(code, 0) + 1
+        return await super().query_details(codes)
+
+def test_each_code_is_queried_once(catalogue):
+    repo = CodeCountingRepository(catalogue)
+    payload = drug_payload(catalogue, 20, seed=3)
+    # the same drugs again, as separate items
+    payload.drug_currents += [it.model_copy() for it in payload.drug_currents]
+    asyncio.run(InteractionService(repo).build_rows(payload))
+    assert repo.queried and set(repo.queried.values()) == {1}
+
+def test_concurrent_loads_share_one_query(catalogue):
+    repo = CodeCountingRepository(catalogue)
+    ctx = ResolutionContext(repo)
+    codes = sorted(catalogue.by_code)[:10]
+
+    async def load():
+        await asyncio.gather(ctx.fetch_details(codes), ctx.fetch_details(codes[5:] + codes[:2]))
+
+    asyncio.run(load())
+    assert set(repo.queried) == set(codes) and set(repo.queried.values()) == {1}
+    assert repo.round_trips["query_details"] == 1
+
+def test_subs_follow_the_enriched_codes(catalogue):
+    # a history drug named after a combination whose SUBS start different
+    # DRUG rows: enrichment gives it one product's codes, and once another
+    # item brings that product's details, its SUBS must be the product's
+    # rather than those of its pre-enrichment codes
+    row = next(
+        r for r in catalogue.drugs
+        if len({tuple(catalogue.best(s)["subs_codes"]) for s in r["subs_codes"]}) > 1
+    )
+    service = InteractionService(InMemoryDrugRepository(catalogue))
+    probe = DrugItem(name=row["vtm_name"])
+    asyncio.run(service.prepare(DrugPayload(drug_currents=[DrugItem()], drug_histories=[probe])))
+
+    item = DrugItem(name=row["vtm_name"])
+    payload = DrugPayload(drug_currents=[DrugItem(tpu_code=probe.tpu_code)], drug_histories=[item])
+    subs_to_items, _, _ = asyncio.run(service.prepare(payload))
+    owned = sorted(s for s, items in subs_to_items.items() if any(it is item for it in items))
+    assert owned == sorted(catalogue.best(probe.tpu_code)["subs_codes"])
@@ -0,0 +1,29 @@
+# File: tests/test_row_assembly.py
+
+import asyncio
+
+from benchmarks.synthetic import InMemoryDrugRepository, allergy_payload, drug_payload
+from domain.services.allergy_service import AllergyService
+from domain.services.interaction_service import InteractionService
+
+def test_fast_assembly_matches_validated_rows(catalogue):
+    for seed in range(5):
+        rows = {
+            fast: asyncio.run(
+                InteractionService(InMemoryDrugRepository(catalogue), fast_assembly=fast)
+                .build_rows(drug_payload(catalogue, 15, seed=seed))
+            )
+            for fast in (False, True)
+        }
+        assert [r.model_dump() for r in rows[True]] == [r.model_dump() for r in rows[False]]
+
+def test_fast_allergy_assembly_matches_validated_rows(catalogue):
+    for seed in range(5):
+        rows = {
+            fast: asyncio.run(
+                AllergyService(InMemoryDrugRepository(catalogue), fast_assembly=fast)
+                .build_rows(allergy_payload(catalogue, 15, seed=seed))
+            )
+            for fast in (False, True)
+        }
+        assert [r.model_dump() for r in rows[True]] == [r.model_dump() for r in rows[False]]
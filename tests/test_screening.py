@@ -0,0 +1,54 @@
+# File: tests/test_screening.py
+
+import asyncio
+
+import pytest
+
+from benchmarks.synthetic import InMemoryDrugRepository, allergy_payload
+from domain.models import AllergyPayload, DrugItem, DrugPayload, ScreeningPayload
+from domain.services.allergy_service import AllergyService
+from domain.services.interaction_service import InteractionService
+from domain.services.screening_service import ScreeningService
+
+def _body(catalogue, seed: int) -> dict:
+    payload = allergy_payload(catalogue, 20, history_ratio=0.5, seed=seed)
+    # an allergy given by name only, as histories may be
+    name = sorted(catalogue.subs_names.values())[seed]
+    payload.drug_allergies.append(DrugItem(name=name))
+    return payload.model_dump()
+
+def _dumps(rows) -> list:
+    return [r.model_dump() for r in rows]
+
+@pytest.mark.parametrize("strategy", ["pairs", "graph"])
+def test_screening_matches_drugs_and_allergy(catalogues, strategy):
+    for catalogue in catalogues:
+        for seed in range(5):
+            body = _body(catalogue, seed)
+            interactions = InteractionService(InMemoryDrugRepository(catalogue), contrast_strategy=strategy)
+            allergies = AllergyService(InMemoryDrugRepository(catalogue))
+            contrasts = asyncio.run(interactions.build_rows(DrugPayload(
+                drug_currents=body["drug_currents"], drug_histories=body["drug_histories"]
+            )))
+            allergy_rows = asyncio.run(allergies.build_rows(AllergyPayload(**body)))
+
+            screening = ScreeningService(
+                InteractionService(InMemoryDrugRepository(catalogue), contrast_strategy=strategy),
+                AllergyService(InMemoryDrugRepository(catalogue)),
+            )
+            screened = asyncio.run(screening.build_results(ScreeningPayload(**body)))
+            assert (_dumps(screened[0]), _dumps(screened[1])) == (_dumps(contrasts), _dumps(allergy_rows))
+
+def test_screening_accepts_null_lists(catalogue):
+    body = _body(catalogue, 1)
+    screening = ScreeningService(
+        InteractionService(InMemoryDrugRepository(catalogue)),
+        AllergyService(InMemoryDrugRepository(catalogue)),
+    )
+    payload = ScreeningPayload(drug_currents=body["drug_currents"], drug_histories=None, drug_allergies=None)
+    contrasts, allergies = asyncio.run(screening.build_results(payload))
+    expected = asyncio.run(
+        InteractionService(InMemoryDrugRepository(catalogue)).build_rows(DrugPayload(drug_currents=body["drug_currents"]))
+    )
+    assert _dumps(contrasts) == _dumps(expected)
+    assert allergies == []
@@ -0,0 +1,39 @@
+# File: tests/test_sessions.py
+
+import asyncio
+
+from benchmarks.synthetic import InMemoryDrugRepository, drug_payload
+from domain.models import DrugPayload, DrugSessionUpdate
+from domain.services.interaction_service import InteractionService
+from domain.services.session_store import SessionStore
+
+def _dumps(rows) -> list:
+    return [r.model_dump() for r in rows]
+
+def test_edited_session_matches_a_full_screening(catalogues):
+    rows = 0
+    for catalogue in catalogues:
+        for seed in range(4):
+            initial = drug_payload(catalogue, 16, seed=seed)
+            added = drug_payload(catalogue, 6, seed=seed + 100)
+            # the pipeline enriches items in place; keep the shapes as sent
+            sent, add_sent = initial.model_copy(deep=True), added.model_copy(deep=True)
+
+            service = InteractionService(InMemoryDrugRepository(catalogue), session_store=SessionStore())
+            session_id = asyncio.run(service.open_session(initial)).data.session_id
+            response = asyncio.run(service.update_session(session_id, DrugSessionUpdate(
+                add_currents=added.drug_currents,
+                add_histories=added.drug_histories,
+                remove_currents=[sent.drug_currents[0]],
+                remove_histories=sent.drug_histories[:1],
+            )))
+
+            final = DrugPayload(
+                drug_currents=sent.drug_currents[1:] + add_sent.drug_currents,
+                drug_histories=sent.drug_histories[1:] + add_sent.drug_histories,
+            )
+            expected = asyncio.run(InteractionService(InMemoryDrugRepository(catalogue)).build_rows(final))
+            assert response.data.total == len(expected)
+            assert _dumps(response.data.data) == _dumps(expected)
+            rows += len(expected)
+    assert rows
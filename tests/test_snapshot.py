@@ -0,0 +1,97 @@
+# File: tests/test_snapshot.py
+
+import asyncio
+from itertools import combinations
+
+from benchmarks.synthetic import InMemoryDrugRepository
+from infrastructure.catalogue_watcher import CatalogueWatcher
+from infrastructure.contrast_engine import ATTR_FIELDS
+from infrastructure.snapshot import MmapSnapshot, SnapshotDrugRepository, export_snapshot, write_snapshot
+from infrastructure.tmt_index import fetch_catalogue
+from fake_neo4j import SyntheticDriver
+
+def _write_without(catalogue, path: str, dropped: str, version: str) -> None:
+    """A snapshot exported before SUBS `dropped` joined the catalogue."""
+    rows, subs_names = asyncio.run(fetch_catalogue(SyntheticDriver(catalogue)))
+    subs_names.pop(dropped)
+    edges = [
+        (a, b, tuple(attrs.get(f) or "" for f in ATTR_FIELDS))
+        for (a, b), attrs in sorted(catalogue.contrasts.items())
+        if dropped not in (a, b)
+    ]
+    write_snapshot(path, rows, subs_names, edges, {"catalogue_version": version})
+
+def _pairs_and_dropped(catalogue):
+    sids = sorted(catalogue.subs_names)[:60]
+    dropped = next(a for a, b in sorted(catalogue.contrasts) if a in sids and b in sids)
+    return [list(p) for p in combinations(sids, 2)], dropped
+
+def _by_pair(records: list) -> list:
+    return sorted(records, key=lambda r: (r["sub1_id"], r["sub2_id"]))
+
+def _lookups(repo, pairs):
+    async def run():
+        streamed = [rec async for rec in repo.stream_contrasts(pairs)]
+        return _by_pair(await repo.fetch_contrasts(pairs)), _by_pair(streamed)
+    return asyncio.run(run())
+
+def test_contrasts_match_the_repository(catalogue, tmp_path):
+    path = str(tmp_path / "catalogue.snap")
+    asyncio.run(export_snapshot(SyntheticDriver(catalogue), path))
+    pairs, _ = _pairs_and_dropped(catalogue)
+    expected = _by_pair(asyncio.run(InMemoryDrugRepository(catalogue).fetch_contrasts(pairs)))
+
+    inner = InMemoryDrugRepository(catalogue)
+    snapshot = MmapSnapshot(path)
+    try:
+        assert expected
+        assert _lookups(SnapshotDrugRepository(inner, snapshot), pairs) == (expected, expected)
+        assert not inner.round_trips
+    finally:
+        snapshot.close()
+
+def test_pairs_with_unknown_subs_fall_back_to_the_repository(catalogue, tmp_path):
+    path = str(tmp_path / "catalogue.snap")
+    pairs, dropped = _pairs_and_dropped(catalogue)
+    _write_without(catalogue, path, dropped, "1")
+    expected = _by_pair(asyncio.run(InMemoryDrugRepository(catalogue).fetch_contrasts(pairs)))
+
+    inner = InMemoryDrugRepository(catalogue)
+    snapshot = MmapSnapshot(path)
+    try:
+        assert not snapshot.knows(dropped)
+        assert any(dropped in (r["sub1_id"], r["sub2_id"]) for r in expected)
+        assert _lookups(SnapshotDrugRepository(inner, snapshot), pairs) == (expected, expected)
+        # one fallback per call, for the dropped SUBS' pairs only
+        assert inner.round_trips == {"fetch_contrasts": 2}
+    finally:
+        snapshot.close()
+
+def test_watcher_remaps_a_replaced_snapshot(catalogue, tmp_path):
+    path = str(tmp_path / "catalogue.snap")
+    pairs, dropped = _pairs_and_dropped(catalogue)
+    _write_without(catalogue, path, dropped, "1")
+    driver = SyntheticDriver(catalogue, version="2")
+    snapshot = MmapSnapshot(path)
+    watcher = CatalogueWatcher()
+    watcher.subscribe(snapshot.load)
+
+    async def run():
+        await watcher.start(driver)
+        try:
+            # the file still holds version 1: nothing counts as loaded yet
+            stale = watcher.version
+            await export_snapshot(driver, path)
+            return stale, await watcher.check()
+        finally:
+            await watcher.stop()
+
+    try:
+        assert asyncio.run(run()) == (None, True)
+        assert watcher.version == "2"
+        assert snapshot.meta["catalogue_version"] == "2"
+        assert snapshot.knows(dropped)
+        expected = _by_pair(asyncio.run(InMemoryDrugRepository(catalogue).fetch_contrasts(pairs)))
+        assert _lookups(SnapshotDrugRepository(None, snapshot), pairs) == (expected, expected)
+    finally:
+        snapshot.close()
@@ -0,0 +1,69 @@
+# File: tests/test_streaming.py
+
+import zlib
+import asyncio
+from itertools import combinations
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from api.responses import StreamingGZipMiddleware, stream_rows
+from infrastructure.neo4j_repository import Neo4jDrugRepository
+from fake_neo4j import SyntheticDriver
+
+class _Row(BaseModel):
+    n: int
+    text: str
+
+def test_stream_releases_the_session_between_batches(catalogue):
+    driver = SyntheticDriver(catalogue)
+    repo = Neo4jDrugRepository(driver, stream_batch_pairs=50)
+    pairs = [list(p) for p in combinations(sorted(catalogue.subs_names)[:40], 2)]
+
+    async def stream():
+        records = []
+        async for record in repo.stream_contrasts(pairs):
+            # the client reads while no session is held
+            assert driver.open_sessions == 0
+            records.append(record)
+        return records
+
+    streamed = asyncio.run(stream())
+    assert streamed == asyncio.run(repo.fetch_contrasts(pairs))
+    assert driver.round_trips["CONTRAST_CYPHER"] == -(-len(pairs) // 50) + 1
+
+def test_gzip_delivers_every_streamed_row_as_it_is_produced():
+    rows = [_Row(n=i, text="interaction monograph " * 20) for i in range(20)]
+
+    async def produce():
+        for row in rows:
+            yield row
+
+    async def run():
+        app = StreamingGZipMiddleware(stream_rows(produce()), minimum_size=100, compresslevel=5)
+        scope = {
+            "type": "http",
+            "asgi": {"spec_version": "2.4"},
+            "headers": [(b"accept-encoding", b"gzip")],
+        }
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        headers, chunks = {}, []
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                headers.update((k.decode(), v.decode()) for k, v in message["headers"])
+            else:
+                # what the client can decode from this message alone
+                chunks.append(decoder.decompress(message.get("body", b"")))
+
+        async def receive():
+            return {"type": "http.disconnect"}
+
+        await app(scope, receive, send)
+        return headers, chunks
+
+    headers, chunks = asyncio.run(run())
+    assert headers["content-encoding"] == "gzip"
+    assert headers["content-type"] == "application/x-ndjson"
+    assert chunks[:len(rows)] == [to_json(row) + b"\n" for row in rows]
+    assert b"".join(chunks[len(rows):]) == b""
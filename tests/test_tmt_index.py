@@ -0,0 +1,41 @@
+# File: tests/test_tmt_index.py
+
+import asyncio
+
+from benchmarks.synthetic import InMemoryDrugRepository, drug_payload
+from domain.services.interaction_service import InteractionService
+from infrastructure.tmt_index import TmtIndex, TmtIndexRepository
+from fake_neo4j import SyntheticDriver
+
+def _index(catalogue) -> TmtIndex:
+    index = TmtIndex(name_index=False)
+    asyncio.run(index.load(SyntheticDriver(catalogue)))
+    return index
+
+def _without_score(details: dict) -> dict:
+    return {code: {k: v for k, v in best.items() if k != "score"} for code, best in details.items()}
+
+def test_index_answers_code_lookups_like_the_repository(catalogue):
+    inner = InMemoryDrugRepository(catalogue)
+    repo = TmtIndexRepository(inner, _index(catalogue))
+    codes = sorted(catalogue.by_code) + ["999999", ""]
+
+    async def lookups(r):
+        return (
+            _without_score(await r.query_details(codes)),
+            await r.resolve_subs(codes),
+            await r.fetch_subs_name_map(sorted(catalogue.subs_names)),
+        )
+
+    assert asyncio.run(lookups(repo)) == asyncio.run(lookups(InMemoryDrugRepository(catalogue)))
+    # only the codes the catalogue does not know reach the wrapped repository
+    assert inner.round_trips == {"query_details": 1, "resolve_subs": 1}
+
+def test_rows_match_without_index(catalogue):
+    index = _index(catalogue)
+    for seed in range(20):
+        plain = InteractionService(InMemoryDrugRepository(catalogue))
+        indexed = InteractionService(TmtIndexRepository(InMemoryDrugRepository(catalogue), index))
+        expected = asyncio.run(plain.build_rows(drug_payload(catalogue, 12, seed=seed)))
+        actual = asyncio.run(indexed.build_rows(drug_payload(catalogue, 12, seed=seed)))
+        assert [r.model_dump() for r in actual] == [r.model_dump() for r in expected]
@@ -1,10 +1,21 @@
 # File: utils/cypher.py
 # ── Full‐text search by name or code ───────────────────────────
+# $lucene (every term as a prefix) finds candidates through the DrugSearch
+# index; $q keeps the substring match on their name/code properties.
+# The SUBS lists may be native lists (normalized catalogue) or their
+# string repr: `x STARTS WITH ""` is only true for a string.
 STRING_SEARCH_CYPHER = """
-MATCH (d:DRUG)
-WHERE ANY(val IN [v IN keys(d) | toString(d[v])] 
-    WHERE toLower(val) CONTAINS $q)
+CALL db.index.fulltext.queryNodes("DrugSearch", $lucene) YIELD node AS d, score
+WITH d, score,
+     [d.`TPUNAME`, d.`TPNAME`, d.`GPUNAME`, d.`GPNAME`, d.`VTMNAME`,
+      d.`TMTID(TPU)`, d.`TMTID(TP)`, d.`TMTID(GPU)`, d.`TMTID(GP)`, d.`TMTID(VTM)`]
+     + CASE WHEN d.`SUBSNAME_LIST` STARTS WITH "" THEN [d.`SUBSNAME_LIST`]
+            ELSE coalesce(d.`SUBSNAME_LIST`, []) END
+     + CASE WHEN d.`TMTID(SUBS)_LIST` STARTS WITH "" THEN [d.`TMTID(SUBS)_LIST`]
+            ELSE coalesce(d.`TMTID(SUBS)_LIST`, []) END AS vals
+WHERE ANY(val IN vals WHERE toLower(toString(val)) CONTAINS $q)
 RETURN d.`TMTID(SUBS)_LIST` AS subs_codes
+ORDER BY score DESC
 LIMIT 1
 """
 
@@ -12,6 +23,11 @@ DRUGSEARCH_CYPHER = """
 UNWIND $qs AS q
 WITH q WHERE trim(q) <> ""
 CALL db.index.fulltext.queryNodes("DrugSearch", q) YIELD node, score
+WITH q, node, score,
+  CASE WHEN node.`TMTID(SUBS)_LIST` STARTS WITH "" THEN [node.`TMTID(SUBS)_LIST`]
+       ELSE coalesce(node.`TMTID(SUBS)_LIST`, []) END AS subs_code_vals,
+  CASE WHEN node.`SUBSNAME_LIST` STARTS WITH "" THEN [node.`SUBSNAME_LIST`]
+       ELSE coalesce(node.`SUBSNAME_LIST`, []) END AS subs_name_vals
 WITH q, node, score,
   CASE
     WHEN node.`TMTID(TPU)` = q OR toLower(node.`TPUNAME`) CONTAINS toLower(q) THEN "TPU"
@@ -19,8 +35,8 @@ WITH q, node, score,
     WHEN node.`TMTID(GPU)` = q OR toLower(node.`GPUNAME`) CONTAINS toLower(q) THEN "GPU"
     WHEN node.`TMTID(GP)`  = q OR toLower(node.`GPNAME`)  CONTAINS toLower(q) THEN "GP"
     WHEN node.`TMTID(VTM)` = q OR toLower(node.`VTMNAME`) CONTAINS toLower(q) THEN "VTM"
-    WHEN node.`TMTID(SUBS)_LIST` CONTAINS q
-         OR toLower(node.`SUBSNAME_LIST`) CONTAINS toLower(q) THEN "SUBS"
+    WHEN ANY(v IN subs_code_vals WHERE v CONTAINS q)
+         OR ANY(v IN subs_name_vals WHERE toLower(v) CONTAINS toLower(q)) THEN "SUBS"
     ELSE "UNKNOWN"
   END AS level,
   node.external AS external
@@ -43,32 +59,52 @@ RETURN q AS code, best
 
 
 # ── Fallback: resolve SUBS IDs by matching any code directly ────
+# One index seek per label instead of an all-node scan with a label filter.
+# Nodes of a normalized catalogue carry their SUBS closure precomputed;
+# others are expanded down the hierarchy.
 RESOLVE_SUBS_FALLBACK = """
 UNWIND $codes AS code
-MATCH (n)
-WHERE   (n:SUBS AND n.`TMTID(SUBS)` = code)
-    OR  (n:TPU  AND n.`TMTID(TPU)`  = code)
-    OR  (n:TP   AND n.`TMTID(TP)`   = code)
-    OR  (n:GPU  AND n.`TMTID(GPU)`  = code)
-    OR  (n:GP   AND n.`TMTID(GP)`   = code)
-    OR  (n:VTM  AND n.`TMTID(VTM)`  = code)
-OPTIONAL MATCH (n)<-[:TP_TO_TPU|GPU_TO_TPU|GP_TO_TP|GP_TO_GPU|VTM_TO_GP|SUBS_TO_VTM*0..5]-(subs:SUBS)
-RETURN DISTINCT subs.`TMTID(SUBS)` AS sid
+CALL {
+    WITH code MATCH (n:SUBS {`TMTID(SUBS)`: code}) RETURN n
+  UNION
+    WITH code MATCH (n:TPU  {`TMTID(TPU)`:  code}) RETURN n
+  UNION
+    WITH code MATCH (n:TP   {`TMTID(TP)`:   code}) RETURN n
+  UNION
+    WITH code MATCH (n:GPU  {`TMTID(GPU)`:  code}) RETURN n
+  UNION
+    WITH code MATCH (n:GP   {`TMTID(GP)`:   code}) RETURN n
+  UNION
+    WITH code MATCH (n:VTM  {`TMTID(VTM)`:  code}) RETURN n
+}
+WITH CASE WHEN n.`TMTID(SUBS)_CLOSURE` IS NOT NULL THEN n.`TMTID(SUBS)_CLOSURE`
+          ELSE [(n)<-[:TP_TO_TPU|GPU_TO_TPU|GP_TO_TP|GP_TO_GPU|VTM_TO_GP|SUBS_TO_VTM*0..5]-(s:SUBS) | s.`TMTID(SUBS)`] END AS sids
+UNWIND sids AS sid
+RETURN DISTINCT sid
 """
 
 
 # ── Search all SUBS IDs for given codes (used in allergy) ───────
 SEARCHSUBS_CYPHER = """
 UNWIND $codes AS code
-MATCH (n)
-  WHERE (n:TPU  AND n.`TMTID(TPU)`  = code)
-     OR (n:TP   AND n.`TMTID(TP)`   = code)
-     OR (n:GPU  AND n.`TMTID(GPU)`  = code)
-     OR (n:GP   AND n.`TMTID(GP)`   = code)
-     OR (n:VTM  AND n.`TMTID(VTM)`  = code)
-     OR (n:SUBS AND n.`TMTID(SUBS)` = code)
-OPTIONAL MATCH (n)<-[:TP_TO_TPU|GPU_TO_TPU|GP_TO_TP|GP_TO_GPU|VTM_TO_GP|SUBS_TO_VTM*0..5]-(subs:SUBS)
-WITH code, collect(DISTINCT COALESCE(subs.`TMTID(SUBS)`, n.`TMTID(SUBS)`)) AS subs_ids
+CALL {
+    WITH code MATCH (n:TPU  {`TMTID(TPU)`:  code}) RETURN n
+  UNION
+    WITH code MATCH (n:TP   {`TMTID(TP)`:   code}) RETURN n
+  UNION
+    WITH code MATCH (n:GPU  {`TMTID(GPU)`:  code}) RETURN n
+  UNION
+    WITH code MATCH (n:GP   {`TMTID(GP)`:   code}) RETURN n
+  UNION
+    WITH code MATCH (n:VTM  {`TMTID(VTM)`:  code}) RETURN n
+  UNION
+    WITH code MATCH (n:SUBS {`TMTID(SUBS)`: code}) RETURN n
+}
+WITH code, n,
+     CASE WHEN n.`TMTID(SUBS)_CLOSURE` IS NOT NULL THEN n.`TMTID(SUBS)_CLOSURE`
+          ELSE [(n)<-[:TP_TO_TPU|GPU_TO_TPU|GP_TO_TP|GP_TO_GPU|VTM_TO_GP|SUBS_TO_VTM*0..5]-(s:SUBS) | s.`TMTID(SUBS)`] END AS sids
+UNWIND CASE WHEN sids = [] THEN [n.`TMTID(SUBS)`] ELSE sids END AS sid
+WITH code, collect(DISTINCT sid) AS subs_ids
 RETURN code AS raw_code, subs_ids
 """
 
@@ -99,3 +135,140 @@ UNWIND $subs_ids AS sid
 MATCH (s:SUBS {`TMTID(SUBS)`: sid})
 RETURN sid AS code, s.SUBSNAME AS name
 """
+
+# ── Catalogue version marker (explicit version node + entity counts) ──
+CATALOGUE_VERSION_CYPHER = """
+OPTIONAL MATCH (v:CATALOGUE_VERSION)
+WITH max(v.version) AS version
+OPTIONAL MATCH (d:DRUG)
+WITH version, count(d) AS drugs
+OPTIONAL MATCH (:SUBS)-[r:CONTRAST_WITH]-(:SUBS)
+WITH version, drugs, count(r) AS contrasts
+RETURN coalesce(toString(version), "") + ":" + toString(drugs) + ":" + toString(contrasts) AS version
+"""
+
+# ── Full TMT hierarchy dump used to build the in-memory index ───
+TMT_INDEX_CYPHER = """
+MATCH (d:DRUG)
+RETURN
+  d.`TMTID(TPU)`        AS tpu_code, d.`TPUNAME` AS tpu_name,
+  d.`TMTID(TP)`         AS tp_code,  d.`TPNAME`  AS tp_name,
+  d.`TMTID(GPU)`        AS gpu_code, d.`GPUNAME` AS gpu_name,
+  d.`TMTID(GP)`         AS gp_code,  d.`GPNAME`  AS gp_name,
+  d.`TMTID(VTM)`        AS vtm_code, d.`VTMNAME` AS vtm_name,
+  d.`TMTID(SUBS)_LIST`  AS subs_codes,
+  d.`SUBSNAME_LIST`     AS subs_names,
+  d.external            AS external
+ORDER BY tpu_code
+"""
+
+# ── All SUBS IDs with their human‐readable names ────────────────
+SUBS_INDEX_CYPHER = """
+MATCH (s:SUBS)
+RETURN s.`TMTID(SUBS)` AS code, s.SUBSNAME AS name
+"""
+
+# ── Every CONTRAST_WITH edge once (sub1_id < sub2_id) ───────────
+ALL_CONTRASTS_CYPHER = """
+MATCH (s1:SUBS)-[r:CONTRAST_WITH]-(s2:SUBS)
+WHERE s1.`TMTID(SUBS)` < s2.`TMTID(SUBS)`
+RETURN
+  s1.`TMTID(SUBS)` AS sub1_id,
+  s1.SUBSNAME      AS sub1_name,
+  s2.`TMTID(SUBS)` AS sub2_id,
+  s2.SUBSNAME      AS sub2_name,
+  COALESCE(r.SEVERITY,"")        AS severity,
+  COALESCE(r.DOCUMENTATION,"")   AS documentation,
+  COALESCE(r.SUMMARY,"")         AS interaction_detail_en,
+  COALESCE(r.SUMMARY_TH,"")      AS interaction_detail_th,
+  COALESCE(r.ONSET,"")           AS onset,
+  COALESCE(r.SIGNIFICANCE,"")    AS significance,
+  COALESCE(r.MANAGEMENT,"")      AS management,
+  COALESCE(r.DISCUSSION,"")      AS discussion,
+  COALESCE(r.REFERENCE,"")       AS reference
+"""
+
+# ── Codes → SUBS → CONTRAST_WITH in a single traversal ──────────
+# Expands current/history codes down to SUBS and returns only the edges
+# inside that SUBS set, with the input codes each side originated from.
+CONTRAST_BY_CODES_CYPHER = """
+UNWIND $current + $history AS code
+CALL {
+    WITH code MATCH (n:TPU  {`TMTID(TPU)`:  code}) RETURN n
+  UNION
+    WITH code MATCH (n:TP   {`TMTID(TP)`:   code}) RETURN n
+  UNION
+    WITH code MATCH (n:GPU  {`TMTID(GPU)`:  code}) RETURN n
+  UNION
+    WITH code MATCH (n:GP   {`TMTID(GP)`:   code}) RETURN n
+  UNION
+    WITH code MATCH (n:VTM  {`TMTID(VTM)`:  code}) RETURN n
+  UNION
+    WITH code MATCH (n:SUBS {`TMTID(SUBS)`: code}) RETURN n
+}
+WITH code,
+     CASE WHEN n.`TMTID(SUBS)_CLOSURE` IS NOT NULL THEN n.`TMTID(SUBS)_CLOSURE`
+          ELSE [(n)<-[:TP_TO_TPU|GPU_TO_TPU|GP_TO_TP|GP_TO_GPU|VTM_TO_GP|SUBS_TO_VTM*0..5]-(s:SUBS) | s.`TMTID(SUBS)`] END AS sids
+UNWIND sids AS sid
+MATCH (s:SUBS {`TMTID(SUBS)`: sid})
+WITH s, collect(DISTINCT code) AS codes
+WITH collect(s) AS subs, collect({sid: s.`TMTID(SUBS)`, codes: codes}) AS origin
+UNWIND subs AS s1
+MATCH (s1)-[r:CONTRAST_WITH]-(s2:SUBS)
+WHERE s1.`TMTID(SUBS)` < s2.`TMTID(SUBS)` AND s2 IN subs
+RETURN
+  s1.`TMTID(SUBS)` AS sub1_id,
+  s1.SUBSNAME      AS sub1_name,
+  s2.`TMTID(SUBS)` AS sub2_id,
+  s2.SUBSNAME      AS sub2_name,
+  [o IN origin WHERE o.sid = s1.`TMTID(SUBS)` | o.codes][0] AS sub1_codes,
+  [o IN origin WHERE o.sid = s2.`TMTID(SUBS)` | o.codes][0] AS sub2_codes,
+  COALESCE(r.SEVERITY,"")        AS severity,
+  COALESCE(r.DOCUMENTATION,"")   AS documentation,
+  COALESCE(r.SUMMARY,"")         AS interaction_detail_en,
+  COALESCE(r.SUMMARY_TH,"")      AS interaction_detail_th,
+  COALESCE(r.ONSET,"")           AS onset,
+  COALESCE(r.SIGNIFICANCE,"")    AS significance,
+  COALESCE(r.MANAGEMENT,"")      AS management,
+  COALESCE(r.DISCUSSION,"")      AS discussion,
+  COALESCE(r.REFERENCE,"")       AS reference
+ORDER BY sub1_id, sub2_id
+"""
+
+# ── Catalogue normalization (infrastructure/normalize_catalogue.py) ──
+# DRUG nodes whose SUBS lists are still stored as their string repr
+STRING_LISTS_CYPHER = """
+MATCH (d:DRUG)
+WHERE d.`TMTID(SUBS)_LIST` STARTS WITH "" OR d.`SUBSNAME_LIST` STARTS WITH ""
+RETURN elementId(d) AS id, d.`TMTID(SUBS)_LIST` AS subs_codes, d.`SUBSNAME_LIST` AS subs_names
+LIMIT $batch
+"""
+
+SET_NATIVE_LISTS_CYPHER = """
+UNWIND $rows AS row
+MATCH (d:DRUG) WHERE elementId(d) = row.id
+SET d.`TMTID(SUBS)_LIST` = row.subs_codes,
+    d.`SUBSNAME_LIST`    = row.subs_names
+"""
+
+# Every hierarchy node's reachable SUBS IDs, read by the code lookups above
+SUBS_CLOSURE_CYPHER = """
+MATCH (n:SUBS|VTM|GP|GPU|TP|TPU)
+CALL {
+    WITH n
+    OPTIONAL MATCH (n)<-[:TP_TO_TPU|GPU_TO_TPU|GP_TO_TP|GP_TO_GPU|VTM_TO_GP|SUBS_TO_VTM*0..5]-(s:SUBS)
+    WITH n, collect(DISTINCT s.`TMTID(SUBS)`) AS sids
+    SET n.`TMTID(SUBS)_CLOSURE` = sids
+} IN TRANSACTIONS OF $batch ROWS
+"""
+
+# ── Query text -> constant name, for metrics and fixtures ──────
+QUERY_NAMES = {
+    value.strip(): name
+    for name, value in list(globals().items())
+    if name.isupper() and isinstance(value, str)
+}
+
+def query_name(query: str, default: str = "other") -> str:
+    """Name of the constant in this module holding `query`, or `default`."""
+    return QUERY_NAMES.get(query.strip(), default)
@@ -1,22 +1,40 @@
 # File: utils/helpers.py
 
 import re
-from typing import List, Dict
+import ast
+import uuid
+import unicodedata
+import hashlib
+from typing import Any, List, Dict, Tuple, Type, TypeVar
 from collections import Counter
 
-from neo4j import AsyncGraphDatabase
+from pydantic import BaseModel
 from domain.models import DrugItem
-from utils.cypher import RESOLVE_SUBS_FALLBACK
 
 LEVELS = ['tpu', 'tp', 'gpu', 'gp', 'vtm']
 
-async def fallback_resolve_subs(tx, codes: List[str]) -> List[str]:
+# Namespace for deterministic ContrastItem.ref_id values
+REF_ID_NAMESPACE = uuid.UUID("6f1c4a52-3d0e-5b8e-9a44-2c7d1e0b9f31")
+_REF_ID_NS_BYTES = REF_ID_NAMESPACE.bytes
+
+M = TypeVar("M", bound=BaseModel)
+
+def parse_list_property(value: Any) -> List[str]:
     """
-    Given a Neo4j transaction and a list of raw codes, return the list of
-    SUBS IDs by running the RESOLVE_SUBS_FALLBACK query.
+    Normalise a list-valued node property that may be stored either as a
+    native list (normalized catalogue) or as its string repr
+    (e.g. "['123', '456']").
     """
-    result = await tx.run(RESOLVE_SUBS_FALLBACK, {"codes": codes})
-    return [record["sid"] async for record in result]
+    if isinstance(value, list):
+        return value
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = ast.literal_eval(value)
+        except (ValueError, SyntaxError, TypeError):
+            return []
+    return list(value) if isinstance(value, (list, tuple)) else []
 
 
 def sanitize_for_lucene(q: str) -> str:
@@ -27,17 +45,39 @@ def sanitize_for_lucene(q: str) -> str:
     return ''.join(['\\' + c if c in special_chars else c for c in q])
 
 
+def fulltext_prefix_query(text: str) -> str:
+    """
+    Lucene query requiring every whitespace-separated term of `text` as a
+    prefix, e.g. "para 500" -> "para* AND 500*". Empty for a blank text.
+    """
+    return " AND ".join(sanitize_for_lucene(term) + "*" for term in text.split())
+
+
+# Thai digits -> ASCII digits
+_THAI_DIGITS = str.maketrans("๐๑๒๓๔๕๖๗๘๙", "0123456789")
+# Tone mark typed before an above-vowel (display is identical)
+_THAI_TONE_FIRST = re.compile(r'([\u0E48-\u0E4B])([\u0E31\u0E34-\u0E37\u0E47])')
+# The same combining mark typed twice
+_THAI_DOUBLED_MARK = re.compile(r'([\u0E31\u0E34-\u0E3A\u0E47-\u0E4E])\1+')
+
 def normalize_query(text: str) -> str:
     """
-    Clean and normalize a drug name or query string by removing non-alphanumeric characters
-    and collapsing whitespace.
+    Clean and normalize a drug name or query string: keep Latin letters,
+    digits and Thai, fold the Thai spellings that render identically
+    (decomposed SARA AM, tone mark before vowel, doubled marks, Thai
+    digits) and collapse whitespace.
     """
     if text:
-        cleaned = re.sub(r'[^a-zA-Z0-9\s]', '', text)
+        if not text.isascii():
+            text = unicodedata.normalize("NFC", text).translate(_THAI_DIGITS)
+            text = text.replace("\u0E4D\u0E32", "\u0E33")
+            text = _THAI_TONE_FIRST.sub(r'\2\1', text)
+            text = _THAI_DOUBLED_MARK.sub(r'\1', text)
+        cleaned = re.sub(r'[^a-zA-Z0-9\u0E01-\u0E3A\u0E40-\u0E4E\s]', '', text)
         return re.sub(r'\s+', ' ', cleaned).strip()
     return text
 
-async def codes_from_item(it: DrugItem) -> List[str]:
+def item_codes(it: DrugItem) -> List[str]:
     """
     Extract all non-empty code attributes from a DrugItem.
     Ensure returned list is flat and contains only strings.
@@ -56,70 +96,82 @@ async def codes_from_item(it: DrugItem) -> List[str]:
             flattened.append(c)
     return flattened
 
-async def highest_idx(it: DrugItem) -> int:
-    """
-    Determine the highest-level code present on the item (tpu, tp, gpu, gp, vtm).
-    Returns the index in LEVELS where a code first appears.
-    """
-    for i, lvl in enumerate(LEVELS):
-        if getattr(it, f"{lvl}_code", None):
-            return i
-    return len(LEVELS)
-
-async def fill_codes(prefix: str, it: DrugItem) -> Dict[str, str]:
+def code_fields(prefix: str, it: DrugItem) -> Dict[str, str]:
     """
     Given a prefix ('input' or 'contrast') and a DrugItem,
     populate a dict of '{prefix}_{level}_code' and '{prefix}_{level}_name' fields,
     only including fields at or above the item's highest-code level.
     Also sets '{prefix}_description' to an empty string.
     """
-    top = await highest_idx(it)
+    top = len(LEVELS)
+    for i, lvl in enumerate(LEVELS):
+        if getattr(it, f"{lvl}_code", None):
+            top = i
+            break
     out: Dict[str, str] = {}
     for i, lvl in enumerate(LEVELS):
-        code_attr = f"{lvl}_code"
-        name_attr = f"{lvl}_name"
-        out[f"{prefix}_{lvl}_code"] = getattr(it, code_attr) if i >= top else ""
-        out[f"{prefix}_{lvl}_name"] = getattr(it, name_attr) if i >= top else ""
+        out[f"{prefix}_{lvl}_code"] = getattr(it, f"{lvl}_code") if i >= top else ""
+        out[f"{prefix}_{lvl}_name"] = getattr(it, f"{lvl}_name") if i >= top else ""
     out[f"{prefix}_description"] = ""
     return out
 
-async def enrich_items(
-    driver: AsyncGraphDatabase,
+def apply_details(
     items: List[DrugItem],
     detail_map: Dict[str, dict]
-) -> Dict[str, List[DrugItem]]:
+) -> Tuple[Dict[str, List[DrugItem]], List[str]]:
     """
-    Mutates each DrugItem in 'items' to fill in its hierarchy codes/names
-    from detail_map, and returns a mapping SUBS_ID -> list of DrugItems.
+    Mutates each DrugItem to fill in its hierarchy codes/names from
+    detail_map. Returns the SUBS_ID -> DrugItems
+    mapping and the codes that had no entry in detail_map.
     """
     subs_to_items: Dict[str, List[DrugItem]] = {}
     codes_fb: List[str] = []
 
-    async with driver.session() as session:
-        for it in items:
-            codes = await codes_from_item(it)
-            matched = False
-            for code in codes:
-                info = detail_map.get(code)
-                if not info:
-                    continue
-                matched = True
-                for lvl in LEVELS:
-                    c_field = f"{lvl}_code"
-                    n_field = f"{lvl}_name"
-                    if info.get(c_field):
-                        setattr(it, c_field, info[c_field])
-                    if info.get(n_field):
-                        setattr(it, n_field, info[n_field])
-                for sid in info.get("subs_codes", []):
-                    subs_to_items.setdefault(sid, []).append(it)
-
-            if not matched:
-                codes_fb.extend(codes)
-
-        if codes_fb:
-            subs_ids = await session.execute_read(fallback_resolve_subs, codes_fb)
-            for sid in subs_ids:
-                subs_to_items.setdefault(sid, []).append(items[0])
-
-    return subs_to_items
+    for it in items:
+        codes = item_codes(it)
+        matched = False
+        for code in codes:
+            info = detail_map.get(code)
+            if not info:
+                continue
+            matched = True
+            for lvl in LEVELS:
+                c_field = f"{lvl}_code"
+                n_field = f"{lvl}_name"
+                if info.get(c_field):
+                    setattr(it, c_field, info[c_field])
+                if info.get(n_field):
+                    setattr(it, n_field, info[n_field])
+            for sid in info.get("subs_codes", []):
+                subs_to_items.setdefault(sid, []).append(it)
+
+        if not matched:
+            codes_fb.extend(codes)
+
+    return subs_to_items, codes_fb
+
+def stable_ref_id(seen: Dict[str, int], *parts: str) -> str:
+    """
+    Deterministic ref_id for a contrast row, derived from the SUBS pair and
+    both items' codes, so recomputing a result yields the same IDs.
+    `seen` counts repeats within one result to keep duplicates distinct.
+    Equivalent to uuid.uuid5(REF_ID_NAMESPACE, key) without the UUID object.
+    """
+    key = "|".join(parts)
+    n = seen.get(key, 0)
+    seen[key] = n + 1
+    if n:
+        key = f"{key}#{n}"
+    h = bytearray(hashlib.sha1(_REF_ID_NS_BYTES + key.encode("utf-8")).digest()[:16])
+    h[6] = (h[6] & 0x0F) | 0x50
+    h[8] = (h[8] & 0x3F) | 0x80
+    x = h.hex()
+    return f"{x[:8]}-{x[8:12]}-{x[12:16]}-{x[16:20]}-{x[20:]}"
+
+
+def trusted_model(cls: Type[M], values: Dict[str, Any]) -> M:
+    """
+    Build a Pydantic model from values that are already known to be valid,
+    skipping validation.
+    """
+    return cls.model_construct(**values)